@@ -8,6 +8,7 @@ from tkinter import ttk, filedialog, messagebox
 from datetime import datetime
 import os
 from file_uji_coba.attendance_processor import AttendanceProcessor
+from file_uji_coba.employee_index import normalisasi_nama
 
 
 class AttendanceApp:
@@ -28,6 +29,7 @@ class AttendanceApp:
         self.selected_month = tk.IntVar(value=datetime.now().month)
         self.selected_year = tk.IntVar(value=datetime.now().year)
         self.output_filename = tk.StringVar()
+        self._saring_id = None
         
         # Setup UI
         self.setup_ui()
@@ -115,10 +117,11 @@ class AttendanceApp:
             employee_frame,
             textvariable=self.selected_employee,
             font=('Arial', 10),
-            width=60,
-            state='readonly'
+            width=60
         )
         self.employee_combo.grid(row=0, column=1, padx=15, pady=10, columnspan=2)
+        # Ketik untuk mencari: daftar diisi nama paling mirip
+        self.employee_combo.bind('<KeyRelease>', self.saring_karyawan)
         
         # === SECTION 3: Periode ===
         self.create_section(main_frame, "3️⃣ Pilih Periode Laporan", 4)
@@ -293,7 +296,7 @@ class AttendanceApp:
             
             if success:
                 # Populate employee list
-                employees = self.processor.get_employee_list()
+                employees = sorted(set(self.processor.get_employee_list()), key=normalisasi_nama)
                 self.employee_combo['values'] = employees
                 
                 if employees:
@@ -305,6 +308,25 @@ class AttendanceApp:
                 self.status_var.set(f"✗ {message}")
                 messagebox.showerror("Error", message)
     
+    def saring_karyawan(self, event=None):
+        """Search-as-you-type combobox karyawan (ditunda sampai ketikan berhenti sejenak)"""
+        if event is not None and event.keysym in ('Up', 'Down', 'Return', 'Escape', 'Tab'):
+            return
+        if self._saring_id is not None:
+            self.root.after_cancel(self._saring_id)
+        self._saring_id = self.root.after(150, self._terapkan_saringan)
+    
+    def _terapkan_saringan(self):
+        self._saring_id = None
+        indeks = self.processor.indeks_pegawai
+        if indeks is None:
+            return
+        query = self.selected_employee.get().strip()
+        if query:
+            self.employee_combo['values'] = indeks.mirip(query)
+        else:
+            self.employee_combo['values'] = sorted(indeks.nama, key=normalisasi_nama)
+    
     def auto_generate_filename(self):
         """Generate nama file otomatis"""
         month = self.month_combo.current() + 1
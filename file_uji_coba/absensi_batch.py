@@ -0,0 +1,510 @@
+"""
+Sistem Absensi - Batch CLI
+Entry point non-interaktif (tanpa input()) untuk cron / server: memproses
+banyak file CSV/XLSX (path, folder atau glob) sekaligus dengan filter karyawan dan
+periode, menulis laporan Excel per karyawan per bulan ke folder output
+(opsional paralel), lalu mencetak ringkasan JSON ke stdout.
+
+Contoh:
+    python -m file_uji_coba.absensi_batch "data/*.csv" -o laporan -p 2026-03 -j 4
+    python run.py data/absen.csv -o laporan -k "Budi Santoso" -k 3201010101010001
+
+Laporan ditulis ke <output>/<nama file input>/Absensi_<Nama>_<YYYY>-<MM>.xlsx
+(atau langsung ke <output> dengan --tanpa-subfolder). Mode pantau folder:
+lihat absensi_watch.
+
+Ringkasan bulanan per karyawan dan per unit (satu unit = satu file input)
+ditulis ke <output>/ringkasan_absensi.xlsx serta ringkasan_karyawan.csv &
+ringkasan_unit.csv (matikan dengan --tanpa-ringkasan). Ringkasan yang sudah ada
+diperbarui: baris (unit, karyawan, bulan) yang diproses ulang diganti, baris
+unit / periode lain dari proses sebelumnya dipertahankan.
+
+Proses ulang bersifat inkremental: hash data sumber tiap laporan dicatat di
+<folder output>/.manifest_absensi.json, dan laporan yang datanya tidak
+berubah sejak ditulis terakhir dilewati (--paksa untuk menulis ulang semua).
+Pesan progress ditulis ke stderr (matikan dengan -q).
+
+Kode keluar:
+    0  semua laporan berhasil
+    1  sebagian gagal (file, karyawan atau laporan tertentu)
+    2  argumen tidak valid
+    3  tidak ada file input yang cocok
+    4  tidak ada laporan yang berhasil dibuat
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+from file_uji_coba.attendance_processor import AttendanceProcessor
+from file_uji_coba.attendance_summary import (
+    baca_ringkasan, gabung_ringkasan, ringkasan_unit, simpan_ringkasan
+)
+from file_uji_coba.data_cache import tulis_atomik
+from file_uji_coba.employee_index import pesan_ambigu
+from file_uji_coba.excel_renderer import nama_file_unik
+from file_uji_coba.export_merge import DAFTAR_KEBIJAKAN, KEBIJAKAN_TERBARU
+from file_uji_coba.report_manifest import ManifestLaporan
+
+
+EXIT_OK = 0
+EXIT_SEBAGIAN = 1
+EXIT_ARGUMEN = 2
+EXIT_TANPA_INPUT = 3
+EXIT_GAGAL = 4
+EXIT_DIHENTIKAN = 130
+
+# Ekstensi file input yang diproses
+EKSTENSI_INPUT = ('.csv', '.xlsx')
+
+# Subfolder laporan & file konflik untuk mode --gabung
+NAMA_GABUNGAN = 'gabungan'
+FILE_KONFLIK = 'konflik_gabungan.csv'
+
+
+def periode_argumen(teks):
+    """Argumen periode 'YYYY-MM' (satu bulan) atau 'YYYY' (setahun) → (bulan, tahun)"""
+    try:
+        if len(teks) == 4:
+            return None, int(teks)
+        tanggal = datetime.strptime(teks, '%Y-%m')
+        return tanggal.month, tanggal.year
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"periode tidak valid: '{teks}' (gunakan YYYY-MM atau YYYY)")
+
+
+def tambah_opsi_laporan(parser):
+    """Opsi laporan yang dipakai bersama mode batch dan mode pantau folder"""
+    parser.add_argument('-o', '--output', default='laporan',
+                        help="folder output laporan (default: laporan)")
+    parser.add_argument('--tanpa-subfolder', action='store_true',
+                        help="tulis laporan langsung ke folder output, bukan per file input")
+    parser.add_argument('-p', '--periode', action='append', type=periode_argumen, default=[],
+                        metavar='YYYY-MM',
+                        help="periode laporan, boleh diulang; YYYY = setahun (default: semua periode)")
+    parser.add_argument('-k', '--karyawan', action='append', default=[], metavar='NAMA/NIK',
+                        help="hanya karyawan ini (nama lengkap, awalan nama atau NIK), boleh diulang")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="jumlah proses paralel (0 = jumlah core; default: 1)")
+    parser.add_argument('--libur-daerah', action='append', default=None, metavar='WILAYAH',
+                        help="ikutkan libur daerah (mis. bali), boleh diulang")
+    parser.add_argument('--streaming', action='store_true',
+                        help="baca CSV per chunk (memori terbatas untuk file sangat besar)")
+    parser.add_argument('--tanpa-cache', action='store_true',
+                        help="jangan pakai / tulis cache hasil parsing")
+    parser.add_argument('--paksa', action='store_true',
+                        help="tulis ulang semua laporan walau data sumbernya tidak berubah")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="tanpa pesan progress di stderr")
+
+
+def buat_parser():
+    parser = argparse.ArgumentParser(
+        prog='absensi_batch',
+        description="Buat laporan absensi Excel secara batch tanpa interaksi (cron/server).",
+        epilog="Kode keluar: 0 berhasil, 1 sebagian gagal, 2 argumen salah, "
+               "3 tidak ada input, 4 tidak ada laporan berhasil.")
+    parser.add_argument('input', nargs='+',
+                        help="file CSV/XLSX, folder (semua *.csv & *.xlsx) atau pola glob "
+                             "(mis. 'data/**/*.csv')")
+    tambah_opsi_laporan(parser)
+    parser.add_argument('--format', choices=('json', 'teks'), default='json',
+                        help="format ringkasan di stdout (default: json)")
+    parser.add_argument('--gabung', action='store_true',
+                        help="gabungkan semua input (export tumpang tindih) per karyawan & tanggal "
+                             "menjadi satu data; urutan export = waktu modifikasi file")
+    parser.add_argument('--kebijakan', choices=DAFTAR_KEBIJAKAN, default=KEBIJAKAN_TERBARU,
+                        help="penyelesaian konflik --gabung: file terbaru, jam masuk paling awal, "
+                             "atau jam pulang paling akhir (default: terbaru)")
+    parser.add_argument('--tanpa-ringkasan', action='store_true',
+                        help="jangan tulis ringkasan bulanan per karyawan & per unit")
+    return parser
+
+
+def cari_input(pola):
+    """Ekspansi path/folder/glob menjadi (daftar file unik, daftar pola yang tidak cocok)"""
+    files, kosong = [], []
+    for p in pola:
+        if os.path.isdir(p):
+            cocok = sorted(f for f in glob.glob(os.path.join(p, '*'))
+                           if os.path.splitext(f)[1].lower() in EKSTENSI_INPUT)
+        elif any(c in p for c in '*?['):
+            cocok = sorted(f for f in glob.glob(p, recursive=True) if os.path.isfile(f))
+        else:
+            cocok = [p] if os.path.isfile(p) else []
+
+        if not cocok:
+            kosong.append(p)
+        files.extend(f for f in cocok if f not in files)
+    return files, kosong
+
+
+def pilih_karyawan(processor, queries):
+    """
+    Resolusi filter karyawan lewat EmployeeIndex. Return (set nama sesuai data
+    sumber, list error per query yang tidak ditemukan / ambigu).
+    """
+    nama, error = set(), []
+    for query in queries:
+        hasil = processor.indeks_pegawai.cari(query)
+        if len(hasil.baris) == 0:
+            error.append((query, f"Karyawan '{query}' tidak ditemukan"))
+        elif len(hasil.baris) > 1:
+            error.append((query, pesan_ambigu(query, hasil)))
+        else:
+            nama.add(processor.store.nama[hasil.baris[0]])
+    return nama, error
+
+
+def _hasil_gagal(input_path, nama, month, year, error):
+    return {'input': input_path, 'nama': nama, 'bulan': month, 'tahun': year,
+            'output': None, 'hari': 0, 'ok': False, 'error': error}
+
+
+def siapkan_file(input_path, args, log, ringkasan=False):
+    """
+    Muat satu file input (atau list file untuk digabung, lihat export_merge)
+    lalu susun job laporannya. Return (info_file, jobs, hasil_gagal) — job
+    berisi DataFrame laporan, path output dan hash data sumbernya (untuk
+    saring_berubah). ringkasan=True: info_file['ringkasan'] berisi DataFrame
+    ringkasan bulanan karyawan file ini (unit = nama file input).
+    """
+    gabung = isinstance(input_path, (list, tuple))
+    if gabung:
+        input_path = list(input_path)
+    info = {'input': input_path, 'ok': False, 'pesan': None, 'laporan': 0}
+    gagal = []
+
+    processor = AttendanceProcessor(use_cache=not args.tanpa_cache,
+                                    wilayah_libur=args.libur_daerah)
+    # Satu periode: cukup parse kolom periode tersebut (proyeksi usecols)
+    month, year = args.periode[0] if len(args.periode) == 1 else (None, None)
+    if gabung:
+        success, message = processor.load_banyak(input_path, args.kebijakan,
+                                                 streaming=args.streaming, month=month, year=year)
+        # Label input job/manifest: seluruh file sesuai urutan penggabungan
+        input_path = '+'.join(os.path.abspath(p) for p in input_path)
+    else:
+        success, message = processor.load_csv(input_path, streaming=args.streaming,
+                                               month=month, year=year)
+    info['pesan'] = message
+    if not success:
+        log(f"✗ {input_path}: {message}")
+        return info, [], gagal
+    log(f"✓ {input_path}: {message}")
+
+    filter_nama = None
+    if args.karyawan:
+        filter_nama, error = pilih_karyawan(processor, args.karyawan)
+        for query, pesan in error:
+            log(f"  ✗ {pesan}")
+            gagal.append(_hasil_gagal(input_path, query, None, None, pesan))
+
+    hash_karyawan, hash_laporan = processor.hash_sumber(month, year)
+    konfigurasi = processor.sidik_konfigurasi()
+
+    unit = NAMA_GABUNGAN if gabung else os.path.splitext(os.path.basename(input_path))[0]
+    laporan, per_karyawan = {}, []
+    for month, year in args.periode or [(None, None)]:
+        success, message, hasil = processor.process_all_employees(month, year)
+        if not success:
+            periode = f"{processor.get_month_name(month)} {year}".strip() if year else "semua periode"
+            log(f"  ✗ {periode}: {message}")
+            if filter_nama is None:
+                gagal.append(_hasil_gagal(input_path, None, month, year, message))
+            hasil = {}
+        laporan.update(hasil)
+        if ringkasan and success:
+            per_karyawan.append(processor.ringkasan_absensi(month, year, unit)[2])
+
+        # Karyawan yang diminta tetapi tidak punya data di bulan yang diminta
+        if filter_nama and month and year:
+            for nama in sorted(filter_nama):
+                if (nama, month, year) not in laporan:
+                    gagal.append(_hasil_gagal(
+                        input_path, nama, month, year,
+                        f"Tidak ada data {processor.get_month_name(month)} {year}"))
+
+    if ringkasan and per_karyawan:
+        # Periode tumpang tindih (mis. -p 2026 -p 2026-03) cukup sekali
+        per_karyawan = pd.concat(per_karyawan, ignore_index=True).drop_duplicates(
+            ['Nama', 'Tahun', 'Bulan']).sort_values(['Nama', 'Tahun', 'Bulan'], kind='stable')
+        if filter_nama is not None:
+            per_karyawan = per_karyawan[per_karyawan['Nama'].isin(filter_nama)]
+        info['ringkasan'] = per_karyawan
+
+    folder = args.output
+    if not args.tanpa_subfolder:
+        folder = os.path.join(folder, unit)
+
+    if gabung and len(processor.konflik):
+        info['konflik'] = len(processor.konflik)
+        info['file_konflik'] = os.path.join(folder, FILE_KONFLIK)
+        os.makedirs(folder, exist_ok=True)
+        processor.konflik.to_csv(info['file_konflik'], index=False, encoding='utf-8-sig')
+        log(f"  ⚠️  {info['konflik']} konflik (karyawan, tanggal) diselesaikan dengan kebijakan "
+            f"'{args.kebijakan}', rincian: {info['file_konflik']}")
+    jobs, dipakai = [], set()
+    for (nama, month, year), df in laporan.items():
+        if filter_nama is not None and nama not in filter_nama:
+            continue
+        fname = nama_file_unik(nama, month, year, dipakai)
+        jobs.append({'input': input_path, 'nama': nama, 'bulan': month, 'tahun': year,
+                     'output': os.path.join(folder, fname), 'data': df,
+                     'hash': hash_laporan.get((nama, month, year)),
+                     'hash_karyawan': hash_karyawan.get(nama),
+                     'konfigurasi': konfigurasi, 'dilewati': False, 'alasan': None})
+
+    info['ok'] = True
+    info['laporan'] = len(jobs)
+    log(f"  {len(jobs)} laporan disiapkan")
+    return info, jobs, gagal
+
+
+def saring_berubah(jobs, paksa, log):
+    """
+    Bandingkan hash job dengan manifest folder outputnya. Return (jobs yang
+    perlu ditulis — alasan terisi, hasil untuk laporan yang dilewati,
+    {folder: ManifestLaporan}).
+    """
+    manifest = {}
+    # Beberapa input yang menulis file sama selalu ditulis (yang terakhir menang)
+    jumlah = {}
+    for job in jobs:
+        jumlah[job['output']] = jumlah.get(job['output'], 0) + 1
+
+    tulis, dilewati = [], []
+    for job in jobs:
+        folder = os.path.dirname(job['output'])
+        if folder not in manifest:
+            manifest[folder] = ManifestLaporan(folder)
+        if paksa:
+            alasan = "dipaksa (--paksa)"
+        elif jumlah[job['output']] > 1:
+            alasan = "beberapa input menulis file yang sama"
+        else:
+            alasan = manifest[folder].alasan_tulis(job)
+
+        if alasan is None:
+            hasil = {k: v for k, v in job.items() if k != 'data'}
+            hasil.update(hari=len(job['data']), ok=True, error=None, dilewati=True,
+                         alasan="data sumber tidak berubah")
+            dilewati.append(hasil)
+        else:
+            tulis.append(dict(job, alasan=alasan))
+
+    if dilewati:
+        berubah = len({(j['input'], j['nama']) for j in tulis})
+        log(f"{len(tulis)} laporan ditulis ulang ({berubah} karyawan), {len(dilewati)} "
+            f"dilewati: data sumber tidak berubah sejak proses terakhir")
+    return tulis, dilewati, manifest
+
+
+def perbarui_manifest(manifest, hasil):
+    """Catat hasil penulisan laporan ke manifest folder masing-masing lalu simpan"""
+    for h in hasil:
+        if not h.get('dilewati') and h.get('output') and 'hash' in h:
+            manifest[os.path.dirname(h['output'])].catat(h)
+    for m in manifest.values():
+        m.simpan()
+
+
+def simpan_laporan(job):
+    """Simpan satu laporan (fungsi worker ProcessPoolExecutor); error dilaporkan di hasil"""
+    df = job['data']
+    hasil = {k: v for k, v in job.items() if k != 'data'}
+    hasil['hari'] = len(df)
+    try:
+        os.makedirs(os.path.dirname(job['output']) or '.', exist_ok=True)
+        # Tulis atomik: pembaca (atau proses lain yang menulis laporan sama)
+        # tidak pernah melihat file setengah jadi
+        tulis_atomik(job['output'], lambda f: df.to_excel(f, index=False))
+        hasil['ok'], hasil['error'] = True, None
+    except Exception as e:
+        hasil['ok'], hasil['error'] = False, f"{type(e).__name__}: {e}"
+    return hasil
+
+
+def simpan_semua(jobs, max_workers, log):
+    """Tulis semua laporan (paralel jika max_workers != 1); urutan hasil = urutan jobs"""
+    hasil = [None] * len(jobs)
+
+    def _lapor(selesai, h):
+        if not h['ok']:
+            log(f"  ✗ {h['nama']} {h['tahun']}-{h['bulan']:02d}: {h['error']}")
+        if selesai % 50 == 0 or selesai == len(jobs):
+            log(f"Menulis laporan {selesai}/{len(jobs)}")
+
+    if max_workers == 1 or len(jobs) <= 1:
+        for idx, job in enumerate(jobs):
+            hasil[idx] = simpan_laporan(job)
+            _lapor(idx + 1, hasil[idx])
+        return hasil
+
+    with ProcessPoolExecutor(max_workers=max_workers or None) as executor:
+        futures = {executor.submit(simpan_laporan, job): idx for idx, job in enumerate(jobs)}
+        for selesai, future in enumerate(as_completed(futures), 1):
+            idx = futures[future]
+            try:
+                hasil[idx] = future.result()
+            except Exception as e:
+                # Worker mati (mis. BrokenProcessPool) — tetap laporkan per job
+                job = jobs[idx]
+                hasil[idx] = dict(
+                    {k: v for k, v in job.items() if k != 'data'},
+                    **_hasil_gagal(job['input'], job['nama'], job['bulan'], job['tahun'],
+                                   f"{type(e).__name__}: {e}"))
+                hasil[idx]['output'] = job['output']
+            _lapor(selesai, hasil[idx])
+    return hasil
+
+
+def tulis_ringkasan(per_karyawan, folder, log):
+    """
+    Gabungkan ringkasan karyawan seluruh file dengan ringkasan yang sudah ada
+    di folder output lalu tulis beserta rollup per unit. Return dict path file
+    (None jika tidak ada data / gagal).
+    """
+    per_karyawan = [df for df in per_karyawan if len(df)]
+    if not per_karyawan:
+        return None
+    per_karyawan = pd.concat(per_karyawan, ignore_index=True)
+    try:
+        lama = baca_ringkasan(folder)
+    except (OSError, ValueError) as e:
+        log(f"⚠️  Ringkasan lama tidak terbaca, ditulis ulang: {e}")
+        lama = None
+    per_karyawan = gabung_ringkasan(lama, per_karyawan)
+    per_unit = ringkasan_unit(per_karyawan)
+    try:
+        paths = simpan_ringkasan(per_karyawan, folder, per_unit)
+    except Exception as e:
+        log(f"✗ Gagal menulis ringkasan: {type(e).__name__}: {e}")
+        return None
+    log(f"Ringkasan {len(per_karyawan)} karyawan-bulan, {len(per_unit)} unit-bulan: {paths['xlsx']}")
+    return paths
+
+
+def buat_log(quiet=False):
+    """Fungsi log progress ke stderr (no-op jika quiet)"""
+    def log(message):
+        if not quiet:
+            print(message, file=sys.stderr, flush=True)
+    return log
+
+
+def kode_keluar(ringkasan):
+    if ringkasan['file'] == 0:
+        return EXIT_TANPA_INPUT
+    if ringkasan['berhasil'] == 0:
+        return EXIT_GAGAL
+    if ringkasan['gagal'] or ringkasan['file_gagal'] or ringkasan['input_tidak_cocok']:
+        return EXIT_SEBAGIAN
+    return EXIT_OK
+
+
+def cetak_ringkasan(hasil, format, stream=None):
+    stream = stream or sys.stdout
+    if format == 'json':
+        json.dump(hasil, stream, ensure_ascii=False, indent=2)
+        stream.write('\n')
+        return
+
+    r = hasil['ringkasan']
+    print(f"Status      : {hasil['status']} (kode {hasil['kode_keluar']})", file=stream)
+    print(f"File input  : {r['file']} ({r['file_gagal']} gagal)", file=stream)
+    print(f"Laporan     : {r['berhasil']} berhasil ({r['ditulis']} ditulis, "
+          f"{r['dilewati']} dilewati), {r['gagal']} gagal", file=stream)
+    print(f"Durasi      : {hasil['durasi_detik']:.1f} detik", file=stream)
+    for item in hasil['laporan']:
+        if not item['ok']:
+            print(f"  ✗ {item['input']} | {item['nama']}: {item['error']}", file=stream)
+
+
+def jalankan(args, log):
+    """Proses seluruh input sesuai argumen. Return dict ringkasan (siap JSON)"""
+    mulai = time.perf_counter()
+    files, tidak_cocok = cari_input(args.input)
+    for pola in tidak_cocok:
+        log(f"✗ Tidak ada file yang cocok: {pola}")
+
+    info_file, jobs, gagal = [], [], []
+    if args.gabung and files:
+        # Satu data gabungan; export terlama dulu agar kebijakan 'terbaru' benar
+        files_gabung = sorted(files, key=lambda f: (os.path.getmtime(f), f))
+        log(f"Menggabungkan {len(files)} file (kebijakan: {args.kebijakan})")
+    per_karyawan = []
+    for path in [files_gabung] if args.gabung and files else files:
+        info, jobs_file, gagal_file = siapkan_file(path, args, log,
+                                                   ringkasan=not args.tanpa_ringkasan)
+        if 'ringkasan' in info:
+            per_karyawan.append(info.pop('ringkasan'))
+        info_file.append(info)
+        jobs.extend(jobs_file)
+        gagal.extend(gagal_file)
+
+    jobs, dilewati, manifest = saring_berubah(jobs, args.paksa, log)
+    if jobs:
+        log(f"Menulis {len(jobs)} laporan ke {args.output} ({args.jobs or 'semua'} proses)")
+    ditulis = simpan_semua(jobs, args.jobs, log)
+    perbarui_manifest(manifest, ditulis)
+    laporan = ditulis + dilewati + gagal
+    file_ringkasan = tulis_ringkasan(per_karyawan, args.output, log)
+
+    ringkasan = {
+        'file': len(files),
+        'file_gagal': sum(not f['ok'] for f in info_file),
+        'input_tidak_cocok': tidak_cocok,
+        'laporan': len(laporan),
+        'berhasil': sum(h['ok'] for h in laporan),
+        'ditulis': sum(h['ok'] for h in ditulis),
+        'dilewati': len(dilewati),
+        'gagal': sum(not h['ok'] for h in laporan),
+    }
+    kode = kode_keluar(ringkasan)
+    return {
+        'status': {EXIT_OK: 'ok', EXIT_SEBAGIAN: 'sebagian'}.get(kode, 'gagal'),
+        'kode_keluar': kode,
+        'waktu': datetime.now().isoformat(timespec='seconds'),
+        'durasi_detik': round(time.perf_counter() - mulai, 3),
+        'output': os.path.abspath(args.output),
+        'ringkasan': ringkasan,
+        'file_ringkasan': file_ringkasan,
+        'file': info_file,
+        'laporan': laporan,
+    }
+
+
+def main(argv=None):
+    """Entry point batch; return kode keluar (lihat docstring modul)"""
+    parser = buat_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else EXIT_ARGUMEN
+    if args.jobs < 0:
+        parser.print_usage(sys.stderr)
+        print("absensi_batch: error: --jobs tidak boleh negatif", file=sys.stderr)
+        return EXIT_ARGUMEN
+
+    log = buat_log(args.quiet)
+    try:
+        hasil = jalankan(args, log)
+    except KeyboardInterrupt:
+        log("⚠️  Proses dihentikan")
+        return EXIT_DIHENTIKAN
+
+    cetak_ringkasan(hasil, args.format)
+    return hasil['kode_keluar']
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,7 @@ Untuk sistem tanpa GUI/Tkinter
 import os
 from datetime import datetime
 from file_uji_coba.attendance_processor import AttendanceProcessor
+from file_uji_coba.employee_index import TrigramIndex
 
 
 def clear_screen():
@@ -82,6 +83,9 @@ def select_employee(employee_list):
     print("\n👥 PILIH KARYAWAN")
     print("-" * 50)
     
+    # Indeks pencarian mirip (toleran gelar, tanda baca, salah ketik kecil)
+    indeks = TrigramIndex(dict.fromkeys(employee_list))
+    
     # Tampilkan 20 karyawan per halaman
     page_size = 20
     total_pages = (len(employee_list) + page_size - 1) // page_size
@@ -112,7 +116,11 @@ def select_employee(employee_list):
             current_page += 1
         elif choice == 'S':
             search = input("Masukkan nama (sebagian): ").strip()
+            # Cocok persis (substring) dulu, lalu hasil mirip berperingkat
             filtered = [e for e in employee_list if search.lower() in e.lower()]
+            filtered += [nama for nama, _ in indeks.cari(search, k=10)
+                         if nama not in filtered]
+            filtered = filtered[:10]
             if filtered:
                 print(f"\nDitemukan {len(filtered)} karyawan:")
                 for i, emp in enumerate(filtered[:10], 1):
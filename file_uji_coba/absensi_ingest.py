@@ -0,0 +1,123 @@
+"""
+Sistem Absensi - Ingest ke Database
+Parse export CSV/XLSX sekali lalu simpan ke database SQLite (lihat
+attendance_db). Setelah itu mode batch, GUI Pro dan AttendanceProcessor dapat
+membaca database langsung (berikan path .sqlite sebagai file input) tanpa
+parsing ulang.
+
+Contoh:
+    python run.py ingest "data/*.csv" --db absensi.sqlite
+    python run.py absensi.sqlite -o laporan -p 2026-03
+
+File yang isinya sudah pernah di-ingest (hash sama) dilewati kecuali --paksa.
+Ringkasan JSON dicetak ke stdout; kode keluar sama dengan mode batch.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from file_uji_coba.absensi_batch import (
+    EXIT_OK, EXIT_SEBAGIAN, EXIT_ARGUMEN, EXIT_TANPA_INPUT, EXIT_GAGAL, EXIT_DIHENTIKAN,
+    cari_input, buat_log
+)
+from file_uji_coba.attendance_db import AttendanceDB
+from file_uji_coba.attendance_processor import AttendanceProcessor
+from file_uji_coba.data_cache import hash_file
+
+
+DB_DEFAULT = 'absensi.sqlite'
+
+
+def buat_parser():
+    parser = argparse.ArgumentParser(
+        prog='absensi_ingest',
+        description="Masukkan export absensi CSV/XLSX ke database SQLite.")
+    parser.add_argument('input', nargs='+',
+                        help="file CSV/XLSX, folder atau pola glob")
+    parser.add_argument('--db', default=DB_DEFAULT,
+                        help=f"file database SQLite (default: {DB_DEFAULT})")
+    parser.add_argument('--streaming', action='store_true',
+                        help="baca CSV per chunk (memori terbatas untuk file sangat besar)")
+    parser.add_argument('--paksa', action='store_true',
+                        help="ingest ulang walau isi file sudah pernah dimasukkan")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="tanpa pesan progress di stderr")
+    return parser
+
+
+def ingest_file(db, path, args, log):
+    """Parse satu file lalu simpan ke db. Return ringkasan per file"""
+    mulai = time.perf_counter()
+    hasil = {'input': path, 'ok': False, 'dilewati': False, 'sel': 0, 'pesan': None}
+    digest = hash_file(path)
+    if not args.paksa and db.sudah_diingest(path, digest):
+        hasil.update(ok=True, dilewati=True, pesan="Isi file sudah ada di database")
+        log(f"= {path}: {hasil['pesan']}")
+        return hasil
+
+    processor = AttendanceProcessor(use_cache=False)
+    success, message = processor.load_csv(path, streaming=args.streaming)
+    if success:
+        try:
+            hasil['sel'] = db.simpan_store(processor.store, path, digest)
+            message = f"{message}, {hasil['sel']} sel disimpan"
+        except Exception as e:
+            success, message = False, f"Gagal menyimpan ke database: {e}"
+    hasil.update(ok=success, pesan=message,
+                 durasi_detik=round(time.perf_counter() - mulai, 3))
+    log(f"{'✓' if success else '✗'} {path}: {message}")
+    return hasil
+
+
+def jalankan(args, log):
+    """Ingest seluruh input. Return (dict ringkasan, kode keluar)"""
+    mulai = time.perf_counter()
+    files, tidak_cocok = cari_input(args.input)
+    for pola in tidak_cocok:
+        log(f"✗ Tidak ada file yang cocok: {pola}")
+
+    db = AttendanceDB(args.db)
+    hasil = [ingest_file(db, path, args, log) for path in files]
+
+    berhasil = sum(h['ok'] for h in hasil)
+    if not files:
+        kode = EXIT_TANPA_INPUT
+    elif berhasil == 0:
+        kode = EXIT_GAGAL
+    elif berhasil < len(hasil) or tidak_cocok:
+        kode = EXIT_SEBAGIAN
+    else:
+        kode = EXIT_OK
+    return {
+        'kode_keluar': kode,
+        'db': args.db,
+        'durasi_detik': round(time.perf_counter() - mulai, 3),
+        'input_tidak_cocok': tidak_cocok,
+        'file': hasil,
+    }, kode
+
+
+def main(argv=None):
+    """Entry point ingest; return kode keluar"""
+    parser = buat_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else EXIT_ARGUMEN
+
+    log = buat_log(args.quiet)
+    try:
+        ringkasan, kode = jalankan(args, log)
+    except KeyboardInterrupt:
+        log("⚠️  Proses dihentikan")
+        return EXIT_DIHENTIKAN
+
+    json.dump(ringkasan, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write('\n')
+    return kode
+
+
+if __name__ == "__main__":
+    sys.exit(main())
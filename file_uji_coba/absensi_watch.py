@@ -0,0 +1,287 @@
+"""
+Sistem Absensi - Pantau Folder
+Mode daemon untuk server: memantau folder tempat mesin absensi menaruh
+export CSV/XLSX (polling berkala, tanpa dependensi inotify) lalu langsung
+membuat ulang laporan dari file yang baru / berubah saja lewat pool proses
+berukuran tetap.
+
+- File baru diproses setelah ukuran & waktu modifikasinya tidak berubah
+  selama --debounce detik, dan XLSX sudah berupa arsip zip utuh, sehingga
+  file yang masih ditulis tidak terbaca setengah.
+- File sementara (~$*, .*, *.tmp, *.part, *.crdownload) dan isi folder
+  output diabaikan.
+- Tanda file (ukuran, mtime) yang sudah diproses disimpan di
+  <output>/.absensi_watch.json; restart tidak memproses ulang semuanya.
+
+Contoh:
+    python run.py watch /data/absen -o /data/laporan --tanpa-subfolder -j 2
+
+Opsi laporan sama dengan mode batch (lihat absensi_batch). Setiap file
+selesai diproses, satu baris JSON ringkasan dicetak ke stdout.
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from file_uji_coba.absensi_batch import (
+    EKSTENSI_INPUT, EXIT_OK, EXIT_ARGUMEN, EXIT_TANPA_INPUT,
+    tambah_opsi_laporan, siapkan_file, saring_berubah, simpan_semua, perbarui_manifest, buat_log
+)
+from file_uji_coba.data_cache import tulis_atomik
+
+
+# Jeda antar pemindaian folder (detik)
+INTERVAL_DETIK = 2.0
+
+# Lama file harus tidak berubah sebelum diproses (detik)
+DEBOUNCE_DETIK = 5.0
+
+# File status (tanda file yang sudah diproses) di folder output
+FILE_STATUS = '.absensi_watch.json'
+
+_AWALAN_ABAIKAN = ('~$', '.')
+_AKHIRAN_ABAIKAN = ('.tmp', '.part', '.crdownload')
+
+
+def file_utuh(path):
+    """Pemeriksaan akhir penulisan selesai: XLSX harus arsip zip valid, CSV tidak kosong"""
+    try:
+        if path.lower().endswith('.xlsx'):
+            return zipfile.is_zipfile(path)
+        return os.path.getsize(path) > 0
+    except OSError:
+        return False
+
+
+def baca_status(path):
+    """{path: (ukuran, mtime_ns)} dari file status (kosong jika belum ada / rusak)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return {p: tuple(t) for p, t in json.load(f).items()}
+    except (OSError, ValueError):
+        return {}
+
+
+def simpan_status(path, diproses):
+    """Tulis file status secara atomik (tulis file sementara lalu rename)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    data = json.dumps(diproses, ensure_ascii=False, indent=1).encode('utf-8')
+    tulis_atomik(path, lambda f: f.write(data))
+
+
+class PemantauFolder:
+    """
+    Deteksi file input yang siap diproses dengan polling.
+
+    siap() memindai folder; file yang baru muncul / berubah menjadi kandidat,
+    dan dilaporkan siap setelah tandanya stabil selama `debounce` detik.
+    File yang tandanya sama dengan tanda terakhir diproses dilewati.
+    """
+
+    def __init__(self, folder, rekursif=False, debounce=DEBOUNCE_DETIK, abaikan=(),
+                 diproses=None, jam=time.monotonic):
+        self.folder = os.path.abspath(folder)
+        self.rekursif = rekursif
+        self.debounce = debounce
+        self.abaikan = tuple(os.path.join(os.path.abspath(p), '') for p in abaikan)
+        self.diproses = dict(diproses or {})
+        self._kandidat = {}          # path → (tanda, sejak)
+        self._jam = jam
+
+    def _relevan(self, nama):
+        nama_kecil = nama.lower()
+        return (os.path.splitext(nama_kecil)[1] in EKSTENSI_INPUT
+                and not nama.startswith(_AWALAN_ABAIKAN)
+                and not nama_kecil.endswith(_AKHIRAN_ABAIKAN))
+
+    def pindai(self):
+        """{path: tanda} seluruh file input di folder saat ini"""
+        hasil = {}
+        tumpukan = [self.folder]
+        while tumpukan:
+            try:
+                entri = list(os.scandir(tumpukan.pop()))
+            except OSError:
+                continue
+            for e in entri:
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        if self.rekursif and not os.path.join(e.path, '').startswith(self.abaikan):
+                            tumpukan.append(e.path)
+                    elif e.is_file() and self._relevan(e.name):
+                        st = e.stat()
+                        hasil[e.path] = (st.st_size, st.st_mtime_ns)
+                except OSError:
+                    # File dihapus / dipindah di tengah pemindaian
+                    continue
+        return hasil
+
+    @property
+    def menunggu(self):
+        """Jumlah file yang sedang menunggu stabil"""
+        return len(self._kandidat)
+
+    def siap(self):
+        """List (path, tanda) yang siap diproses, urut waktu modifikasi"""
+        sekarang = self._jam()
+        ada = self.pindai()
+        siap = []
+        for path, tanda in ada.items():
+            if self.diproses.get(path) == tanda:
+                self._kandidat.pop(path, None)
+                continue
+            lama = self._kandidat.get(path)
+            if lama is None or lama[0] != tanda:
+                # Baru muncul atau masih ditulis: mulai (ulang) hitungan debounce
+                self._kandidat[path] = (tanda, sekarang)
+            elif sekarang - lama[1] >= self.debounce and file_utuh(path):
+                siap.append((path, tanda))
+
+        for path in [p for p in self._kandidat if p not in ada]:
+            del self._kandidat[path]
+        return sorted(siap, key=lambda item: item[1][1])
+
+    def tandai(self, path, tanda):
+        """Catat file sudah diproses dengan tanda ini"""
+        self.diproses[path] = tanda
+        self._kandidat.pop(path, None)
+
+
+def _abaikan_sigint():
+    # Ctrl+C ditangani proses utama (berhenti setelah file berjalan selesai)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def proses_file(path, args):
+    """Worker pool: muat satu file lalu tulis laporannya. Return ringkasan (siap JSON)"""
+    mulai = time.perf_counter()
+    log = buat_log(args.quiet)
+    info, jobs, gagal = siapkan_file(path, args, log)
+    jobs, dilewati, manifest = saring_berubah(jobs, args.paksa, log)
+    ditulis = simpan_semua(jobs, 1, log)
+    perbarui_manifest(manifest, ditulis)
+    laporan = ditulis + dilewati + gagal
+    return {
+        'waktu': datetime.now().isoformat(timespec='seconds'),
+        'input': path,
+        'ok': info['ok'] and all(h['ok'] for h in laporan),
+        'pesan': info['pesan'],
+        'berhasil': sum(h['ok'] for h in laporan),
+        'dilewati': len(dilewati),
+        'gagal': sum(not h['ok'] for h in laporan),
+        'durasi_detik': round(time.perf_counter() - mulai, 3),
+        'laporan': laporan,
+    }
+
+
+def buat_parser():
+    parser = argparse.ArgumentParser(
+        prog='absensi_watch',
+        description="Pantau folder export absensi dan buat laporan otomatis "
+                    "setiap ada file baru / berubah.")
+    parser.add_argument('folder', help="folder yang dipantau")
+    tambah_opsi_laporan(parser)
+    parser.add_argument('--rekursif', action='store_true', help="ikut pantau subfolder")
+    parser.add_argument('--interval', type=float, default=INTERVAL_DETIK,
+                        help=f"jeda antar pemindaian, detik (default: {INTERVAL_DETIK:g})")
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_DETIK,
+                        help=f"file harus tidak berubah selama ini sebelum diproses, detik "
+                             f"(default: {DEBOUNCE_DETIK:g})")
+    parser.add_argument('--sekali', action='store_true',
+                        help="proses isi folder saat ini lalu keluar (tanpa terus memantau)")
+    return parser
+
+
+def pantau(args, log, berhenti, keluaran=None):
+    """
+    Loop pemantauan sampai `berhenti` (threading.Event) di-set, atau sampai
+    tidak ada lagi file tertunda jika args.sekali.
+    """
+    keluaran = keluaran or sys.stdout
+    status_path = os.path.join(args.output, FILE_STATUS)
+    pemantau = PemantauFolder(args.folder, args.rekursif, args.debounce,
+                              abaikan=[args.output], diproses=baca_status(status_path))
+    max_workers = args.jobs or os.cpu_count() or 1
+    log(f"Memantau {pemantau.folder} (interval {args.interval:g} dtk, debounce "
+        f"{args.debounce:g} dtk, {max_workers} proses) → {os.path.abspath(args.output)}")
+
+    berjalan = {}   # future → (path, tanda)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_abaikan_sigint) as executor:
+        while True:
+            for future in [f for f in berjalan if f.done()]:
+                path, tanda = berjalan.pop(future)
+                try:
+                    hasil = future.result()
+                except Exception as e:
+                    hasil = {'waktu': datetime.now().isoformat(timespec='seconds'),
+                             'input': path, 'ok': False, 'pesan': f"{type(e).__name__}: {e}",
+                             'berhasil': 0, 'dilewati': 0, 'gagal': 0, 'laporan': []}
+                # Gagal pun ditandai: file baru dicoba lagi jika isinya berubah
+                pemantau.tandai(path, tanda)
+                simpan_status(status_path, pemantau.diproses)
+                log(f"{'✓' if hasil['ok'] else '✗'} {path}: "
+                    f"{hasil['berhasil'] - hasil['dilewati']} laporan ditulis, "
+                    f"{hasil['dilewati']} tidak berubah, {hasil['gagal']} gagal")
+                keluaran.write(json.dumps(hasil, ensure_ascii=False) + '\n')
+                keluaran.flush()
+
+            if berhenti.is_set():
+                break
+
+            sedang = {path for path, _ in berjalan.values()}
+            for path, tanda in pemantau.siap():
+                if len(berjalan) >= max_workers:
+                    break
+                if path in sedang:
+                    continue
+                log(f"→ Memproses {path}")
+                berjalan[executor.submit(proses_file, path, args)] = (path, tanda)
+
+            if args.sekali and not berjalan and not pemantau.menunggu:
+                break
+            berhenti.wait(args.interval)
+
+
+def main(argv=None):
+    """Entry point mode pantau folder; return kode keluar"""
+    parser = buat_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else EXIT_ARGUMEN
+    if args.jobs < 0 or args.interval <= 0 or args.debounce < 0:
+        parser.print_usage(sys.stderr)
+        print("absensi_watch: error: --jobs, --interval dan --debounce tidak boleh negatif",
+              file=sys.stderr)
+        return EXIT_ARGUMEN
+
+    log = buat_log(args.quiet)
+    if not os.path.isdir(args.folder):
+        log(f"✗ Folder tidak ditemukan: {args.folder}")
+        return EXIT_TANPA_INPUT
+
+    # Ctrl+C / SIGTERM: selesaikan file yang sedang diproses lalu keluar
+    berhenti = threading.Event()
+    def _henti(signum, frame):
+        if not berhenti.is_set():
+            log("⚠️  Menghentikan pemantauan (menunggu file yang sedang diproses)...")
+        berhenti.set()
+    for nama in ('SIGINT', 'SIGTERM'):
+        if hasattr(signal, nama):
+            signal.signal(getattr(signal, nama), _henti)
+
+    pantau(args, log, berhenti)
+    log("Pemantauan selesai")
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
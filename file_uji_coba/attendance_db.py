@@ -0,0 +1,282 @@
+"""
+Attendance DB
+Penyimpanan absensi permanen di SQLite (mode WAL) dengan skema ternormalisasi:
+
+    employees (id, nik, nama)
+    attendance(employee_id, date, status, in_sec, out_sec,
+               teks_masuk, teks_pulang, source_file)
+
+Export CSV/XLSX cukup di-parse sekali saat ingest; setelah itu data dibaca
+kembali sebagai AttendanceStore (bentuk yang sama dengan hasil parsing file)
+lewat query berindeks (employee_id, date), sehingga AttendanceProcessor dan
+SistemAbsensiPro dapat memakainya tanpa membaca ulang CSV.
+
+Satu baris attendance per (karyawan, tanggal); ingest file berikutnya yang
+memuat tanggal sama menimpa baris lama (file terbaru menang).
+
+Hanya ingest yang membuat database & skema; pembaca membuka database yang
+sudah ada dalam mode read-only (baca_saja=True).
+"""
+
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from file_uji_coba.attendance_store import (
+    FLAG_TEKS, TIDAK_ADA, store_dari_sel
+)
+from file_uji_coba.data_cache import hash_file
+
+
+# Ekstensi file yang dianggap database absensi
+EKSTENSI_DB = ('.sqlite', '.sqlite3', '.db')
+
+_ORDINAL_EPOCH = 719163
+
+SKEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    id   INTEGER PRIMARY KEY,
+    nik  TEXT NOT NULL DEFAULT '',
+    nama TEXT NOT NULL,
+    UNIQUE (nama, nik)
+);
+CREATE TABLE IF NOT EXISTS attendance (
+    employee_id INTEGER NOT NULL REFERENCES employees(id),
+    date        TEXT    NOT NULL,
+    status      INTEGER NOT NULL,
+    in_sec      INTEGER,
+    out_sec     INTEGER,
+    teks_masuk  TEXT,
+    teks_pulang TEXT,
+    source_file TEXT    NOT NULL,
+    PRIMARY KEY (employee_id, date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_attendance_date ON attendance(date);
+CREATE TABLE IF NOT EXISTS source_files (
+    path   TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    sel    INTEGER NOT NULL,
+    waktu  TEXT NOT NULL
+);
+"""
+
+_UPSERT_ABSENSI = """
+INSERT INTO attendance (employee_id, date, status, in_sec, out_sec,
+                        teks_masuk, teks_pulang, source_file)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (employee_id, date) DO UPDATE SET
+    status = excluded.status, in_sec = excluded.in_sec, out_sec = excluded.out_sec,
+    teks_masuk = excluded.teks_masuk, teks_pulang = excluded.teks_pulang,
+    source_file = excluded.source_file
+"""
+
+
+def adalah_db(path):
+    """True jika path berekstensi database absensi"""
+    return os.path.splitext(str(path))[1].lower() in EKSTENSI_DB
+
+
+def _ordinal_ke_iso(ordinal):
+    hari = (np.asarray(ordinal, dtype=np.int64) - _ORDINAL_EPOCH).astype('datetime64[D]')
+    return np.datetime_as_string(hari, unit='D')
+
+
+def _rentang_periode(month=None, year=None):
+    """Batas tanggal [awal, akhir) teks ISO untuk filter berindeks (None jika tanpa tahun)"""
+    if not year:
+        return None
+    if month:
+        akhir = f"{year + 1:04d}-01-01" if month == 12 else f"{year:04d}-{month + 1:02d}-01"
+        return f"{year:04d}-{month:02d}-01", akhir
+    return f"{year:04d}-01-01", f"{year + 1:04d}-01-01"
+
+
+class AttendanceDB:
+    """
+    Akses database absensi. Setiap operasi membuka koneksi sendiri sehingga
+    aman dipakai dari thread worker GUI maupun proses pool.
+
+    baca_saja=True: database harus sudah ada (FileNotFoundError jika tidak)
+    dan dibuka read-only — path salah tidak meninggalkan database kosong.
+    """
+
+    def __init__(self, path, baca_saja=False):
+        self.path = path
+        self.baca_saja = baca_saja
+        if baca_saja:
+            if not os.path.isfile(path):
+                raise FileNotFoundError(f"File tidak ditemukan: {path}")
+            return
+        with self._koneksi() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SKEMA)
+
+    @contextmanager
+    def _koneksi(self):
+        if self.baca_saja:
+            conn = sqlite3.connect(Path(self.path).absolute().as_uri() + '?mode=ro',
+                                   uri=True, timeout=30)
+        else:
+            conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            if not self.baca_saja:
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ---- ingest ----
+
+    def sudah_diingest(self, file_path, digest=None):
+        """True jika isi file ini (hash sama) sudah pernah dimasukkan"""
+        digest = digest or hash_file(file_path)
+        with self._koneksi() as conn:
+            baris = conn.execute("SELECT digest FROM source_files WHERE path = ?",
+                                 (os.path.abspath(file_path),)).fetchone()
+        return baris is not None and baris[0] == digest
+
+    def simpan_store(self, store, source_file, digest=None):
+        """
+        Masukkan seluruh sel AttendanceStore (satu transaksi, executemany).
+        Baris tanpa nama dilewati; nama+NIK ganda dalam satu file memakai
+        baris pertama (sama seperti process_all_employees). Return jumlah sel.
+        """
+        if store.nama is None:
+            raise ValueError("Kolom 'nama' tidak ditemukan")
+
+        nama = pd.Series(store.nama, dtype=object)
+        nik = pd.Series(store.nik if store.nik is not None else [None] * len(store), dtype=object)
+        nik = nik.where(nik.notna(), '').astype(str).str.strip()
+        nama = nama.where(nama.isna(), nama.astype(str).str.strip())
+        identitas = pd.DataFrame({'nama': nama, 'nik': nik})
+        baris = np.flatnonzero((nama.notna() & ~identitas.duplicated()).to_numpy())
+
+        kunci = list(zip(identitas['nama'].to_numpy()[baris], identitas['nik'].to_numpy()[baris]))
+        source_file = os.path.abspath(source_file)
+        digest = digest or hash_file(source_file)
+        lebar = len(store.tanggal)
+
+        with self._koneksi() as conn:
+            conn.executemany("INSERT OR IGNORE INTO employees (nama, nik) VALUES (?, ?)", kunci)
+            ids = {(nm, nk): i for i, nm, nk in conn.execute("SELECT id, nama, nik FROM employees")}
+            pegawai = np.array([ids[k] for k in kunci], dtype=np.int64)
+
+            status = store.status[baris].ravel()
+            masuk = store.masuk[baris].ravel().astype(object)
+            pulang = store.pulang[baris].ravel().astype(object)
+            masuk[store.masuk[baris].ravel() == TIDAK_ADA] = None
+            pulang[store.pulang[baris].ravel() == TIDAK_ADA] = None
+
+            teks_masuk = np.full(len(status), None, dtype=object)
+            teks_pulang = np.full(len(status), None, dtype=object)
+            posisi_baris = {int(b): i for i, b in enumerate(baris)}
+            for (b, k), (m, p) in store.teks_lain.items():
+                i = posisi_baris.get(b)
+                if i is not None:
+                    teks_masuk[i * lebar + k] = m
+                    teks_pulang[i * lebar + k] = p
+
+            conn.executemany(_UPSERT_ABSENSI, zip(
+                np.repeat(pegawai, lebar).tolist(),
+                np.tile(_ordinal_ke_iso(store.tanggal), len(baris)).tolist(),
+                status.tolist(), masuk.tolist(), pulang.tolist(),
+                teks_masuk.tolist(), teks_pulang.tolist(),
+                [source_file] * len(status),
+            ))
+            conn.execute(
+                "INSERT OR REPLACE INTO source_files (path, digest, sel, waktu) VALUES (?, ?, ?, ?)",
+                (source_file, digest, len(status), datetime.now().isoformat(timespec='seconds')))
+        return len(status)
+
+    # ---- query ----
+
+    def daftar_karyawan(self):
+        """DataFrame id, nama, nik seluruh karyawan (urut nama)"""
+        with self._koneksi() as conn:
+            return pd.read_sql_query(
+                "SELECT id, nama, nik FROM employees ORDER BY nama, nik", conn)
+
+    def cari_karyawan(self, teks):
+        """List id karyawan dengan nama (tanpa beda huruf besar/kecil) atau NIK persis"""
+        with self._koneksi() as conn:
+            return [i for (i,) in conn.execute(
+                "SELECT id FROM employees WHERE nama = ? COLLATE NOCASE OR (nik != '' AND nik = ?)",
+                (str(teks).strip(), str(teks).strip()))]
+
+    def daftar_tanggal(self):
+        """Seluruh tanggal berdata (teks ISO, urut) — dibaca dari indeks date"""
+        with self._koneksi() as conn:
+            return [t for (t,) in conn.execute("SELECT DISTINCT date FROM attendance ORDER BY date")]
+
+    def ambil_store(self, pegawai=None, month=None, year=None, dengan_tanggal=True):
+        """
+        Bangun AttendanceStore dari database. pegawai: list id karyawan
+        (None = semua); month/year: filter periode lewat indeks (employee_id, date).
+        dengan_tanggal=False: hanya identitas karyawan (grid tanpa kolom).
+
+        Dengan filter periode hanya karyawan yang punya baris attendance pada
+        periode itu yang diambil (sama seperti export CSV periode tersebut),
+        bukan seluruh karyawan yang pernah di-ingest.
+
+        Kolom store: nama, nik, lalu tanggal 'YYYY-MM-DD' yang berdata.
+        """
+        syarat, params = [], []
+        if pegawai is not None:
+            pegawai = [int(i) for i in pegawai]
+            syarat.append(f"employee_id IN ({','.join('?' * len(pegawai))})")
+            params.extend(pegawai)
+        rentang = _rentang_periode(month, year)
+        if rentang:
+            syarat.append("date >= ? AND date < ?")
+            params.extend(rentang)
+        elif month:
+            syarat.append("substr(date, 6, 2) = ?")
+            params.append(f"{month:02d}")
+        where = f"WHERE {' AND '.join(syarat)}" if syarat else ""
+
+        with self._koneksi() as conn:
+            sql_pegawai = "SELECT id, nama, nik FROM employees"
+            if rentang or month:
+                # Karyawan yang berdata di periode (subquery lewat indeks (employee_id, date))
+                sql_pegawai += f" WHERE id IN (SELECT DISTINCT employee_id FROM attendance {where})"
+                params_pegawai = params
+            elif pegawai is not None:
+                sql_pegawai += f" WHERE id IN ({','.join('?' * len(pegawai))})"
+                params_pegawai = pegawai
+            else:
+                params_pegawai = None
+            karyawan = pd.read_sql_query(sql_pegawai + " ORDER BY id", conn, params=params_pegawai)
+            if dengan_tanggal:
+                sel = pd.read_sql_query(
+                    "SELECT employee_id, date, status, COALESCE(in_sec, -1) AS in_sec, "
+                    "COALESCE(out_sec, -1) AS out_sec, teks_masuk, teks_pulang "
+                    f"FROM attendance {where}", conn, params=params)
+            else:
+                sel = None
+
+        ids = karyawan['id'].to_numpy(dtype=np.int64)
+        nama = karyawan['nama'].to_numpy(dtype=object)
+        nik = karyawan['nik'].astype(object).where(karyawan['nik'] != '', np.nan).to_numpy()
+        if sel is None:
+            sel = pd.DataFrame({k: [] for k in ('employee_id', 'date', 'status', 'in_sec',
+                                                'out_sec', 'teks_masuk', 'teks_pulang')})
+
+        tanggal = sel['date'].to_numpy(dtype='datetime64[D]').astype(np.int64) + _ORDINAL_EPOCH
+        status = sel['status'].to_numpy(dtype=np.int8)
+        teks_masuk = sel['teks_masuk'].to_numpy(dtype=object)
+        teks_pulang = sel['teks_pulang'].to_numpy(dtype=object)
+        teks_lain = {
+            int(i): (str(teks_masuk[i]), None if pd.isna(teks_pulang[i]) else str(teks_pulang[i]))
+            for i in np.flatnonzero((status & FLAG_TEKS) != 0)
+        }
+        return store_dari_sel(
+            nama, nik, np.searchsorted(ids, sel['employee_id'].to_numpy(dtype=np.int64)), tanggal,
+            status, sel['in_sec'].to_numpy(dtype=np.int32), sel['out_sec'].to_numpy(dtype=np.int32),
+            teks_lain)
@@ -3,220 +3,501 @@ Attendance Data Processor
 Sistem pengolahan data absensi dengan auto-detect format
 """
 
+import hashlib
+import os
 import pandas as pd
-from datetime import datetime, timedelta
-import calendar
+import numpy as np
 
+from file_uji_coba.data_cache import DataCache
+from file_uji_coba.csv_sniffer import deteksi_dialek
+from file_uji_coba.attendance_store import (
+    CHUNK_BARIS, FORMAT_HMS, AttendanceStore, parse_jam, durasi_detik, bangun_store_csv,
+    bangun_store_xlsx, melt_store, hash_periode, gabung_hash
+)
+from file_uji_coba.attendance_db import AttendanceDB, adalah_db
+from file_uji_coba.attendance_summary import UNIT_DEFAULT, ringkas_sel
+from file_uji_coba.employee_index import EmployeeIndex, pesan_ambigu
+from file_uji_coba.export_merge import KEBIJAKAN_TERBARU, gabung_store
+from file_uji_coba.header_index import HeaderIndex, parse_header_tanggal
+from file_uji_coba.holiday_calendar import NAMA_HARI, muat_kalender_libur
 
-class AttendanceProcessor:
-    """Kelas untuk memproses data absensi"""
+
+# Kolom non-tanggal yang selalu ikut dibaca saat proyeksi kolom per periode
+KOLOM_IDENTITAS = ['nama', 'nik']
+
+
+def bangun_header_kalender(columns, formats, abaikan, holidays, indeks=None):
+    """
+    Metadata per kolom data sumber: tanggal (NaT jika bukan tanggal),
+    Tanggal ('%Y-%m-%d'), Hari (Bahasa Indonesia), akhir_pekan, libur
+    (nama hari libur / NaN) dan hari_kerja (urutan hari kerja dalam tahun).
     
-    # Hari libur nasional Indonesia 2026
-    INDONESIAN_HOLIDAYS = {
-        '2026': {
-            '01-01': 'Tahun Baru 2026',
-            '03-23': 'Isra Miraj',
-            '03-31': 'Hari Suci Nyepi',
-            '04-03': 'Wafat Yesus Kristus',
-            '04-05': 'Paskah',
-            '05-01': 'Hari Buruh',
-            '05-04': 'Kenaikan Yesus Kristus',
-            '05-14': 'Hari Raya Waisak',
-            '06-01': 'Hari Lahir Pancasila',
-            '06-17': 'Idul Fitri',
-            '06-18': 'Idul Fitri',
-            '08-17': 'Hari Kemerdekaan RI',
-            '08-24': 'Idul Adha',
-            '09-14': 'Tahun Baru Islam',
-            '11-23': 'Maulid Nabi Muhammad SAW',
-            '12-25': 'Hari Raya Natal',
-            '12-26': 'Cuti Bersama Natal',
-        }
-    }
+    holidays: KalenderLibur; metadata diambil dari tabel dimensi per tahun
+    dengan satu gather untuk seluruh kolom.
+    
+    indeks: HeaderIndex file sumber; tanggal diambil dari petanya tanpa parse ulang.
+    """
+    if indeks is not None:
+        tanggal = indeks.tanggal_kolom(columns)
+    else:
+        tanggal = parse_header_tanggal(columns, formats, abaikan)
+    dimensi = holidays.dimensi(tanggal)
+    
+    return pd.DataFrame({
+        'tanggal': tanggal,
+        'Tanggal': dimensi['Tanggal'],
+        'Hari': dimensi['Hari'],
+        'akhir_pekan': dimensi['akhir_pekan'],
+        'libur': dimensi['libur'],
+        'hari_kerja': dimensi['hari_kerja'],
+    })
+
+
+def pilih_kolom_periode(tanggal, month=None, year=None):
+    """Posisi kolom tanggal yang masuk periode (bulan/tahun opsional)"""
+    pilih = tanggal.notna().to_numpy()
+    if month:
+        pilih = pilih & (tanggal.dt.month == month).to_numpy()
+    if year:
+        pilih = pilih & (tanggal.dt.year == year).to_numpy()
+    return np.flatnonzero(pilih)
+
+
+def baris_karyawan_unik(nama):
+    """Posisi satu baris per nama karyawan (baris pertama jika nama ganda, nama kosong dilewati)"""
+    return np.flatnonzero((nama.notna() & ~nama.duplicated()).to_numpy())
+
+
+def kolom_proyeksi(header, formats, abaikan, month=None, year=None, dengan_tanggal=True,
+                   indeks=None):
+    """
+    Posisi kolom yang perlu dibaca (usecols): nama/nik + kolom tanggal periode.
+    
+    dengan_tanggal=False hanya kolom identitas. Return None (baca semua kolom)
+    jika file tidak punya kolom 'nama', agar pesan error tetap sama.
+    indeks: HeaderIndex header yang sama (lookup periode tanpa parse ulang).
+    """
+    header = pd.Index(header, dtype=object).astype(str).str.strip().str.lower()
+    if 'nama' not in header:
+        return None
     
-    def __init__(self):
-        self.df_source = None
+    posisi = np.flatnonzero(header.isin(KOLOM_IDENTITAS))
+    if dengan_tanggal:
+        if indeks is not None and indeks.cocok(header):
+            periode = indeks.posisi(month, year)
+        else:
+            periode = pilih_kolom_periode(parse_header_tanggal(header, formats, abaikan), month, year)
+        posisi = np.union1d(posisi, periode)
+    return [int(p) for p in posisi]
+
+
+class KonfigurasiAbsensi:
+    """
+    Konfigurasi pembacaan data absensi dan helper yang dipakai bersama oleh
+    AttendanceProcessor dan GUI Pro (sistem-absensi.py). Kelas turunan
+    menyediakan atribut store, kalender_libur, indeks_header, _header_kalender
+    dan _header_sumber.
+    """
+    
+    # Durasi maksimum shift malam (jam): jam pulang < jam masuk dianggap esok hari
+    # jika durasinya tidak melebihi batas ini. None = tanpa rollover (mis. 16 untuk satpam)
+    SHIFT_MALAM_MAKS_JAM = None
+    
+    # Libur daerah yang ikut dihitung selain libur nasional & cuti bersama (mis. ['bali'])
+    WILAYAH_LIBUR = []
+    
+    # Kolom non-tanggal yang diabaikan saat membaca header
+    KOLOM_ABAIKAN = ['nama', 'nik', 'no', 'nomor']
+    
+    # Format header tanggal yang didukung (urutan = prioritas)
+    # ('%Y-%m-%d %H:%M:%S' = header tanggal bertipe datetime di file XLSX)
+    FORMAT_TANGGAL = ['%d-%m-%Y', '%Y-%m-%d', '%d/%m/%Y', '%Y-%m-%d %H:%M:%S']
+    
+    # Format teks jam sel tidak baku saat menghitung durasi (lihat parse_jam)
+    FORMAT_JAM = FORMAT_HMS
+    
+    def get_header_kalender(self):
+        """Metadata per kolom (tanggal, nama hari, hari libur), di-cache sampai kolom berubah"""
+        columns = self.store.columns
+        if self._header_kalender is None or self._header_sumber is not columns:
+            self._header_kalender = bangun_header_kalender(
+                columns, self.FORMAT_TANGGAL, self.KOLOM_ABAIKAN, self.kalender_libur,
+                self.indeks_header)
+            self._header_sumber = columns
+        return self._header_kalender
+    
+    def lintas_hari(self):
+        """Batas durasi shift lintas tengah malam dalam detik (None = tanpa rollover)"""
+        if self.SHIFT_MALAM_MAKS_JAM is None:
+            return None
+        return int(self.SHIFT_MALAM_MAKS_JAM * 3600)
+    
+    def durasi_sel(self, sel):
+        """Durasi kerja per sel bentuk panjang dalam detik (NaN jika format jam tidak valid)"""
+        # Detik di store (-1 = format tidak valid)
+        masuk = sel['detik_masuk'].to_numpy().astype(np.float64)
+        pulang = sel['detik_pulang'].to_numpy().astype(np.float64)
+        masuk[masuk < 0] = np.nan
+        pulang[pulang < 0] = np.nan
+        
+        # Sel tidak baku: teks asli diparse ulang dengan FORMAT_JAM
+        tidak_baku = sel['tidak_baku'].to_numpy()
+        if tidak_baku.any():
+            def _detik(jam):
+                detik, rusak = parse_jam(jam.to_numpy(dtype=object), self.FORMAT_JAM)
+                return np.where(rusak, np.nan, detik)
+            
+            teks = sel.loc[tidak_baku]
+            masuk[tidak_baku] = _detik(teks['masuk'])
+            pulang[tidak_baku] = _detik(teks['pulang'])
+        
+        return durasi_detik(masuk, pulang, self.lintas_hari())
+
+
+class AttendanceProcessor(KonfigurasiAbsensi):
+    """Kelas untuk memproses data absensi"""
+    
+    def __init__(self, use_cache=True, wilayah_libur=None):
+        self.store = None
+        self.konflik = None          # DataFrame konflik hasil load_banyak
         self.employee_list = []
+        self.indeks_pegawai = None
+        self.indeks_header = None
+        self._header_kalender = None
+        self._header_sumber = None
+        
+        # Kalender libur multi-tahun dari file data (hari_libur.csv)
+        wilayah = self.WILAYAH_LIBUR if wilayah_libur is None else wilayah_libur
+        self.kalender_libur = muat_kalender_libur(tuple(wilayah))
+        
+        # Cache hasil parsing di disk (None = nonaktif)
+        self.cache = DataCache() if use_cache else None
     
     def detect_csv_format(self, file_path):
-        """Deteksi format CSV (semicolon atau comma)"""
+        """Deteksi format CSV (semicolon atau comma) dari sample awal file"""
         try:
-            # Coba baca dengan semicolon
-            df = pd.read_csv(file_path, sep=';', dtype=str, nrows=5)
-            if len(df.columns) > 3:
-                return ';'
-            
-            # Coba baca dengan comma
-            df = pd.read_csv(file_path, sep=',', dtype=str, nrows=5)
-            if len(df.columns) > 3:
-                return ','
-            
-            return ';'  # default
+            return deteksi_dialek(file_path).separator
         except Exception:
             return ';'
     
-    def load_csv(self, file_path):
-        """Load CSV file dengan auto-detect separator"""
+    def load_csv(self, file_path, streaming=False, chunksize=CHUNK_BARIS, month=None, year=None):
+        """
+        Load CSV file dengan auto-detect separator ke AttendanceStore
+        (detik int32 + kode status per sel, bukan string).
+        
+        streaming=True: file dibaca per chunk sehingga memori puncak dibatasi
+        ukuran chunk; cocok untuk export multi-tahun/multi-site yang sangat besar.
+        
+        month/year: hanya kolom nama/nik + kolom tanggal periode tersebut yang
+        di-parse (proyeksi usecols dari header hasil sniffing).
+        
+        File .xlsx (sheet pertama) juga diterima dan selalu dibaca streaming;
+        database SQLite (.sqlite/.db, lihat attendance_db) dibaca lewat load_db.
+        """
+        if adalah_db(file_path):
+            return self.load_db(file_path, month=month, year=year)
         try:
-            separator = self.detect_csv_format(file_path)
-            self.df_source = pd.read_csv(file_path, sep=separator, dtype=str)
-            
-            # Bersihkan nama kolom
-            self.df_source.columns = self.df_source.columns.astype(str).str.strip().str.lower()
-            
-            # Ekstrak daftar pegawai
-            if 'nama' in self.df_source.columns:
-                self.employee_list = self.df_source['nama'].dropna().tolist()
-                return True, f"Berhasil memuat {len(self.employee_list)} karyawan"
-            else:
-                return False, "Kolom 'nama' tidak ditemukan dalam file CSV"
-                
+            return self._pasang_store(
+                self._baca_store(file_path, streaming, chunksize, month, year))
         except Exception as e:
             return False, f"Error membaca file: {str(e)}"
     
-    def get_hari_indonesia(self, date_obj):
-        """Mengembalikan nama hari dalam Bahasa Indonesia"""
-        days = {
-            'Monday': 'Senin', 'Tuesday': 'Selasa', 'Wednesday': 'Rabu',
-            'Thursday': 'Kamis', 'Friday': 'Jumat', 'Saturday': 'Sabtu',
-            'Sunday': 'Minggu'
-        }
-        return days[date_obj.strftime('%A')]
+    def load_banyak(self, file_paths, kebijakan=KEBIJAKAN_TERBARU, streaming=False,
+                    chunksize=CHUNK_BARIS, month=None, year=None):
+        """
+        Load beberapa export yang tumpang tindih lalu gabungkan per
+        (karyawan, tanggal) — lihat export_merge. Urutan file = urutan export
+        (terlama dulu) untuk kebijakan 'terbaru'. Konflik disimpan di
+        self.konflik (DataFrame, satu baris per karyawan-tanggal).
+        """
+        try:
+            stores = [self._baca_store(path, streaming, chunksize, month, year)
+                      for path in file_paths]
+            store, self.konflik = gabung_store(stores, file_paths, kebijakan)
+        except Exception as e:
+            return False, f"Error menggabungkan file: {str(e)}"
+        
+        success, message = self._pasang_store(store)
+        if success:
+            message = (f"{message} dari {len(file_paths)} file "
+                       f"({len(self.konflik)} konflik, kebijakan: {kebijakan})")
+        return success, message
     
-    def is_holiday(self, date_obj):
-        """Cek apakah tanggal adalah hari libur nasional"""
-        year = str(date_obj.year)
-        date_str = date_obj.strftime('%m-%d')
+    def _baca_store(self, file_path, streaming=False, chunksize=CHUNK_BARIS, month=None, year=None):
+        """Parse satu file (atau query database) menjadi AttendanceStore, lewat cache jika ada"""
+        if adalah_db(file_path):
+            return AttendanceDB(file_path, baca_saja=True).ambil_store(month=month, year=year)
         
-        if year in self.INDONESIAN_HOLIDAYS:
-            if date_str in self.INDONESIAN_HOLIDAYS[year]:
-                return True, self.INDONESIAN_HOLIDAYS[year][date_str]
+        proyeksi, varian = self._proyeksi_periode(month, year)
+        varian = 'store|' + '|'.join(self.FORMAT_TANGGAL + self.KOLOM_ABAIKAN) + '|' + varian
+        arrays = self.cache.load_arrays(file_path, varian) if self.cache else None
+        if arrays is not None:
+            return AttendanceStore.dari_arrays(arrays)
         
-        return False, None
+        if os.path.splitext(file_path)[1].lower() == '.xlsx':
+            store, _ = bangun_store_xlsx(file_path, self.parse_date_headers, chunksize, proyeksi)
+        else:
+            store, _ = bangun_store_csv(file_path, self.parse_date_headers,
+                                        chunksize if streaming else None, proyeksi)
+        if self.cache:
+            self.cache.save_arrays(file_path, store.ke_arrays(), varian)
+        return store
+    
+    def load_db(self, db_path, month=None, year=None, karyawan=None):
+        """
+        Load data dari database SQLite hasil ingest (tanpa parsing CSV).
+        month/year membatasi tanggal yang diambil; karyawan (nama atau NIK)
+        hanya mengambil satu karyawan — query berindeks (employee_id, date).
+        """
+        if not os.path.isfile(db_path):
+            return False, f"File tidak ditemukan: {db_path}"
+        try:
+            db = AttendanceDB(db_path, baca_saja=True)
+            pegawai = None
+            if karyawan is not None:
+                pegawai = db.cari_karyawan(karyawan)
+                if not pegawai:
+                    return False, f"Karyawan '{karyawan}' tidak ditemukan"
+            store = db.ambil_store(pegawai, month, year)
+            if pegawai is not None and len(store) == 0:
+                return False, f"Tidak ada data karyawan '{karyawan}' pada periode tersebut"
+            return self._pasang_store(store)
+        except Exception as e:
+            return False, f"Error membaca database: {str(e)}"
+    
+    def _pasang_store(self, store):
+        """Jadikan store data aktif lalu bangun indeks karyawan & header"""
+        self.store = store
+        self.indeks_pegawai = EmployeeIndex(store.nama, store.nik)
+        self.indeks_header = HeaderIndex(store.columns, self.FORMAT_TANGGAL, self.KOLOM_ABAIKAN)
+        
+        # Ekstrak daftar pegawai
+        if store.nama is None:
+            return False, "Kolom 'nama' tidak ditemukan dalam file CSV"
+        
+        self.employee_list = pd.Series(store.nama, dtype=object).dropna().tolist()
+        return True, f"Berhasil memuat {len(self.employee_list)} karyawan"
+    
+    def _proyeksi_periode(self, month, year):
+        """Fungsi proyeksi kolom + varian cache untuk periode (None jika semua kolom)"""
+        if not month and not year:
+            return None, ''
+        
+        def proyeksi(header):
+            return kolom_proyeksi(header, self.FORMAT_TANGGAL, self.KOLOM_ABAIKAN, month, year)
+        
+        varian = f"periode:{month or ''}-{year or ''}"
+        return proyeksi, varian
+    
+    def get_hari_indonesia(self, date_obj):
+        """Mengembalikan nama hari dalam Bahasa Indonesia (tidak bergantung locale)"""
+        return NAMA_HARI[date_obj.weekday()]
+    
+    def is_holiday(self, date_obj):
+        """Cek apakah tanggal adalah hari libur (nasional, cuti bersama, daerah terpilih)"""
+        return self.kalender_libur.cek(date_obj)
+    
+    def parse_date_headers(self, columns):
+        """Parse seluruh header kolom sekaligus menjadi Series datetime (NaT jika bukan tanggal)"""
+        return parse_header_tanggal(columns, self.FORMAT_TANGGAL, self.KOLOM_ABAIKAN)
+    
+    def _kolom_nama(self):
+        """Series nama per baris data sumber (None jika kolom 'nama' tidak ada)"""
+        return None if self.store.nama is None else pd.Series(self.store.nama, dtype=object)
     
     def hitung_durasi(self, masuk_str, pulang_str):
         """Menghitung selisih waktu dari string jam"""
-        try:
-            fmt = '%H:%M:%S'
-            t_masuk = datetime.strptime(str(masuk_str).strip(), fmt)
-            t_pulang = datetime.strptime(str(pulang_str).strip(), fmt)
-            
-            selisih = t_pulang - t_masuk
-            total_seconds = int(selisih.total_seconds())
-            
-            jam = total_seconds // 3600
-            sisa_detik = total_seconds % 3600
-            menit = sisa_detik // 60
-            
-            return f"{jam} jam {menit} menit"
-        except Exception:
+        detik, rusak = parse_jam([str(masuk_str).strip(), str(pulang_str).strip()])
+        if rusak.any():
             return "-"
+        
+        total_seconds = int(durasi_detik(detik[0], detik[1], self.lintas_hari()))
+        jam = total_seconds // 3600
+        menit = total_seconds % 3600 // 60
+        return f"{jam} jam {menit} menit"
     
     def process_employee_attendance(self, employee_name, month=None, year=None):
         """Proses data absensi untuk karyawan tertentu"""
         
-        if self.df_source is None:
+        if self.store is None:
             return False, "Data belum dimuat. Silakan load CSV terlebih dahulu.", None
         
         # Cari pegawai
-        if 'nama' not in self.df_source.columns:
+        nama = self._kolom_nama()
+        if nama is None:
             return False, "Kolom 'nama' tidak ditemukan", None
         
-        pegawai = self.df_source[self.df_source['nama'].str.contains(
-            employee_name, case=False, na=False)]
+        hasil = self.indeks_pegawai.cari(employee_name)
+        pegawai = hasil.baris
         
-        if pegawai.empty:
+        if len(pegawai) == 0:
             return False, f"Karyawan '{employee_name}' tidak ditemukan", None
+        if len(pegawai) > 1:
+            return False, pesan_ambigu(employee_name, hasil), None
         
-        # Kolom tanggal adalah kolom selain 'nama', 'nik', 'no', 'nomor'
-        abaikan = ['nama', 'nik', 'no', 'nomor']
-        date_columns = [col for col in self.df_source.columns if col not in abaikan]
-        
-        output_data = []
-        
-        for col in date_columns:
-            # Parsing Header Tanggal
-            try:
-                # Coba format DD-MM-YYYY
-                date_obj = datetime.strptime(col, '%d-%m-%Y')
-            except ValueError:
-                try:
-                    # Coba format YYYY-MM-DD
-                    date_obj = datetime.strptime(col, '%Y-%m-%d')
-                except ValueError:
-                    try:
-                        # Coba format DD/MM/YYYY
-                        date_obj = datetime.strptime(col, '%d/%m/%Y')
-                    except ValueError:
-                        continue
-            
-            # Filter berdasarkan bulan dan tahun jika ditentukan
-            if month and date_obj.month != month:
-                continue
-            if year and date_obj.year != year:
-                continue
-            
-            tgl_str_clean = date_obj.strftime('%Y-%m-%d')
-            hari = self.get_hari_indonesia(date_obj)
-            
-            # Cek hari libur
-            is_libur, nama_libur = self.is_holiday(date_obj)
-            
-            # Ambil nilai sel absensi
-            raw_value = pegawai.iloc[0][col]
-            
-            jam_masuk = "-"
-            jam_pulang = "-"
-            durasi = "-"
-            keterangan = "-"
-            
-            # Logika Pengisian Status
-            val_str = str(raw_value).strip()
-            
-            # Cek data kosong
-            if pd.isna(raw_value) or val_str == "" or val_str.lower() == "nan":
-                if is_libur:
-                    keterangan = f"Libur - {nama_libur}"
-                elif hari in ['Sabtu', 'Minggu']:
-                    keterangan = "Libur Akhir Pekan"
-                else:
-                    keterangan = "Tidak Hadir / Tanpa Keterangan"
-            else:
-                # Format: "06:59:29 - 16:03:04"
-                parts = val_str.split('-')
-                
-                if len(parts) >= 2:
-                    jam_masuk = parts[0].strip()
-                    jam_pulang = parts[1].strip()
-                    
-                    # Hanya hitung durasi jika format jam valid
-                    if ':' in jam_masuk and ':' in jam_pulang:
-                        durasi = self.hitung_durasi(jam_masuk, jam_pulang)
-                    
-                    if is_libur:
-                        keterangan = f"Hadir di Hari Libur ({nama_libur})"
-                    else:
-                        keterangan = "Hadir"
-                        
-                elif len(parts) == 1 and parts[0] != "":
-                    jam_masuk = parts[0].strip()
-                    keterangan = "Lupa Absen Pulang/Datang"
-            
-            output_data.append({
-                'Tanggal': tgl_str_clean,
-                'Hari': hari,
-                'Jam Masuk': jam_masuk,
-                'Jam Pulang': jam_pulang,
-                'Durasi Kerja': durasi,
-                'Keterangan': keterangan
-            })
-        
-        if not output_data:
+        kalender = self.get_header_kalender()
+        posisi = pilih_kolom_periode(kalender['tanggal'], month, year)
+        
+        if len(posisi) == 0:
             return False, "Tidak ada data tanggal yang berhasil diproses", None
         
-        df_result = pd.DataFrame(output_data)
+        # Ambil seluruh sel absensi pegawai sekaligus
+        sel = melt_store(self.store, posisi, baris=[pegawai[0]])
+        df_result = self._susun_hasil(kalender.iloc[posisi], sel)
         return True, "Data berhasil diproses", df_result
     
+    def process_all_employees(self, month=None, year=None):
+        """
+        Proses seluruh karyawan dan seluruh periode dalam satu kali jalan.
+        
+        Return (success, message, hasil) dengan hasil berupa dict
+        {(nama, bulan, tahun): DataFrame} berformat sama seperti
+        process_employee_attendance.
+        """
+        if self.store is None:
+            return False, "Data belum dimuat. Silakan load CSV terlebih dahulu.", None
+        
+        nama = self._kolom_nama()
+        if nama is None:
+            return False, "Kolom 'nama' tidak ditemukan", None
+        
+        baris = baris_karyawan_unik(nama)
+        
+        kalender = self.get_header_kalender()
+        posisi = pilih_kolom_periode(kalender['tanggal'], month, year)
+        
+        if len(baris) == 0 or len(posisi) == 0:
+            return False, "Tidak ada data tanggal yang berhasil diproses", None
+        
+        sel = melt_store(self.store, posisi, baris=baris)
+        df_long = self._susun_hasil(kalender.iloc[posisi], sel)
+        
+        tanggal = kalender['tanggal'].to_numpy()[posisi][sel['urutan'].to_numpy()]
+        kunci = [
+            nama.to_numpy()[sel['baris'].to_numpy()],
+            pd.DatetimeIndex(tanggal).month,
+            pd.DatetimeIndex(tanggal).year,
+        ]
+        
+        hasil = {
+            (nm, int(bulan), int(tahun)): grup.reset_index(drop=True)
+            for (nm, bulan, tahun), grup in df_long.groupby(kunci, sort=False)
+        }
+        return True, f"{len(hasil)} laporan berhasil diproses", hasil
+    
+    def ringkasan_absensi(self, month=None, year=None, unit=UNIT_DEFAULT):
+        """
+        Ringkasan bulanan per karyawan (hadir, tidak hadir, absen tidak lengkap,
+        hadir di hari libur, total & rata-rata jam) untuk seluruh karyawan dan
+        periode sekaligus, dengan baris karyawan sama seperti process_all_employees.
+        
+        Return (success, message, DataFrame KOLOM_KARYAWAN). Rollup per unit:
+        attendance_summary.ringkasan_unit.
+        """
+        if self.store is None:
+            return False, "Data belum dimuat. Silakan load CSV terlebih dahulu.", None
+        
+        nama = self._kolom_nama()
+        if nama is None:
+            return False, "Kolom 'nama' tidak ditemukan", None
+        
+        baris = baris_karyawan_unik(nama)
+        kalender = self.get_header_kalender()
+        posisi = pilih_kolom_periode(kalender['tanggal'], month, year)
+        
+        if len(baris) == 0 or len(posisi) == 0:
+            return False, "Tidak ada data tanggal yang berhasil diproses", None
+        
+        sel = melt_store(self.store, posisi, baris=baris)
+        kalender = kalender.iloc[posisi].iloc[sel['urutan'].to_numpy()]
+        ringkasan = ringkas_sel(
+            sel['baris'].to_numpy(), kalender['tanggal'].to_numpy(),
+            sel['kosong'].to_numpy(), sel['lengkap'].to_numpy(),
+            kalender['libur'].notna().to_numpy(), kalender['akhir_pekan'].to_numpy(),
+            self.durasi_sel(sel), nama.to_numpy(), self.store.nik, unit)
+        return True, f"Ringkasan {len(ringkasan)} karyawan-bulan berhasil dihitung", ringkasan
+    
+    def hash_sumber(self, month=None, year=None):
+        """
+        Hash isi data sumber untuk proses ulang inkremental. Return
+        (hash_karyawan, hash_laporan):
+        - hash_karyawan: {nama: hex} seluruh periode terpilih satu baris karyawan
+        - hash_laporan : {(nama, bulan, tahun): hex} dengan kunci sama seperti
+          process_all_employees — berubah hanya jika sel bulan itu, tanggal
+          kolomnya atau identitas karyawannya berubah.
+        """
+        nama = self._kolom_nama()
+        if self.store is None or nama is None:
+            return {}, {}
+        
+        baris = baris_karyawan_unik(nama)
+        nama_baris = nama.to_numpy()[baris]
+        per_bulan = {
+            (tahun, bulan): h[baris]
+            for (tahun, bulan), h in sorted(hash_periode(self.store).items())
+            if (not year or tahun == year) and (not month or bulan == month)
+        }
+        
+        hash_laporan = {}
+        for (tahun, bulan), h in per_bulan.items():
+            hash_laporan.update(
+                ((nm, bulan, tahun), f"{int(nilai):016x}") for nm, nilai in zip(nama_baris, h))
+        gabungan = gabung_hash(per_bulan.values())
+        hash_karyawan = {} if gabungan is None else {
+            nm: f"{int(nilai):016x}" for nm, nilai in zip(nama_baris, gabungan)}
+        return hash_karyawan, hash_laporan
+    
+    def sidik_konfigurasi(self):
+        """
+        Hash konfigurasi yang ikut menentukan isi laporan (kalender libur, shift
+        malam, format header). Laporan lama tidak dipakai ulang jika berubah.
+        """
+        teks = '|'.join([
+            type(self).__name__, str(self.SHIFT_MALAM_MAKS_JAM),
+            ','.join(self.FORMAT_TANGGAL), ','.join(self.KOLOM_ABAIKAN),
+            self.kalender_libur.sidik(),
+        ])
+        return hashlib.blake2b(teks.encode('utf-8'), digest_size=8).hexdigest()
+    
+    def _susun_hasil(self, kalender, sel):
+        """Bentuk DataFrame hasil dari metadata kolom tanggal + sel absensi bentuk panjang"""
+        kalender = kalender.iloc[sel['urutan'].to_numpy()].reset_index(drop=True)
+        kosong = sel['kosong'].to_numpy()
+        lengkap = sel['lengkap'].to_numpy()
+        tidak_lengkap = ~kosong & ~lengkap
+        
+        # Hanya sel lengkap dengan format jam valid yang dihitung
+        total = self.durasi_sel(sel)
+        valid = lengkap & ~np.isnan(total)
+        total = pd.Series(np.where(valid, total, 0).astype(np.int64))
+        durasi_str = (total // 3600).astype(str) + " jam " + ((total % 3600) // 60).astype(str) + " menit"
+        durasi = np.where(valid, durasi_str.to_numpy(dtype=object), "-")
+        
+        # Logika Pengisian Status
+        nama_libur = kalender['libur']
+        is_libur = nama_libur.notna().to_numpy()
+        weekend = kalender['akhir_pekan'].to_numpy()
+        keterangan = np.select(
+            [kosong & is_libur, kosong & weekend, kosong,
+             lengkap & is_libur, lengkap, tidak_lengkap],
+            [("Libur - " + nama_libur).to_numpy(dtype=object),
+             "Libur Akhir Pekan",
+             "Tidak Hadir / Tanpa Keterangan",
+             ("Hadir di Hari Libur (" + nama_libur + ")").to_numpy(dtype=object),
+             "Hadir",
+             "Lupa Absen Pulang/Datang"],
+            default="-"
+        )
+        
+        return pd.DataFrame({
+            'Tanggal': kalender['Tanggal'],
+            'Hari': kalender['Hari'],
+            'Jam Masuk': sel['masuk'].to_numpy(dtype=object),
+            'Jam Pulang': sel['pulang'].to_numpy(dtype=object),
+            'Durasi Kerja': durasi,
+            'Keterangan': keterangan
+        })
+    
     def save_to_excel(self, df, output_file):
         """Simpan DataFrame ke file Excel"""
         try:
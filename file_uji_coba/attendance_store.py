@@ -0,0 +1,641 @@
+"""
+Attendance Store
+Representasi absensi ringkas: setiap sel "06:59:29 - 16:03:04" disimpan sebagai
+detik int32 (masuk/pulang) + kode status int8, bukan string Python.
+
+Dibangun bertahap per chunk sehingga memori puncak saat memuat file besar
+dibatasi ukuran chunk, bukan ukuran file.
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+from file_uji_coba.csv_sniffer import buka_csv, opsi_read_csv
+from file_uji_coba.xlsx_reader import iter_baris_xlsx
+
+
+# Format teks jam untuk parse_jam(): 'H:MM:SS', 'H:MM', atau otomatis dari jumlah ':'
+FORMAT_HMS = 'hms'
+FORMAT_HM = 'hm'
+FORMAT_OTOMATIS = 'otomatis'
+
+# Panjang maksimum teks jam ('HH:MM:SS')
+PANJANG_JAM = 8
+
+# Detik dalam sehari (untuk shift lintas tengah malam)
+DETIK_SEHARI = 86400
+
+# Kode status sel
+STATUS_KOSONG = 0
+STATUS_PARSIAL = 1      # hanya satu jam (tanpa pemisah '-')
+STATUS_LENGKAP = 2      # jam masuk & pulang
+FLAG_TEKS = 4           # teks sel tidak baku, teks asli disimpan di teks_lain
+
+# Nilai detik jika jam kosong / tidak valid
+TIDAK_ADA = -1
+
+# Kolom identitas store hasil store_dari_sel (kolom tanggal 'YYYY-MM-DD' menyusul)
+KOLOM_IDENTITAS = ['nama', 'nik']
+
+# Jumlah baris per chunk saat membaca CSV bertahap
+CHUNK_BARIS = 200
+
+# Teks yang dianggap kosong oleh pandas (default na_values read_csv/read_excel)
+NILAI_NA = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a',
+    'nan', 'null',
+])
+
+# Konstanta hash isi (FNV-1a 64-bit) dan selisih date.toordinal() ke epoch 1970-01-01
+_FNV_AWAL = np.uint64(0xCBF29CE484222325)
+_FNV_PRIMA = np.uint64(0x100000001B3)
+_ORDINAL_EPOCH = 719163
+
+_TABEL_JAM = None
+_TABEL_JAM_MENIT = None
+
+
+def parse_jam(values, format=FORMAT_HMS):
+    """
+    Parse array teks jam ke detik dengan slicing kode karakter (tanpa strptime/regex).
+
+    Setiap bagian jam/menit/detik 1-2 digit (jam 0-23, menit/detik 0-59), setara
+    datetime.strptime '%H:%M:%S' / '%H:%M'. format=FORMAT_OTOMATIS memilih
+    H:M:S jika teks memuat 2 ':' dan H:M jika 1. Return (detik int32, rusak)
+    dengan detik = TIDAK_ADA dan rusak = True untuk teks kosong/tidak valid.
+    """
+    nilai = np.asarray(values, dtype=object).ravel()
+    n = len(nilai)
+    teks = np.where(pd.isna(nilai), '', nilai)
+
+    # Kode karakter per posisi (posisi x n) agar setiap langkah berupa operasi vektor
+    # kontigu; satu posisi ekstra untuk mendeteksi teks yang lebih panjang dari 'HH:MM:SS'
+    lebar = PANJANG_JAM + 1
+    kode = np.ascontiguousarray(
+        teks.astype(f'U{lebar}').view(np.uint32).reshape(n, lebar).T.astype(np.int32))
+    panjang = (kode != 0).sum(axis=0)
+
+    rusak = (panjang == 0) | (panjang > PANJANG_JAM)
+    bagian = np.zeros((3, n), dtype=np.int32)     # jam, menit, detik
+    digit = np.zeros((3, n), dtype=np.int32)      # jumlah digit per bagian
+    ke = np.zeros(n, dtype=np.int32)              # indeks bagian aktif (jumlah ':' sejauh ini)
+    for j in range(PANJANG_JAM):
+        c = kode[j]
+        aktif = j < panjang
+        angka = aktif & (c >= 48) & (c <= 57)
+        titik_dua = aktif & (c == 58)
+        rusak |= aktif & ~angka & ~titik_dua
+        for k in range(3):
+            isi = angka & (ke == k)
+            bagian[k] = np.where(isi, bagian[k] * 10 + (c - 48), bagian[k])
+            digit[k] += isi
+        ke += titik_dua
+
+    if format == FORMAT_OTOMATIS:
+        jumlah = np.where(ke == 2, 3, 2)
+    else:
+        jumlah = 3 if format == FORMAT_HMS else 2
+    dengan_detik = jumlah == 3
+    rusak |= ke != jumlah - 1
+    rusak |= (digit[0] < 1) | (digit[0] > 2) | (digit[1] < 1) | (digit[1] > 2)
+    rusak |= dengan_detik & ((digit[2] < 1) | (digit[2] > 2))
+    rusak |= (bagian[0] > 23) | (bagian[1] > 59) | (bagian[2] > 59)
+
+    detik = bagian[0] * 3600 + bagian[1] * 60 + np.where(dengan_detik, bagian[2], 0)
+    return np.where(rusak, TIDAK_ADA, detik).astype(np.int32), rusak
+
+
+def durasi_detik(masuk, pulang, lintas_hari=None):
+    """
+    Selisih pulang - masuk (detik, vektor). Aturan shift malam: jika lintas_hari
+    (detik) diisi dan pulang < masuk, pulang dianggap hari berikutnya selama
+    durasinya tidak melebihi lintas_hari. None = tanpa rollover (selisih bisa negatif).
+    """
+    total = np.asarray(pulang) - np.asarray(masuk)
+    if lintas_hari is not None:
+        total = np.where((total < 0) & (total + DETIK_SEHARI <= lintas_hari),
+                         total + DETIK_SEHARI, total)
+    return total
+
+
+def tabel_jam():
+    """Tabel string 'HH:MM:SS' untuk setiap detik dalam sehari (dibuat sekali)"""
+    global _TABEL_JAM
+    if _TABEL_JAM is None:
+        _TABEL_JAM = np.array([
+            f"{d // 3600:02d}:{d % 3600 // 60:02d}:{d % 60:02d}" for d in range(86400)
+        ], dtype=object)
+    return _TABEL_JAM
+
+
+def tabel_jam_menit():
+    """Tabel string 'HH:MM' untuk setiap detik dalam sehari (dibuat sekali)"""
+    global _TABEL_JAM_MENIT
+    if _TABEL_JAM_MENIT is None:
+        _TABEL_JAM_MENIT = np.array([teks[:5] for teks in tabel_jam()], dtype=object)
+    return _TABEL_JAM_MENIT
+
+
+def _teks_baku(detik, teks):
+    """True jika teks persis sama dengan format baku 'HH:MM:SS' dari detik"""
+    valid = detik >= 0
+    baku = tabel_jam()[np.where(valid, detik, 0)]
+    return valid & (baku == teks)
+
+
+def _kodekan_teks(nilai):
+    """Jalur umum kodekan_sel() berbasis operasi string pandas (untuk sel tidak baku)"""
+    nilai = pd.Series(nilai, dtype=object)
+    teks = nilai.astype(str).str.strip()
+    kosong = (nilai.isna() | (teks == "") | (teks.str.lower() == "nan")).to_numpy()
+
+    # Format: "06:59:29 - 16:03:04"
+    parts = teks.str.partition('-')
+    lengkap = ~kosong & (parts[1] == '-').to_numpy()
+    teks_masuk = parts[0].str.strip()
+    teks_pulang = parts[2].str.partition('-')[0].str.strip()
+
+    masuk, _ = parse_jam(teks_masuk.to_numpy(dtype=object))
+    pulang, _ = parse_jam(teks_pulang.to_numpy(dtype=object))
+    masuk[kosong] = TIDAK_ADA
+    pulang[~lengkap] = TIDAK_ADA
+
+    teks_masuk = teks_masuk.to_numpy(dtype=object)
+    teks_pulang = teks_pulang.to_numpy(dtype=object)
+    baku = _teks_baku(masuk, teks_masuk) & (~lengkap | _teks_baku(pulang, teks_pulang))
+    lain = np.flatnonzero(~kosong & ~baku)
+
+    status = np.where(kosong, STATUS_KOSONG, np.where(lengkap, STATUS_LENGKAP, STATUS_PARSIAL))
+    status = status.astype(np.int8)
+    status[lain] |= FLAG_TEKS
+
+    teks_asli = {
+        int(i): (teks_masuk[i], teks_pulang[i] if lengkap[i] else None) for i in lain
+    }
+    return status, masuk, pulang, teks_asli
+
+
+def _jam_baku(kode, awal):
+    """Detik dari 'HH:MM:SS' di kolom kode[:, awal:awal+8] (-1 jika tidak valid)"""
+    d = kode[:, awal:awal + 8].astype(np.int32) - 48
+    digit = (d >= 0) & (d <= 9)
+    jam = d[:, 0] * 10 + d[:, 1]
+    menit = d[:, 3] * 10 + d[:, 4]
+    detik = d[:, 6] * 10 + d[:, 7]
+    valid = (digit[:, [0, 1, 3, 4, 6, 7]].all(axis=1)
+             & (kode[:, awal + 2] == 58) & (kode[:, awal + 5] == 58)
+             & (jam <= 23) & (menit <= 59) & (detik <= 59))
+    return np.where(valid, jam * 3600 + menit * 60 + detik, TIDAK_ADA).astype(np.int32)
+
+
+def kodekan_sel(nilai):
+    """
+    Ubah array sel absensi (object, boleh NaN) menjadi (status, masuk, pulang, teks_asli).
+
+    Sel baku ('HH:MM:SS - HH:MM:SS' atau 'HH:MM:SS') di-parse langsung dari
+    kode karakter; sisanya lewat _kodekan_teks(). teks_asli berisi (masuk, pulang)
+    hanya untuk sel yang teksnya tidak bisa dibentuk ulang dari detik
+    (mis. '6:59', 'Sakit'), diindeks posisi sel.
+    """
+    nilai = np.asarray(nilai, dtype=object)
+    n = len(nilai)
+    status = np.zeros(n, dtype=np.int8)
+    masuk = np.full(n, TIDAK_ADA, dtype=np.int32)
+    pulang = np.full(n, TIDAK_ADA, dtype=np.int32)
+
+    teks = np.where(pd.isna(nilai), '', nilai)
+    panjang = np.fromiter(map(len, teks), dtype=np.int64, count=n)
+    # Cukup 19 karakter pertama; teks lebih panjang pasti bukan format baku
+    kode = teks.astype('U19').view(np.uint32).reshape(n, 19)
+
+    jam_masuk = _jam_baku(kode, 0)
+    jam_pulang = _jam_baku(kode, 11)
+    pemisah = (kode[:, 8] == 32) & (kode[:, 9] == 45) & (kode[:, 10] == 32)
+    lengkap = (panjang == 19) & pemisah & (jam_masuk >= 0) & (jam_pulang >= 0)
+    parsial = (panjang == 8) & (jam_masuk >= 0)
+
+    status[lengkap] = STATUS_LENGKAP
+    status[parsial] = STATUS_PARSIAL
+    masuk[lengkap | parsial] = jam_masuk[lengkap | parsial]
+    pulang[lengkap] = jam_pulang[lengkap]
+
+    teks_asli = {}
+    sisa = np.flatnonzero(~lengkap & ~parsial & (panjang > 0))
+    if len(sisa):
+        s, m, p, lain = _kodekan_teks(nilai[sisa])
+        status[sisa], masuk[sisa], pulang[sisa] = s, m, p
+        teks_asli = {int(sisa[i]): teks for i, teks in lain.items()}
+    return status, masuk, pulang, teks_asli
+
+
+class AttendanceStore:
+    """
+    Data absensi ringkas, satu baris per baris file sumber.
+
+    - columns      : seluruh header (lowercase) sesuai file sumber
+    - nama, nik    : nilai per baris (object, NaN dipertahankan)
+    - pegawai_id   : id int32 per baris hasil interning nama (-1 jika kosong)
+    - posisi_kolom : posisi kolom tanggal di columns, sejajar sumbu-1 grid
+    - tanggal      : ordinal hari (date.toordinal) per kolom grid
+    - status, masuk, pulang : grid (baris x kolom tanggal) int8 / int32 / int32
+    - teks_lain    : {(baris, kolom_grid): (teks_masuk, teks_pulang)} untuk sel tidak baku
+    """
+
+    def __init__(self, columns, nama, nik, posisi_kolom, tanggal, status, masuk, pulang, teks_lain):
+        self.columns = list(columns)
+        self.nama = nama
+        self.nik = nik
+        self.posisi_kolom = np.asarray(posisi_kolom, dtype=np.int64)
+        self.tanggal = np.asarray(tanggal, dtype=np.int32)
+        self.status = status
+        self.masuk = masuk
+        self.pulang = pulang
+        self.teks_lain = teks_lain
+
+        kode, unik = pd.factorize(pd.Series(nama, dtype=object)) if nama is not None else ([], [])
+        self.pegawai_id = np.asarray(kode, dtype=np.int32)
+        self.daftar_pegawai = np.asarray(unik, dtype=object)
+
+        # posisi kolom di columns → indeks kolom grid (-1 jika bukan kolom tanggal)
+        self.indeks_grid = np.full(len(self.columns), -1, dtype=np.int64)
+        self.indeks_grid[self.posisi_kolom] = np.arange(len(self.posisi_kolom))
+
+    def __len__(self):
+        return self.status.shape[0]
+
+    @property
+    def nbytes(self):
+        """Perkiraan memori grid (byte)"""
+        return self.status.nbytes + self.masuk.nbytes + self.pulang.nbytes
+
+    def ke_arrays(self):
+        """Representasi dict array NumPy tanpa objek Python (untuk DataCache)"""
+        def _teks(values):
+            values = pd.Series(values, dtype=object)
+            isna = values.isna().to_numpy()
+            return np.where(isna, '', values.astype(str)).astype(str), isna
+
+        arrays = {
+            'columns': np.array([str(c) for c in self.columns], dtype=str),
+            'posisi_kolom': self.posisi_kolom,
+            'tanggal': self.tanggal,
+            'status': self.status,
+            'masuk': self.masuk,
+            'pulang': self.pulang,
+        }
+        for kolom in ('nama', 'nik'):
+            values = getattr(self, kolom)
+            if values is not None:
+                arrays[kolom], arrays[kolom + '_isna'] = _teks(values)
+
+        kunci = list(self.teks_lain)
+        arrays['lain_sel'] = np.array(kunci, dtype=np.int64).reshape(-1, 2)
+        arrays['lain_masuk'] = np.array([self.teks_lain[k][0] for k in kunci], dtype=str)
+        arrays['lain_pulang'], arrays['lain_pulang_isna'] = _teks(
+            [self.teks_lain[k][1] for k in kunci])
+        return arrays
+
+    @classmethod
+    def dari_arrays(cls, arrays):
+        """Kebalikan ke_arrays()"""
+        def _teks(kolom):
+            if kolom not in arrays:
+                return None
+            values = arrays[kolom].astype(object)
+            values[arrays[kolom + '_isna']] = np.nan
+            return values
+
+        pulang_lain = _teks('lain_pulang')
+        teks_lain = {
+            (int(b), int(k)): (str(m), None if pd.isna(p) else str(p))
+            for (b, k), m, p in zip(arrays['lain_sel'], arrays['lain_masuk'], pulang_lain)
+        }
+        return cls(
+            arrays['columns'].tolist(), _teks('nama'), _teks('nik'),
+            arrays['posisi_kolom'], arrays['tanggal'],
+            arrays['status'], arrays['masuk'], arrays['pulang'], teks_lain)
+
+
+class StoreBuilder:
+    """Kumpulkan chunk DataFrame (dtype str) menjadi AttendanceStore"""
+
+    def __init__(self, parse_header):
+        # parse_header(columns) → Series datetime per kolom (NaT jika bukan tanggal)
+        self.parse_header = parse_header
+        self.columns = None
+        self.posisi_kolom = None
+        self.tanggal = None
+        self.jumlah_baris = 0
+        self._nama, self._nik = [], []
+        self._status, self._masuk, self._pulang = [], [], []
+        self.teks_lain = {}
+
+    def tambah(self, chunk):
+        """Kodekan satu chunk lalu buang string mentahnya"""
+        columns = chunk.columns.astype(str).str.strip().str.lower()
+        if self.columns is None:
+            self.columns = list(columns)
+            tanggal = self.parse_header(self.columns)
+            self.posisi_kolom = np.flatnonzero(tanggal.notna().to_numpy())
+            self.tanggal = np.array(
+                [t.toordinal() for t in tanggal.iloc[self.posisi_kolom]], dtype=np.int32)
+
+        n = len(chunk)
+        lebar = len(self.posisi_kolom)
+        for kolom, tujuan in (('nama', self._nama), ('nik', self._nik)):
+            if kolom in self.columns:
+                tujuan.append(chunk.iloc[:, self.columns.index(kolom)].to_numpy(dtype=object))
+
+        nilai = chunk.iloc[:, self.posisi_kolom].to_numpy(dtype=object).ravel()
+        status, masuk, pulang, teks_asli = kodekan_sel(nilai)
+        self._status.append(status.reshape(n, lebar))
+        self._masuk.append(masuk.reshape(n, lebar))
+        self._pulang.append(pulang.reshape(n, lebar))
+        for i, teks in teks_asli.items():
+            self.teks_lain[(self.jumlah_baris + i // lebar, i % lebar)] = teks
+        self.jumlah_baris += n
+
+    def selesai(self):
+        lebar = len(self.posisi_kolom) if self.posisi_kolom is not None else 0
+
+        def _gabung(bagian, dtype):
+            if not bagian:
+                return np.empty((0, lebar), dtype=dtype)
+            return np.concatenate(bagian)
+
+        store = AttendanceStore(
+            self.columns or [],
+            np.concatenate(self._nama) if self._nama else None,
+            np.concatenate(self._nik) if self._nik else None,
+            self.posisi_kolom if self.posisi_kolom is not None else [],
+            self.tanggal if self.tanggal is not None else [],
+            _gabung(self._status, np.int8),
+            _gabung(self._masuk, np.int32),
+            _gabung(self._pulang, np.int32),
+            self.teks_lain)
+        self._status, self._masuk, self._pulang = [], [], []
+        return store
+
+
+def bangun_store_csv(file_path, parse_header, chunksize=CHUNK_BARIS, proyeksi=None,
+                     progress=None):
+    """
+    Baca CSV (satu kali buka file) langsung ke AttendanceStore. Dengan chunksize,
+    file dibaca per chunk sehingga memori puncak ~ ukuran chunk; chunksize=None
+    membaca seluruh file sekaligus. Return (store, dialek).
+    
+    progress: callback opsional progress(jumlah_baris) setelah tiap chunk
+    (boleh melempar exception untuk menghentikan pembacaan).
+    """
+    builder = StoreBuilder(parse_header)
+    with buka_csv(file_path) as (f, dialek):
+        opsi = opsi_read_csv(dialek, proyeksi)
+        if chunksize is None:
+            builder.tambah(pd.read_csv(f, dtype=str, **opsi))
+        else:
+            with pd.read_csv(f, dtype=str, chunksize=chunksize, **opsi) as reader:
+                for chunk in reader:
+                    builder.tambah(chunk)
+                    if progress:
+                        progress(builder.jumlah_baris)
+
+    # File hanya berisi header: tetap simpan nama kolom
+    if builder.columns is None:
+        usecols = opsi.get('usecols')
+        header = dialek.header or []
+        builder.tambah(pd.DataFrame(columns=header if usecols is None else [header[i] for i in usecols]))
+    return builder.selesai(), dialek
+
+
+def _teks_sel_excel(nilai):
+    """Nilai sel XLSX → teks seperti pd.read_excel(dtype=str) (None = NaN)"""
+    if nilai is None:
+        return None
+    if isinstance(nilai, str):
+        return None if nilai in NILAI_NA else nilai
+    if isinstance(nilai, float) and nilai.is_integer():
+        return str(int(nilai))
+    return str(nilai)
+
+
+def _label_header_excel(values):
+    """Label kolom seperti pd.read_excel: sel kosong → 'Unnamed: i', nama ganda → 'x.1'"""
+    label, terpakai = [], {}
+    for i, nilai in enumerate(values):
+        teks = _teks_sel_excel(nilai) if nilai != '' else None
+        teks = f"Unnamed: {i}" if teks is None else teks
+        if teks in terpakai:
+            terpakai[teks] += 1
+            teks = f"{teks}.{terpakai[teks]}"
+        terpakai.setdefault(teks, 0)
+        label.append(teks)
+    return label
+
+
+def bangun_store_xlsx(file_path, parse_header, chunksize=CHUNK_BARIS, proyeksi=None,
+                      progress=None):
+    """
+    Baca sheet pertama XLSX secara streaming (lihat xlsx_reader) langsung ke
+    AttendanceStore tanpa membangun DOM workbook / DataFrame penuh.
+    
+    Header tanggal berupa datetime menjadi teks 'YYYY-MM-DD HH:MM:SS' seperti
+    kolom hasil pd.read_excel. progress sama seperti bangun_store_csv.
+    Return (store, header_lengkap).
+    """
+    builder = StoreBuilder(parse_header)
+    rows = iter_baris_xlsx(file_path)
+    try:
+        header_mentah = list(next(rows, None) or [])
+        while header_mentah and header_mentah[-1] in (None, ''):
+            header_mentah.pop()
+        header = _label_header_excel(header_mentah)
+
+        usecols = proyeksi(header) if proyeksi is not None else None
+        posisi = list(range(len(header))) if usecols is None else list(usecols)
+        kolom = [header[i] for i in posisi]
+
+        chunk, tertunda = [], []
+        for row in rows:
+            nilai = [_teks_sel_excel(row[i]) if i < len(row) else None for i in posisi]
+            # Baris kosong di akhir sheet dibuang (sama seperti pandas)
+            if all(v is None or v == '' for v in row):
+                tertunda.append(nilai)
+                continue
+            chunk.extend(tertunda)
+            tertunda = []
+            chunk.append(nilai)
+            if len(chunk) >= chunksize:
+                builder.tambah(pd.DataFrame(chunk, columns=kolom, dtype=object))
+                chunk = []
+                if progress:
+                    progress(builder.jumlah_baris)
+
+        if chunk or builder.columns is None:
+            builder.tambah(pd.DataFrame(chunk, columns=kolom, dtype=object))
+    finally:
+        rows.close()
+
+    return builder.selesai(), header
+
+
+def melt_store(store, posisi_kolom, baris=None, tabel=None):
+    """
+    Ambil sel absensi dari AttendanceStore dalam bentuk panjang: satu baris hasil
+    per sel dengan kolom baris (posisi baris di store), urutan (indeks di
+    posisi_kolom), kosong, lengkap, detik_masuk/detik_pulang (int, -1 jika
+    tidak valid), tidak_baku dan teks masuk/pulang.
+
+    tabel: teks jam per detik (default 'HH:MM:SS', lihat tabel_jam_menit);
+    sel tidak baku selalu memakai teks aslinya.
+    """
+    if baris is None:
+        baris = np.arange(len(store))
+    baris = np.asarray(baris, dtype=np.int64)
+    grid = store.indeks_grid[np.asarray(posisi_kolom, dtype=np.int64)]
+
+    status = store.status[np.ix_(baris, grid)].ravel()
+    masuk = store.masuk[np.ix_(baris, grid)].ravel()
+    pulang = store.pulang[np.ix_(baris, grid)].ravel()
+
+    kode = status & ~FLAG_TEKS
+    kosong = kode == STATUS_KOSONG
+    lengkap = kode == STATUS_LENGKAP
+    tidak_baku = (status & FLAG_TEKS) != 0
+
+    tabel = tabel_jam() if tabel is None else tabel
+    teks_masuk = np.where(kosong, "-", tabel[np.maximum(masuk, 0)])
+    teks_pulang = np.where(lengkap, tabel[np.maximum(pulang, 0)], "-")
+
+    # Sel tidak baku: kembalikan teks asli
+    for i in np.flatnonzero(tidak_baku):
+        m, p = store.teks_lain[(int(baris[i // len(grid)]), int(grid[i % len(grid)]))]
+        teks_masuk[i] = m
+        if p is not None:
+            teks_pulang[i] = p
+
+    return pd.DataFrame({
+        'baris': np.repeat(baris, len(grid)),
+        'urutan': np.tile(np.arange(len(grid)), len(baris)),
+        'kosong': kosong,
+        'lengkap': lengkap,
+        'detik_masuk': masuk,
+        'detik_pulang': pulang,
+        'tidak_baku': tidak_baku,
+        'masuk': teks_masuk,
+        'pulang': teks_pulang,
+    })
+
+
+def store_dari_sel(nama, nik, baris, tanggal, status, masuk, pulang, teks_lain=None,
+                   semua_tanggal=None):
+    """
+    Kebalikan melt_store: bangun AttendanceStore dari sel bentuk panjang.
+
+    nama, nik            : identitas per baris store (array object)
+    baris, tanggal       : indeks baris & ordinal tanggal per sel
+    status, masuk, pulang: nilai per sel
+    teks_lain            : {indeks sel: (teks_masuk, teks_pulang)} untuk sel tidak baku
+    semua_tanggal        : ordinal tanggal tambahan yang tetap menjadi kolom walau
+                           tidak ada selnya (mis. tanggal yang kosong di semua file)
+
+    Kolom store: nama, nik lalu seluruh tanggal ('YYYY-MM-DD', urut);
+    sel yang tidak disebut berstatus kosong.
+    """
+    tanggal = np.asarray(tanggal, dtype=np.int64)
+    unik = np.unique(tanggal if semua_tanggal is None else
+                     np.concatenate([tanggal, np.asarray(semua_tanggal, dtype=np.int64)]))
+    kolom = np.searchsorted(unik, tanggal)
+    baris = np.asarray(baris, dtype=np.int64)
+    ukuran = (len(nama), len(unik))
+
+    grid_status = np.full(ukuran, STATUS_KOSONG, dtype=np.int8)
+    grid_masuk = np.full(ukuran, TIDAK_ADA, dtype=np.int32)
+    grid_pulang = np.full(ukuran, TIDAK_ADA, dtype=np.int32)
+    grid_status[baris, kolom] = status
+    grid_masuk[baris, kolom] = masuk
+    grid_pulang[baris, kolom] = pulang
+    teks = {(int(baris[i]), int(kolom[i])): nilai for i, nilai in (teks_lain or {}).items()}
+
+    hari = (unik - _ORDINAL_EPOCH).astype('datetime64[D]')
+    columns = KOLOM_IDENTITAS + np.datetime_as_string(hari, unit='D').tolist()
+    return AttendanceStore(
+        columns, nama, nik, np.arange(len(KOLOM_IDENTITAS), len(columns)), unik,
+        grid_status, grid_masuk, grid_pulang, teks)
+
+
+def _hash_teks(teks):
+    """Hash 64-bit stabil satu teks (tidak bergantung PYTHONHASHSEED)"""
+    return int.from_bytes(hashlib.blake2b(teks.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _campur(h, v):
+    """Satu langkah pencampuran hash uint64 (FNV-1a per kata 64-bit + xorshift)"""
+    h = (h ^ v) * _FNV_PRIMA
+    return h ^ (h >> np.uint64(29))
+
+
+def hash_sel(store, kolom_grid=None):
+    """
+    Hash isi per baris store: identitas (nama, nik) + seluruh sel kolom grid
+    `kolom_grid` (default semua, urutan dipertahankan). Return array uint64
+    sejajar baris.
+
+    Hash hanya bergantung pada isi (tanggal kolom, status, jam masuk/pulang,
+    teks sel tidak baku), bukan pada posisi kolom di file, sehingga sama
+    untuk store penuh maupun hasil proyeksi satu periode.
+    """
+    n = len(store)
+    kolom_grid = np.arange(len(store.tanggal)) if kolom_grid is None else np.asarray(kolom_grid)
+
+    identitas = [
+        f"{'' if pd.isna(nm) else nm}\x1f{'' if nik is None or pd.isna(nik) else nik}"
+        for nm, nik in zip(
+            store.nama if store.nama is not None else [np.nan] * n,
+            store.nik if store.nik is not None else [None] * n)
+    ]
+    h = np.full(n, _FNV_AWAL, dtype=np.uint64)
+    h = _campur(h, np.array([_hash_teks(t) for t in identitas], dtype=np.uint64))
+
+    # Teks asli sel tidak baku per kolom grid: {kolom: ([baris], [hash])}
+    lain = {}
+    for (b, k), (m, p) in store.teks_lain.items():
+        baris, nilai = lain.setdefault(k, ([], []))
+        baris.append(b)
+        nilai.append(_hash_teks(f"{m}\x1f{'' if p is None else p}"))
+
+    for k in kolom_grid:
+        # status 8 bit | masuk+1 17 bit | pulang+1 17 bit | tanggal ordinal 22 bit
+        v = (store.status[:, k].astype(np.uint64) & np.uint64(0xFF)
+             | (store.masuk[:, k] + 1).astype(np.uint64) << np.uint64(8)
+             | (store.pulang[:, k] + 1).astype(np.uint64) << np.uint64(25)
+             | np.uint64(int(store.tanggal[k])) << np.uint64(42))
+        if k in lain:
+            baris, nilai = lain[k]
+            v[baris] ^= np.array(nilai, dtype=np.uint64)
+        h = _campur(h, v)
+    return h
+
+
+def hash_periode(store):
+    """
+    Hash isi per (baris, bulan): {(tahun, bulan): array uint64 sejajar baris},
+    masing-masing hash_sel atas kolom grid bulan tersebut.
+    """
+    hari = (store.tanggal.astype(np.int64) - _ORDINAL_EPOCH).astype('datetime64[D]')
+    bulan = hari.astype('datetime64[M]').astype(np.int64)
+    hasil = {}
+    for b in np.unique(bulan):
+        tahun, nomor = divmod(int(b), 12)
+        hasil[(tahun + 1970, nomor + 1)] = hash_sel(store, np.flatnonzero(bulan == b))
+    return hasil
+
+
+def gabung_hash(daftar):
+    """Gabungkan beberapa array hash uint64 (urutan berpengaruh) menjadi satu per baris"""
+    h = None
+    for nilai in daftar:
+        h = np.full(len(nilai), _FNV_AWAL, dtype=np.uint64) if h is None else h
+        h = _campur(h, nilai)
+    return h
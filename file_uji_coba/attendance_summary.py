@@ -0,0 +1,185 @@
+"""
+Attendance Summary
+Ringkasan bulanan absensi per karyawan dan per unit, dihitung dari sel
+absensi bentuk panjang (hasil melt_store) dengan satu kali agregasi grup
+(groupby karyawan + periode), tanpa loop Python per karyawan.
+
+Klasifikasi sel sama dengan kolom Keterangan laporan harian:
+    Hadir             absen masuk & pulang lengkap (hari apa pun)
+    Tidak Hadir       sel kosong pada hari kerja (bukan akhir pekan / libur)
+    Tidak Lengkap     hanya salah satu jam absen
+    Hadir Hari Libur  absen lengkap pada akhir pekan atau hari libur
+    Total Jam         jumlah durasi kerja yang bisa dihitung (jam desimal,
+                      durasi negatif — shift malam tanpa rollover — dihitung 0)
+    Rata-rata Jam     Total Jam / Hadir
+    Kehadiran (%)     hari kerja yang berisi absen / Hari Kerja
+
+Data sumber tidak memiliki kolom departemen, sehingga "unit" adalah satu
+daftar karyawan (satu file input atau data gabungan). Ringkasan unit
+menjumlahkan baris ringkasan karyawannya per (unit, tahun, bulan).
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from file_uji_coba.data_cache import tulis_atomik
+
+
+KOLOM_JUMLAH = ['Hadir', 'Tidak Hadir', 'Tidak Lengkap', 'Hadir Hari Libur']
+KOLOM_KARYAWAN = (['Unit', 'Nama', 'NIK', 'Tahun', 'Bulan', 'Hari Kerja'] + KOLOM_JUMLAH
+                  + ['Total Jam', 'Rata-rata Jam', 'Kehadiran (%)'])
+KOLOM_UNIT = (['Unit', 'Tahun', 'Bulan', 'Jumlah Karyawan', 'Hari Kerja'] + KOLOM_JUMLAH
+              + ['Total Jam', 'Rata-rata Jam', 'Kehadiran (%)'])
+
+UNIT_DEFAULT = 'Semua Karyawan'
+
+# File output ringkasan (di folder output laporan)
+FILE_RINGKASAN = 'ringkasan_absensi.xlsx'
+FILE_CSV_KARYAWAN = 'ringkasan_karyawan.csv'
+FILE_CSV_UNIT = 'ringkasan_unit.csv'
+SHEET_KARYAWAN = 'Per Karyawan'
+SHEET_UNIT = 'Per Unit'
+
+# Satu baris ringkasan karyawan per kunci ini
+KUNCI_KARYAWAN = ['Unit', 'Nama', 'Tahun', 'Bulan']
+
+
+def _rasio(pembilang, penyebut, skala=1.0, desimal=2):
+    """pembilang / penyebut dibulatkan, NaN jika penyebut 0"""
+    pembilang = np.asarray(pembilang, dtype=np.float64)
+    penyebut = np.asarray(penyebut, dtype=np.float64)
+    hasil = np.full(len(pembilang), np.nan)
+    ada = penyebut > 0
+    hasil[ada] = pembilang[ada] / penyebut[ada] * skala
+    return np.round(hasil, desimal)
+
+
+def ringkas_sel(baris, tanggal, kosong, lengkap, libur, akhir_pekan, detik_kerja,
+                nama, nik=None, unit=UNIT_DEFAULT):
+    """
+    Ringkasan per (karyawan, tahun, bulan) dari sel bentuk panjang.
+
+    baris       : indeks baris karyawan per sel (posisi di array nama / nik)
+    tanggal     : datetime64 per sel
+    kosong, lengkap, libur, akhir_pekan : bool per sel
+    detik_kerja : durasi kerja per sel dalam detik, NaN jika tidak dihitung
+
+    Return DataFrame KOLOM_KARYAWAN urut (nama, tahun, bulan).
+    """
+    baris = np.asarray(baris, dtype=np.int64)
+    tanggal = pd.DatetimeIndex(tanggal)
+    kosong = np.asarray(kosong, dtype=bool)
+    lengkap = np.asarray(lengkap, dtype=bool)
+    hari_kerja = ~np.asarray(libur, dtype=bool) & ~np.asarray(akhir_pekan, dtype=bool)
+    detik = np.asarray(detik_kerja, dtype=np.float64)
+
+    # Satu pass groupby: kunci (baris karyawan, periode tahun*12 + bulan-1)
+    data = pd.DataFrame({
+        'baris': baris,
+        'periode': np.asarray(tanggal.year, dtype=np.int64) * 12 + np.asarray(tanggal.month) - 1,
+        'Hari Kerja': hari_kerja,
+        'Hadir': lengkap,
+        'Tidak Hadir': kosong & hari_kerja,
+        'Tidak Lengkap': ~kosong & ~lengkap,
+        'Hadir Hari Libur': lengkap & ~hari_kerja,
+        'detik': np.where(lengkap & ~np.isnan(detik), np.maximum(detik, 0), 0.0),
+    })
+    grup = data.groupby(['baris', 'periode'], sort=False).sum()
+
+    kunci_baris = grup.index.get_level_values('baris').to_numpy()
+    periode = grup.index.get_level_values('periode').to_numpy()
+    nik = (np.full(len(nama), np.nan, dtype=object) if nik is None
+           else np.asarray(nik, dtype=object))
+
+    hasil = pd.DataFrame({
+        'Unit': unit,
+        'Nama': np.asarray(nama, dtype=object)[kunci_baris],
+        'NIK': nik[kunci_baris],
+        'Tahun': periode // 12,
+        'Bulan': periode % 12 + 1,
+    })
+    for kolom in ['Hari Kerja'] + KOLOM_JUMLAH:
+        hasil[kolom] = grup[kolom].to_numpy(dtype=np.int64)
+    hasil['Total Jam'] = np.round(grup['detik'].to_numpy() / 3600, 2)
+    hasil['Rata-rata Jam'] = _rasio(hasil['Total Jam'], hasil['Hadir'])
+    hasil['Kehadiran (%)'] = _rasio(hasil['Hari Kerja'] - hasil['Tidak Hadir'],
+                                    hasil['Hari Kerja'], 100, 1)
+    return hasil.sort_values(['Nama', 'Tahun', 'Bulan'], kind='stable').reset_index(drop=True)
+
+
+def ringkasan_unit(per_karyawan):
+    """
+    Rollup ringkasan karyawan per (unit, tahun, bulan). Total Jam = jumlah
+    baris karyawan; rata-rata & persentase dihitung ulang dari jumlahnya.
+    """
+    if len(per_karyawan) == 0:
+        return pd.DataFrame(columns=KOLOM_UNIT)
+
+    hasil = per_karyawan.groupby(['Unit', 'Tahun', 'Bulan'], sort=True).agg(
+        **{'Jumlah Karyawan': ('Nama', 'size'),
+           'Hari Kerja': ('Hari Kerja', 'max'),
+           'hari_kerja_total': ('Hari Kerja', 'sum')},
+        **{k: (k, 'sum') for k in KOLOM_JUMLAH + ['Total Jam']},
+    ).reset_index()
+    hasil['Total Jam'] = hasil['Total Jam'].round(2)
+    hasil['Rata-rata Jam'] = _rasio(hasil['Total Jam'], hasil['Hadir'])
+    hasil['Kehadiran (%)'] = _rasio(hasil['hari_kerja_total'] - hasil['Tidak Hadir'],
+                                    hasil['hari_kerja_total'], 100, 1)
+    return hasil[KOLOM_UNIT]
+
+
+def baca_ringkasan(folder):
+    """
+    Ringkasan karyawan yang sudah ditulis di <folder>/ringkasan_karyawan.csv
+    (None jika belum ada). ValueError jika kolomnya tidak sesuai.
+    """
+    path = os.path.join(folder, FILE_CSV_KARYAWAN)
+    if not os.path.exists(path):
+        return None
+    lama = pd.read_csv(path, encoding='utf-8-sig', dtype={'Unit': str, 'Nama': str, 'NIK': str})
+    kurang = [k for k in KOLOM_KARYAWAN if k not in lama.columns]
+    if kurang:
+        raise ValueError(f"kolom tidak ditemukan di {path}: {', '.join(kurang)}")
+    return lama[KOLOM_KARYAWAN]
+
+
+def gabung_ringkasan(lama, baru):
+    """
+    Gabungkan ringkasan karyawan: baris baru menggantikan baris lama dengan
+    (unit, nama, tahun, bulan) sama, baris lama lainnya dipertahankan.
+    """
+    if lama is None or len(lama) == 0:
+        return baru
+    diganti = pd.MultiIndex.from_frame(lama[KUNCI_KARYAWAN]).isin(
+        pd.MultiIndex.from_frame(baru[KUNCI_KARYAWAN]))
+    hasil = pd.concat([lama[~diganti], baru[KOLOM_KARYAWAN]], ignore_index=True)
+    return hasil.sort_values(KUNCI_KARYAWAN, kind='stable').reset_index(drop=True)
+
+
+def simpan_ringkasan(per_karyawan, folder, per_unit=None):
+    """
+    Tulis ringkasan ke <folder>/ringkasan_absensi.xlsx (sheet Per Karyawan &
+    Per Unit) serta dua file CSV. Return dict path file yang ditulis.
+    """
+    if per_unit is None:
+        per_unit = ringkasan_unit(per_karyawan)
+    os.makedirs(folder or '.', exist_ok=True)
+    paths = {
+        'xlsx': os.path.join(folder, FILE_RINGKASAN),
+        'csv_karyawan': os.path.join(folder, FILE_CSV_KARYAWAN),
+        'csv_unit': os.path.join(folder, FILE_CSV_UNIT),
+    }
+
+    def _xlsx(f):
+        with pd.ExcelWriter(f, engine='openpyxl') as writer:
+            per_karyawan.to_excel(writer, sheet_name=SHEET_KARYAWAN, index=False)
+            per_unit.to_excel(writer, sheet_name=SHEET_UNIT, index=False)
+
+    tulis_atomik(paths['xlsx'], _xlsx)
+    tulis_atomik(paths['csv_karyawan'],
+                 lambda f: per_karyawan.to_csv(f, index=False, encoding='utf-8-sig'))
+    tulis_atomik(paths['csv_unit'],
+                 lambda f: per_unit.to_csv(f, index=False, encoding='utf-8-sig'))
+    return paths
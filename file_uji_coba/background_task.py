@@ -0,0 +1,110 @@
+"""
+Background Task
+Menjalankan pekerjaan berat GUI (muat file, proses, simpan Excel) di thread
+worker agar jendela Tk tetap responsif. Worker tidak pernah menyentuh widget:
+log, progress dan hasil dikirim lewat queue yang dibaca thread utama dengan
+root.after. Pembatalan bersifat kooperatif: worker memanggil cek_batal() di
+antar tahap / antar chunk.
+"""
+
+import queue
+import threading
+
+
+# Interval pembacaan queue oleh thread utama (ms)
+INTERVAL_MS = 50
+
+STATUS_SELESAI = 'selesai'
+STATUS_GAGAL = 'gagal'
+STATUS_DIBATALKAN = 'dibatalkan'
+
+
+class Dibatalkan(BaseException):
+    """
+    Tugas dihentikan oleh pengguna. Turunan BaseException (seperti
+    KeyboardInterrupt) agar tidak tertelan blok `except Exception` di
+    tengah proses.
+    """
+
+
+class TugasLatar:
+    """
+    Satu pekerjaan latar: fungsi(tugas, *args) dijalankan di thread daemon.
+
+    Di thread utama, pesan dari worker diteruskan ke saat_pesan(jenis, *isi)
+    ('log', 'progress', 'pesan', atau jenis lain dari kirim()), lalu
+    saat_selesai(status, hasil) dipanggil sekali dengan status STATUS_SELESAI
+    (hasil = nilai return fungsi), STATUS_GAGAL (hasil = exception) atau
+    STATUS_DIBATALKAN (hasil = None).
+    """
+
+    def __init__(self, root, fungsi, saat_pesan, saat_selesai, interval=INTERVAL_MS):
+        self.root = root
+        self.fungsi = fungsi
+        self.saat_pesan = saat_pesan
+        self.saat_selesai = saat_selesai
+        self.interval = interval
+        self.batal = threading.Event()
+        self._antrian = queue.Queue()
+        self._thread = None
+        self._selesai = False
+
+    @property
+    def aktif(self):
+        return self._thread is not None and not self._selesai
+
+    def mulai(self, *args):
+        """Jalankan worker lalu mulai membaca queue di thread utama"""
+        self._thread = threading.Thread(target=self._jalan, args=(args,), daemon=True)
+        self._thread.start()
+        self.root.after(self.interval, self._periksa)
+
+    def _jalan(self, args):
+        try:
+            hasil = self.fungsi(self, *args)
+        except Dibatalkan:
+            self._antrian.put((None, (STATUS_DIBATALKAN, None)))
+        except Exception as e:
+            self._antrian.put((None, (STATUS_GAGAL, e)))
+        else:
+            self._antrian.put((None, (STATUS_SELESAI, hasil)))
+
+    def _periksa(self):
+        """Teruskan isi queue ke handler (thread utama); jadwalkan ulang sampai selesai"""
+        while True:
+            try:
+                jenis, isi = self._antrian.get_nowait()
+            except queue.Empty:
+                break
+            if jenis is None:
+                self._selesai = True
+                self.saat_selesai(*isi)
+                return
+            self.saat_pesan(jenis, *isi)
+        self.root.after(self.interval, self._periksa)
+
+    # ---- dipanggil dari worker ----
+
+    def di_worker(self):
+        """True jika dipanggil dari thread worker tugas ini"""
+        return threading.current_thread() is self._thread
+
+    def kirim(self, jenis, *isi):
+        self._antrian.put((jenis, isi))
+
+    def log(self, message, tag='info'):
+        self.kirim('log', message, tag)
+
+    def progress(self, nilai, teks=''):
+        """nilai 0-100, atau None jika jumlah total belum diketahui (indeterminate)"""
+        self.kirim('progress', nilai, teks)
+
+    def cek_batal(self):
+        """Lempar Dibatalkan jika pengguna meminta pembatalan"""
+        if self.batal.is_set():
+            raise Dibatalkan()
+
+    # ---- dipanggil dari thread utama ----
+
+    def batalkan(self):
+        self.batal.set()
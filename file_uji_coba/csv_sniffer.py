@@ -0,0 +1,145 @@
+"""
+CSV Sniffer
+Deteksi dialek file CSV absensi (separator, encoding/BOM, baris header) dari
+beberapa KB pertama saja, lalu file yang sama langsung diteruskan ke parser
+tanpa membuka atau membaca ulang dari awal.
+"""
+
+import io
+import csv
+import codecs
+from collections import namedtuple
+from contextlib import contextmanager
+
+import pandas as pd
+
+
+# Jumlah byte awal yang dipakai untuk deteksi
+SNIFF_BYTES = 64 * 1024
+
+# Urutan prioritas separator (sama dengan deteksi lama: semicolon dulu, lalu comma)
+SEPARATORS = (';', ',', '\t')
+
+# Baris header dicari maksimal sampai baris ke-N (untuk export dengan judul di atas tabel)
+MAX_HEADER_ROW = 20
+
+_BOM = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# header: daftar nama kolom dari sample (None jika baris header terpotong batas sample)
+CsvDialect = namedtuple('CsvDialect', ['separator', 'encoding', 'header_row', 'header'])
+
+
+def deteksi_encoding(sample):
+    """
+    Tentukan encoding dari BOM; tanpa BOM dicoba UTF-8, jika gagal dianggap
+    cp1252 (export Excel Windows). Return (encoding, teks_sample).
+    """
+    for bom, encoding in _BOM:
+        if sample.startswith(bom):
+            decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            return encoding, decoder.decode(sample)
+
+    try:
+        # final=False: karakter multi-byte yang terpotong di ujung sample diabaikan
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        return 'utf-8', decoder.decode(sample, final=False)
+    except UnicodeDecodeError:
+        return 'cp1252', sample.decode('cp1252', errors='replace')
+
+
+def _pecah_baris(baris, separator):
+    try:
+        return next(csv.reader([baris], delimiter=separator))
+    except (csv.Error, StopIteration):
+        return []
+
+
+def sniff_csv(sample, sampai_akhir=False):
+    """
+    Deteksi dialek dari bytes awal file (sampai_akhir=True jika sample = seluruh file).
+
+    Baris header = baris pertama yang memuat kolom 'nama' dengan lebih dari
+    3 kolom. Jika tidak ditemukan, header dianggap baris pertama dan separator
+    dipilih seperti deteksi lama (kolom > 3 dengan ';', lalu ',', default ';').
+    """
+    encoding, teks = deteksi_encoding(sample)
+    baris_list = teks.splitlines()
+    terpotong = not sampai_akhir and not teks.endswith(('\n', '\r'))
+
+    # Baris terakhir bisa terpotong batas sample; hanya dipakai jika satu-satunya
+    if terpotong and len(baris_list) > 1:
+        baris_list = baris_list[:-1]
+        terpotong = False
+
+    def _dialek(separator, nomor):
+        header = None if terpotong else _pecah_baris(baris_list[nomor], separator)
+        return CsvDialect(separator, encoding, nomor, header)
+
+    for nomor, baris in enumerate(baris_list[:MAX_HEADER_ROW]):
+        for separator in SEPARATORS:
+            kolom = [k.strip().lower() for k in _pecah_baris(baris, separator)]
+            if len(kolom) > 3 and 'nama' in kolom:
+                return _dialek(separator, nomor)
+
+    if not baris_list:
+        return CsvDialect(';', encoding, 0, None)
+
+    for separator in SEPARATORS[:2]:
+        if len(_pecah_baris(baris_list[0], separator)) > 3:
+            return _dialek(separator, 0)
+
+    return _dialek(';', 0)
+
+
+@contextmanager
+def buka_csv(file_path, sniff_bytes=SNIFF_BYTES):
+    """
+    Buka file sekali, deteksi dialek dari buffer (peek, tanpa seek/baca ulang)
+    lalu yield (file_biner, dialek) untuk diteruskan ke parser.
+    """
+    with open(file_path, 'rb', buffering=max(sniff_bytes, io.DEFAULT_BUFFER_SIZE)) as f:
+        sample = f.peek(sniff_bytes)[:sniff_bytes]
+        dialek = sniff_csv(sample, sampai_akhir=len(sample) < sniff_bytes)
+        yield f, dialek
+
+
+def opsi_read_csv(dialek, proyeksi=None):
+    """
+    Argumen pd.read_csv sesuai dialek hasil sniffing.
+
+    proyeksi(header) → daftar posisi kolom yang dibaca (usecols) atau None
+    untuk semua kolom; hanya dipakai jika header lengkap ada di sample.
+    """
+    opsi = {
+        'sep': dialek.separator,
+        'encoding': dialek.encoding,
+        'skiprows': dialek.header_row or None,
+    }
+    if proyeksi is not None and dialek.header is not None:
+        usecols = proyeksi(dialek.header)
+        if usecols is not None:
+            opsi['usecols'] = usecols
+    return opsi
+
+
+def deteksi_dialek(file_path):
+    """Deteksi dialek saja (hanya membaca sample awal file)"""
+    with buka_csv(file_path) as (_, dialek):
+        return dialek
+
+
+def baca_csv(file_path, proyeksi=None, **kwargs):
+    """
+    Baca CSV dengan satu kali buka file: sniffing + parsing pada handle yang sama.
+    Return (DataFrame, dialek).
+    """
+    with buka_csv(file_path) as (f, dialek):
+        df = pd.read_csv(f, **opsi_read_csv(dialek, proyeksi), **kwargs)
+    return df, dialek
+
@@ -0,0 +1,205 @@
+"""
+Data Cache
+Cache lokal hasil parsing file absensi (CSV/XLSX) dalam format kolom NumPy (.npz),
+dikunci dengan hash isi file + versi parser.
+
+Setiap kali entri baru disimpan, entri versi parser lama dihapus dan jika
+total ukuran cache melebihi batas (ABSENSI_CACHE_MAKS_MB, default 1024 MB)
+entri yang paling lama tidak dipakai dihapus lebih dulu (LRU, waktu pakai =
+mtime entri yang diperbarui setiap kali dimuat).
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import zipfile
+
+import numpy as np
+
+
+# Naikkan jika cara parsing / normalisasi data berubah agar cache lama tidak dipakai
+PARSER_VERSION = 4
+
+CACHE_DIR = os.environ.get('ABSENSI_CACHE_DIR') or os.path.join(
+    os.path.expanduser('~'), '.cache', 'sistem-absensi')
+
+# Batas total ukuran entri .npz di folder cache (byte)
+MAKS_UKURAN_CACHE = int(os.environ.get('ABSENSI_CACHE_MAKS_MB') or 1024) * 1024 * 1024
+
+
+def hash_file(file_path, chunk_size=1024 * 1024):
+    """SHA-256 isi file (dibaca per chunk)"""
+    h = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# umask proses (mkstemp selalu membuat file 0600; hasil akhir mengikuti umask)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def tulis_atomik(path, tulis):
+    """
+    Tulis file via file sementara + os.replace agar tidak pernah setengah jadi.
+
+    tulis(f) menerima file biner yang terbuka; jika gagal, file sementara
+    dihapus dan file lama (jika ada) tetap utuh.
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            tulis(f)
+        os.chmod(tmp, 0o666 & ~_UMASK)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class DataCache:
+    """
+    Cache best-effort: semua error I/O dianggap cache miss sehingga
+    aplikasi tetap berjalan walau folder cache tidak bisa ditulis.
+    """
+
+    INDEX_FILE = 'index.json'
+    EKSTENSI = '.npz'
+
+    def __init__(self, cache_dir=None, maks_ukuran=None):
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.maks_ukuran = MAKS_UKURAN_CACHE if maks_ukuran is None else maks_ukuran
+
+    def _index_path(self):
+        return os.path.join(self.cache_dir, self.INDEX_FILE)
+
+    def _baca_index(self):
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def file_digest(self, file_path):
+        """
+        Hash isi file. Hash terakhir diingat per (path, ukuran, mtime) agar
+        membuka ulang file yang sama tidak perlu membaca seluruh isinya lagi.
+        """
+        st = os.stat(file_path)
+        stat_key = f"{os.path.abspath(file_path)}|{st.st_size}|{st.st_mtime_ns}"
+
+        index = self._baca_index()
+        if stat_key in index:
+            return index[stat_key]
+
+        digest = hash_file(file_path)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            index[stat_key] = digest
+            data = json.dumps(index).encode('utf-8')
+            tulis_atomik(self._index_path(), lambda f: f.write(data))
+        except OSError:
+            pass
+        return digest
+
+    def _entry_path(self, file_path, varian):
+        key = f"{self.file_digest(file_path)}-v{PARSER_VERSION}"
+        if varian:
+            key += f"-{hashlib.sha1(varian.encode('utf-8')).hexdigest()[:12]}"
+        return os.path.join(self.cache_dir, key + self.EKSTENSI)
+
+    def load_arrays(self, file_path, varian=''):
+        """Muat dict array ter-cache untuk file (None jika belum ada / rusak)"""
+        try:
+            path = self._entry_path(file_path, varian)
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            return None
+        try:
+            os.utime(path)   # tandai baru dipakai (urutan LRU)
+        except OSError:
+            pass
+        return arrays
+
+    def save_arrays(self, file_path, arrays, varian=''):
+        """Simpan dict array NumPy (tanpa objek Python) untuk file"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._entry_path(file_path, varian)
+            tulis_atomik(path, lambda f: np.savez(f, **arrays))
+        except (OSError, ValueError):
+            return False
+        self.bersihkan()
+        return True
+
+    def _bagian_nama(self, nama):
+        """Nama entri '<hash file>-v<versi>[-<varian>].npz' → [hash, 'v<versi>', varian?]"""
+        return nama[:-len(self.EKSTENSI)].split('-')
+
+    def _daftar_entri(self):
+        """[(mtime_ns, ukuran, nama file)] seluruh entri .npz di folder cache"""
+        entri = []
+        with os.scandir(self.cache_dir) as it:
+            for e in it:
+                if not e.name.endswith(self.EKSTENSI):
+                    continue
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue   # dihapus proses lain
+                entri.append((st.st_mtime_ns, st.st_size, e.name))
+        return entri
+
+    def bersihkan(self):
+        """
+        Hapus entri versi parser lama, lalu entri yang paling lama tidak dipakai
+        sampai total ukuran cache <= maks_ukuran. Index hash file yang tidak lagi
+        punya entri ikut dibuang. Return jumlah entri yang dihapus.
+        """
+        try:
+            entri = self._daftar_entri()
+        except OSError:
+            return 0
+
+        versi = f"v{PARSER_VERSION}"
+        hapus, sisa = [], []
+        for e in entri:
+            (sisa if self._bagian_nama(e[2])[1:2] == [versi] else hapus).append(e)
+
+        # Terbaru dipakai dulu; entri terbaru (biasanya yang baru disimpan) selalu dipertahankan
+        sisa.sort(reverse=True)
+        total = 0
+        for i, e in enumerate(sisa):
+            total += e[1]
+            if i > 0 and total > self.maks_ukuran:
+                hapus.append(e)
+
+        dihapus = 0
+        for _, _, nama in hapus:
+            try:
+                os.remove(os.path.join(self.cache_dir, nama))
+                dihapus += 1
+            except OSError:
+                pass
+        if dihapus:
+            self._rapikan_index()
+        return dihapus
+
+    def _rapikan_index(self):
+        """Buang catatan (path, ukuran, mtime) → hash yang entri cachenya sudah tidak ada"""
+        try:
+            ada = {self._bagian_nama(nama)[0] for _, _, nama in self._daftar_entri()}
+            index = self._baca_index()
+            sisa = {k: v for k, v in index.items() if v in ada}
+            if len(sisa) < len(index):
+                data = json.dumps(sisa).encode('utf-8')
+                tulis_atomik(self._index_path(), lambda f: f.write(data))
+        except OSError:
+            pass
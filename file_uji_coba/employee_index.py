@@ -0,0 +1,201 @@
+"""
+Employee Index
+Indeks pencarian karyawan yang dibangun sekali saat data dimuat: nama persis,
+nama tanpa beda huruf besar/kecil & spasi, NIK, dan awalan nama (bisect pada
+daftar nama terurut), menggantikan scan str.contains per permintaan.
+
+TrigramIndex menyediakan pencarian mirip (fuzzy) berperingkat untuk pemilihan
+karyawan di CLI dan combobox GUI: gelar/tanda baca diabaikan dan salah ketik
+kecil tetap ditemukan.
+"""
+
+import re
+from bisect import bisect_left
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+
+# Jumlah hasil pencarian mirip yang ditampilkan
+TOP_K = 20
+
+# Skor minimum (proporsi trigram query yang ditemukan di nama)
+SKOR_MINIMUM = 0.5
+
+_RE_GELAR = re.compile(r',.*$')          # gelar di belakang koma: ", S.Kom", ", S.Pd., M.Si"
+_RE_BUKAN_HURUF = re.compile(r'[\W_]+')
+
+
+# baris: posisi baris pertama tiap nama yang cocok; cara: jenis pencocokan yang berhasil
+HasilCari = namedtuple('HasilCari', ['baris', 'nama', 'cara'])
+
+
+def normalisasi_nama(teks):
+    """Nama untuk pencocokan: spasi dirapikan, huruf kecil (casefold)"""
+    return ' '.join(str(teks).split()).casefold()
+
+
+def normalisasi_mirip(teks):
+    """
+    Nama untuk pencarian mirip: tanpa gelar di belakang koma, tanpa singkatan
+    bertitik (S.Kom, Dr., Ir.) dan tanpa tanda baca
+    """
+    teks = _RE_GELAR.sub('', normalisasi_nama(teks))
+    teks = ' '.join(kata for kata in teks.split() if '.' not in kata)
+    return _RE_BUKAN_HURUF.sub(' ', teks).strip()
+
+
+def trigram(teks):
+    """Himpunan trigram per kata (diberi padding seperti pg_trgm: '  kata ')"""
+    hasil = set()
+    for kata in normalisasi_mirip(teks).split():
+        kata = f"  {kata} "
+        hasil.update(kata[i:i + 3] for i in range(len(kata) - 2))
+    return hasil
+
+
+def _teks_valid(values):
+    """(posisi, teks) untuk nilai yang tidak kosong"""
+    values = pd.Series(values, dtype=object)
+    valid = values.notna()
+    return zip(values.index[valid], values[valid].astype(str).str.strip())
+
+
+class EmployeeIndex:
+    """
+    Indeks nama/NIK → baris data sumber.
+
+    Nama yang muncul di beberapa baris diwakili baris pertamanya (sama dengan
+    daftar karyawan dan proses batch). Pencarian dicoba berurutan: nama persis,
+    NIK, nama tanpa beda huruf, awalan nama, lalu bagian nama; tingkat pertama
+    yang menemukan hasil dipakai, dan lebih dari satu nama berarti ambigu.
+    """
+
+    def __init__(self, nama, nik=None):
+        self.nama = []               # nama unik (teks asli) sesuai urutan file
+        self._baris = []             # baris pertama per nama unik
+        self._persis = {}            # nama asli → id
+        self._normal = {}            # nama normalisasi → [id]
+        self._nik = {}               # NIK → [id]
+
+        if nama is not None:
+            for baris, teks in _teks_valid(nama):
+                if not teks or teks in self._persis:
+                    continue
+                id_nama = len(self.nama)
+                self._persis[teks] = id_nama
+                self.nama.append(teks)
+                self._baris.append(int(baris))
+                self._normal.setdefault(normalisasi_nama(teks), []).append(id_nama)
+
+        if nik is not None and nama is not None:
+            nama_baris = pd.Series(nama, dtype=object)
+            for baris, teks in _teks_valid(nik):
+                id_nama = self._persis.get(str(nama_baris.iloc[baris]).strip())
+                if teks and id_nama is not None:
+                    daftar = self._nik.setdefault(teks, [])
+                    if id_nama not in daftar:
+                        daftar.append(id_nama)
+
+        # Kunci normalisasi terurut untuk pencarian awalan O(log n)
+        self._terurut = sorted(self._normal)
+        self._trigram = None
+
+    def __len__(self):
+        return len(self.nama)
+
+    def _hasil(self, ids, cara):
+        ids = sorted(set(ids))
+        return HasilCari([self._baris[i] for i in ids], [self.nama[i] for i in ids], cara)
+
+    def awalan(self, teks):
+        """Id nama yang diawali teks (setelah normalisasi)"""
+        kunci = normalisasi_nama(teks)
+        ids = []
+        for i in range(bisect_left(self._terurut, kunci), len(self._terurut)):
+            if not self._terurut[i].startswith(kunci):
+                break
+            ids.extend(self._normal[self._terurut[i]])
+        return ids
+
+    def mirip(self, query, k=TOP_K):
+        """Nama karyawan paling mirip dengan query (TrigramIndex dibangun saat pertama dipakai)"""
+        if self._trigram is None:
+            self._trigram = TrigramIndex(self.nama)
+        return [nama for nama, _ in self._trigram.cari(query, k)]
+
+    def cari(self, query):
+        """
+        Cari karyawan berdasarkan nama atau NIK. Return HasilCari; baris kosong
+        jika tidak ditemukan, lebih dari satu jika ambigu.
+        """
+        teks = str(query).strip()
+        kunci = normalisasi_nama(teks)
+        if not kunci:
+            return HasilCari([], [], None)
+
+        if teks in self._persis:
+            return self._hasil([self._persis[teks]], 'persis')
+        if teks in self._nik:
+            return self._hasil(self._nik[teks], 'nik')
+        if kunci in self._normal:
+            return self._hasil(self._normal[kunci], 'huruf')
+
+        ids = self.awalan(kunci)
+        if ids:
+            return self._hasil(ids, 'awalan')
+
+        # Terakhir: bagian nama (teks biasa, bukan regex) pada nama unik saja
+        ids = [i for k in self._terurut if kunci in k for i in self._normal[k]]
+        return self._hasil(ids, 'sebagian' if ids else None)
+
+
+class TrigramIndex:
+    """
+    Indeks trigram → id nama untuk pencarian mirip berperingkat.
+
+    Skor = proporsi trigram query yang ada di nama; nama dengan skor sama
+    diurutkan berdasarkan kemiripan Jaccard (nama yang lebih pendek/dekat
+    didahulukan) lalu urutan asli.
+    """
+
+    def __init__(self, nama):
+        self.nama = list(nama)
+        posting = {}
+        self._jumlah = np.zeros(len(self.nama), dtype=np.int32)
+        for id_nama, teks in enumerate(self.nama):
+            tri = trigram(teks)
+            self._jumlah[id_nama] = len(tri)
+            for t in tri:
+                posting.setdefault(t, []).append(id_nama)
+        self._posting = {t: np.array(ids, dtype=np.int32) for t, ids in posting.items()}
+
+    def __len__(self):
+        return len(self.nama)
+
+    def cari(self, query, k=TOP_K, skor_minimum=SKOR_MINIMUM):
+        """Daftar (nama, skor) paling mirip, maksimal k, skor tertinggi dulu"""
+        tri = trigram(query)
+        ids = [self._posting[t] for t in tri if t in self._posting]
+        if not tri or not ids:
+            return []
+
+        sama = np.bincount(np.concatenate(ids), minlength=len(self.nama))
+        skor = sama / len(tri)
+        kandidat = np.flatnonzero(skor >= skor_minimum)
+        if len(kandidat) == 0:
+            return []
+
+        jaccard = sama[kandidat] / (len(tri) + self._jumlah[kandidat] - sama[kandidat])
+        urutan = np.lexsort((kandidat, -jaccard, -skor[kandidat]))[:k]
+        return [(self.nama[i], float(skor[i])) for i in kandidat[urutan]]
+
+
+def pesan_ambigu(query, hasil, maks=5):
+    """Pesan untuk hasil pencarian yang cocok dengan lebih dari satu karyawan"""
+    contoh = ', '.join(hasil.nama[:maks])
+    if len(hasil.nama) > maks:
+        contoh += f", ... (+{len(hasil.nama) - maks})"
+    return (f"'{query}' cocok dengan {len(hasil.nama)} karyawan: {contoh}. "
+            f"Gunakan nama lengkap atau NIK.")
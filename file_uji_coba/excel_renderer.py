@@ -0,0 +1,559 @@
+"""
+Excel Renderer
+Pengisian template hasil-akhir.xlsx tanpa GUI (headless), aman dijalankan
+di ProcessPoolExecutor untuk membuat banyak laporan karyawan sekaligus
+"""
+
+import os
+import io
+import re
+import pickle
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from openpyxl import load_workbook, Workbook
+from openpyxl.styles import Font, Alignment, PatternFill, Color
+from openpyxl.drawing.image import Image as XLImage
+from openpyxl.drawing.spreadsheet_drawing import TwoCellAnchor, AnchorMarker
+from openpyxl.cell.rich_text import CellRichText, TextBlock
+from openpyxl.cell.text import InlineFont
+
+from file_uji_coba.data_cache import tulis_atomik
+from file_uji_coba.xlsx_patcher import (
+    TeksKaya, baca_template_zip, siapkan_gaya, tulis_laporan_zip, font_xml, baca_font
+)
+
+
+# Direktori root project (satu tingkat di atas file_uji_coba)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE_PATH = os.path.join(BASE_DIR, 'contoh', 'hasil-akhir.xlsx')
+LOGO_PATH = os.path.join(BASE_DIR, 'contoh', 'logo-badung.png')
+
+# Range data laporan: B11 sampai F41
+START_ROW = 11
+MAX_ROWS = 31
+
+# Backend render: 'openpyxl' (object model lengkap) atau 'zip' (patch XML langsung)
+BACKENDS = ('openpyxl', 'zip')
+
+# Pesan error untuk laporan yang tidak dirender karena dibatalkan
+DIBATALKAN = 'Dibatalkan'
+
+NAMA_BULAN = {
+    1: 'Januari', 2: 'Februari', 3: 'Maret', 4: 'April',
+    5: 'Mei', 6: 'Juni', 7: 'Juli', 8: 'Agustus',
+    9: 'September', 10: 'Oktober', 11: 'November', 12: 'Desember'
+}
+
+# Format angka sel laporan (dipakai kedua backend)
+FORMAT_TANGGAL = r'[$-409]d\-mmm\-yy;@'
+FORMAT_TANGGAL_CETAK = r'[$-409]d\-mmm\-yyyy;@'
+FORMAT_JAM = 'h:mm;@'
+FORMAT_DURASI = '#,##0'
+FORMAT_PERIODE = 'mmm-yy'
+
+# Header organisasi C1: 3 baris pertama bold, 3 baris bawah normal
+HEADER_BOLD = (
+    'PEMERINTAH KABUPATEN BADUNG\n'
+    'DINAS KOMUNIKASI DAN INFORMATIKA\n'
+    'PUSAT PEMERINTAHAN MANGUPRAJA MANDALA\n'
+)
+HEADER_NORMAL = (
+    'Jln Raya Sempidi, Mengwi \u2013 Kabupaten Badung (80351)\n'
+    'Telp. (0361) 419888 Fax (0361) 419888\n'
+    'Website : www.diskominfo.badungkab.go.id'
+)
+
+
+def _abaikan_log(message, tag='info'):
+    """Log default untuk mode headless (tidak menampilkan apa-apa)"""
+
+
+class TemplateCache:
+    """
+    Cache template & logo per proses.
+
+    Template di-parse sekali, disimpan sebagai snapshot pickle, lalu setiap
+    laporan mendapat salinan workbook baru dari snapshot tersebut (jauh lebih
+    murah daripada parsing XML ulang). Entry diperbarui jika mtime/ukuran file
+    berubah dan isi file (SHA-1) memang berbeda.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def _ambil(self, path, jenis, loader):
+        """Ambil data ter-cache (path, jenis), muat ulang dengan loader jika file berubah"""
+        st = os.stat(path)
+        stat_key = (st.st_mtime_ns, st.st_size)
+        entry = self._entries.get((path, jenis))
+
+        if entry and entry['stat'] == stat_key:
+            return entry['data']
+
+        with open(path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha1(raw).hexdigest()
+
+        # mtime berubah tapi isi sama (mis. file di-copy ulang) — tetap pakai cache
+        if entry and entry['hash'] == digest:
+            entry['stat'] = stat_key
+            return entry['data']
+
+        data = loader(raw)
+        self._entries[(path, jenis)] = {'stat': stat_key, 'hash': digest, 'data': data}
+        return data
+
+    @staticmethod
+    def _snapshot_template(raw):
+        """Parse template sekali dan simpan sebagai snapshot pickle"""
+        # Load dengan rich_text=True agar CellRichText (bold sebagian) bisa ditulis
+        wb = load_workbook(io.BytesIO(raw), rich_text=True)
+        # Hapus gambar lama dari template secara aman
+        for ws in wb.worksheets:
+            try:
+                ws._images.clear()
+            except AttributeError:
+                pass
+        return pickle.dumps(wb, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def workbook(self, template_path):
+        """Salinan workbook template yang baru (aman diubah per laporan)"""
+        return pickle.loads(self._ambil(template_path, 'workbook', self._snapshot_template))
+
+    def template_zip(self, template_path):
+        """
+        Isi zip template untuk backend 'zip' beserta style turunan laporan
+        (read-only, tidak perlu disalin)
+        """
+        return self._ambil(template_path, 'zip',
+                           lambda raw: siapkan_gaya(baca_template_zip(raw), perubahan_gaya()))
+
+    def logo(self, logo_path):
+        """Isi file logo (bytes)"""
+        return self._ambil(logo_path, 'logo', bytes)
+
+    def clear(self):
+        """Kosongkan cache"""
+        self._entries.clear()
+
+
+# Satu cache per proses (setiap worker ProcessPoolExecutor punya cache sendiri)
+template_cache = TemplateCache()
+
+
+def buat_template_sederhana(ws, nama, periode_text):
+    """Buat template Excel sederhana jika file baru"""
+    # Header utama
+    ws['A1'] = 'REKAP ABSENSI KARYAWAN'
+    ws['A1'].font = Font(size=16, bold=True)
+
+    ws['A3'] = 'Nama'
+    ws['B3'] = nama
+
+    ws['A4'] = 'Periode'
+    ws['B4'] = periode_text
+
+    # Header tabel (row 10)
+    headers = ['No', 'Tanggal', 'Jam Masuk', 'Jam Keluar', 'Durasi', 'Keterangan']
+    for idx, header in enumerate(headers, start=1):
+        cell = ws.cell(row=10, column=idx)
+        cell.value = header
+        cell.font = Font(bold=True)
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+
+    # Nomor urut (A11:A41)
+    for i in range(1, 32):
+        ws[f'A{10+i}'] = i
+
+
+def buka_template(template_path, output_file, nama, periode_text, log=_abaikan_log):
+    """Buka template (atau file existing / workbook baru sebagai fallback)"""
+    if template_path and os.path.exists(template_path):
+        log(f"Menggunakan template: {template_path}", 'info')
+        wb = template_cache.workbook(template_path)
+        ws = wb.active
+    elif output_file and os.path.exists(output_file):
+        log("Template tidak ada, menggunakan file existing...", 'warning')
+        wb = load_workbook(output_file)
+        ws = wb.active
+    else:
+        log("Template & file tidak ada, membuat file baru...", 'warning')
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Rekap Absensi"
+
+        # Create header template jika file baru
+        buat_template_sederhana(ws, nama, periode_text)
+
+    return wb, ws
+
+
+def isi_header(ws, nama, month, year, log=_abaikan_log):
+    """Update informasi karyawan, periode, header organisasi dan tanggal cetak"""
+    try:
+        periode_text = f"{NAMA_BULAN.get(month, '')} {year}"
+
+        # Update nama karyawan (F7) - rekonstruksi font secara aman
+        orig_f7 = ws['F7'].font
+        ws['F7'].value = nama
+        # Bangun Font baru — hindari meneruskan objek Color bertipe 'theme'
+        # langsung karena dapat menyebabkan error serialisasi di beberapa versi
+        try:
+            ws['F7'].font = Font(
+                name=orig_f7.name or 'Calibri',
+                size=orig_f7.size or 12,
+                bold=orig_f7.bold,
+                italic=orig_f7.italic,
+                color=orig_f7.color
+            )
+        except Exception:
+            ws['F7'].font = Font(name='Calibri', size=12)
+        log("✓ Nama karyawan diupdate di F7", 'success')
+
+        # Update G5 dengan datetime agar number_format mmm-yy bekerja
+        ws['G5'].value = datetime(year, month, 1)
+        ws['G5'].number_format = FORMAT_PERIODE
+        ws['G5'].font = Font(name='Calibri', size=18, color=Color(theme=4))
+        log(f"✓ Periode diupdate di G5: {periode_text}", 'success')
+
+        # Pastikan D5 tetap bold '-' (separator) dengan warna biru (theme=4)
+        ws['D5'].value = '-'
+        ws['D5'].font = Font(name='Calibri', size=18, bold=True, color=Color(theme=4))
+
+        # Pastikan B44 & E44 tetap bold
+        ws['B44'].font = Font(name='Calibri', size=11, bold=True)
+        ws['E44'].font = Font(name='Calibri', size=11, bold=True)
+
+        # Update nama karyawan di C45 (kolom tanda tangan tenaga ahli)
+        ws['C45'].value = nama
+        log(f"✓ Nama karyawan diupdate di C45", 'success')
+
+        # Bold sebagian teks header organisasi di C1
+        ws['C1'].value = CellRichText(
+            TextBlock(InlineFont(rFont='Calibri', sz=12, b=True), HEADER_BOLD),
+            TextBlock(InlineFont(rFont='Calibri', sz=12, b=False), HEADER_NORMAL)
+        )
+        log('✓ Header organisasi C1 diformat (bold sebagian)', 'success')
+
+        # Header tabel row 10 — hapus background (gunakan PatternFill kosong)
+        no_fill = PatternFill()  # fill_type default None = hapus fill
+        for col in ['B', 'C', 'D', 'E', 'F']:
+            ws[f'{col}10'].fill = no_fill
+
+        # C49 & F49: tanggal hari ini dengan format 3-Jan-2026
+        today = datetime.now()
+        ws['C49'].value = today
+        ws['C49'].number_format = FORMAT_TANGGAL_CETAK
+        ws['F49'].value = today
+        ws['F49'].number_format = FORMAT_TANGGAL_CETAK
+        log(f"✓ Tanggal hari ini diisi di C49 & F49", 'success')
+
+    except Exception as e:
+        log(f"Info header mungkin perlu disesuaikan manual: {str(e)}", 'warning')
+
+
+def isi_data(ws, processed_data, log=_abaikan_log):
+    """Tulis data absensi ke range B11:F41 dan kosongkan sisa baris"""
+    log("Menulis data ke Excel (B11:F41)...", 'info')
+
+    for idx, data in enumerate(processed_data):
+        if idx >= MAX_ROWS:
+            log(f"Maksimal {MAX_ROWS} baris tercapai, data selanjutnya dilewati", 'warning')
+            break
+
+        row = START_ROW + idx
+
+        # B: Tanggal - format d-Mmm-yy sesuai template
+        ws[f'B{row}'] = data['tanggal']
+        ws[f'B{row}'].number_format = FORMAT_TANGGAL
+
+        # C: Jam Masuk - format HH:MM
+        ws[f'C{row}'] = data['jam_masuk']
+        ws[f'C{row}'].number_format = FORMAT_JAM
+
+        # D: Jam Keluar/Pulang - format HH:MM
+        ws[f'D{row}'] = data['jam_pulang']
+        ws[f'D{row}'].number_format = FORMAT_JAM
+
+        # E: Durasi (integer jam)
+        ws[f'E{row}'] = data['durasi']
+        if isinstance(data['durasi'], int):
+            ws[f'E{row}'].number_format = FORMAT_DURASI
+
+        # F: Keterangan
+        ws[f'F{row}'] = data['keterangan']
+
+    # Clear sisa baris jika data kurang dari 31
+    for idx in range(len(processed_data), MAX_ROWS):
+        row = START_ROW + idx
+        ws[f'B{row}'] = ""
+        ws[f'C{row}'] = ""
+        ws[f'D{row}'] = ""
+        ws[f'E{row}'] = ""
+        ws[f'F{row}'] = ""
+
+
+def tambah_logo(ws, logo_path, log=_abaikan_log):
+    """Sisipkan logo pada posisi rata tengah area B1:B4"""
+    if not (logo_path and os.path.exists(logo_path)):
+        log(f"ℹ️  Logo tidak ditemukan ({logo_path})", 'warning')
+        return
+
+    try:
+        logo_img = XLImage(io.BytesIO(template_cache.logo(logo_path)))
+        logo_img.width = 121
+        logo_img.height = 116
+        # Gunakan TwoCellAnchor dengan koordinat EMU persis dari template asli
+        # agar posisi logo identik (rata tengah di area B1:B4)
+        anchor = TwoCellAnchor(editAs='oneCell')
+        anchor._from = AnchorMarker(col=1, colOff=249464, row=0, rowOff=68036)
+        anchor.to   = AnchorMarker(col=1, colOff=1401989, row=3, rowOff=86270)
+        logo_img.anchor = anchor
+        ws.add_image(logo_img)
+        log("✓ Logo berhasil ditambahkan (posisi rata tengah)", 'success')
+    except Exception as e:
+        log(f"Gagal menambahkan logo: {str(e)}", 'warning')
+
+
+def siapkan_workbook(nama, month, year, processed_data, template_path=TEMPLATE_PATH,
+                     logo_path=LOGO_PATH, output_file=None, log=_abaikan_log):
+    """Bangun workbook laporan lengkap (template + header + data + logo), belum disimpan"""
+    periode_text = f"{NAMA_BULAN.get(month, '')} {year}"
+    wb, ws = buka_template(template_path, output_file, nama, periode_text, log)
+    isi_header(ws, nama, month, year, log)
+    isi_data(ws, processed_data, log)
+    tambah_logo(ws, logo_path, log)
+    return wb
+
+
+def _font_nama(asal):
+    """Font F7 seperti isi_header: name/size/bold/italic/color font template saja"""
+    f = baca_font(asal)
+    return font_xml(f['name'] or 'Calibri', f['sz'] or 12, f['b'], f['i'], f['color'])
+
+
+def perubahan_gaya():
+    """
+    Perubahan style backend 'zip' (lihat xlsx_patcher.siapkan_gaya), setara
+    font / fill / number_format yang diset isi_header & isi_data.
+    Kunci = ref sel, atau (ref, 'angka') untuk durasi integer.
+    """
+    font_periode = font_xml('Calibri', 18, color='theme="4"')
+    font_tebal = font_xml('Calibri', 11, b=True)
+    perubahan = {
+        'F7': ('F7', {'font': _font_nama}),
+        'G5': ('G5', {'font': font_periode, 'numfmt': FORMAT_PERIODE}),
+        'D5': ('D5', {'font': font_xml('Calibri', 18, b=True, color='theme="4"')}),
+        'B44': ('B44', {'font': font_tebal}),
+        'E44': ('E44', {'font': font_tebal}),
+        'C49': ('C49', {'numfmt': FORMAT_TANGGAL_CETAK}),
+        'F49': ('F49', {'numfmt': FORMAT_TANGGAL_CETAK}),
+    }
+    # Header tabel row 10 tanpa background
+    for col in 'BCDEF':
+        perubahan[f'{col}10'] = (f'{col}10', {'fill': '<fill><patternFill/></fill>'})
+    for row in range(START_ROW, START_ROW + MAX_ROWS):
+        perubahan[f'B{row}'] = (f'B{row}', {'numfmt': FORMAT_TANGGAL})
+        perubahan[f'C{row}'] = (f'C{row}', {'numfmt': FORMAT_JAM})
+        perubahan[f'D{row}'] = (f'D{row}', {'numfmt': FORMAT_JAM})
+        perubahan[(f'E{row}', 'angka')] = (f'E{row}', {'numfmt': FORMAT_DURASI})
+    return perubahan
+
+
+def gaya_laporan(gaya, processed_data):
+    """Style per sel ({ref: indeks xf}) satu laporan dari style turunan template"""
+    hasil = {k: v for k, v in gaya.items() if isinstance(k, str)}
+    for idx in range(MAX_ROWS):
+        row = START_ROW + idx
+        if idx >= len(processed_data):
+            # Baris kosong: style template tidak diubah (sama seperti isi_data)
+            for col in 'BCD':
+                del hasil[f'{col}{row}']
+        elif isinstance(processed_data[idx]['durasi'], int):
+            hasil[f'E{row}'] = gaya[(f'E{row}', 'angka')]
+    return hasil
+
+
+def sel_laporan(nama, month, year, processed_data):
+    """
+    Nilai sel laporan (C1, F7, G5, D5, C45, C49, F49, B11:F41) untuk backend
+    'zip'. Isi sama dengan isi_header + isi_data; format lihat gaya_laporan.
+    """
+    today = datetime.now()
+    cells = {
+        'C1': TeksKaya((
+            ('<rPr><rFont val="Calibri"/><b val="1"/><sz val="12"/></rPr>', HEADER_BOLD),
+            ('<rPr><rFont val="Calibri"/><b val="0"/><sz val="12"/></rPr>', HEADER_NORMAL),
+        )),
+        'F7': nama,
+        'G5': datetime(year, month, 1),
+        'D5': '-',
+        'C45': nama,
+        'C49': today,
+        'F49': today,
+    }
+
+    for idx in range(MAX_ROWS):
+        row = START_ROW + idx
+        if idx < len(processed_data):
+            data = processed_data[idx]
+            nilai = [data['tanggal'], data['jam_masuk'], data['jam_pulang'],
+                     data['durasi'], data['keterangan']]
+        else:
+            # Clear sisa baris jika data kurang dari 31
+            nilai = [""] * 5
+        for col, v in zip(['B', 'C', 'D', 'E', 'F'], nilai):
+            cells[f'{col}{row}'] = v
+
+    return cells
+
+
+def simpan_laporan_zip(nama, month, year, processed_data, output_path,
+                       template_path=TEMPLATE_PATH):
+    """Render laporan dengan mem-patch XML template langsung (tanpa openpyxl)"""
+    if not (template_path and os.path.exists(template_path)):
+        raise FileNotFoundError(f"Template tidak ditemukan: {template_path}")
+    template = template_cache.template_zip(template_path)
+    tulis_laporan_zip(
+        template,
+        output_path,
+        sel_laporan(nama, month, year, processed_data),
+        gaya_laporan(template['gaya'], processed_data)
+    )
+
+
+def nama_file_laporan(nama, month, year):
+    """Nama file output deterministik: Absensi_<Nama>_<YYYY>-<MM>.xlsx"""
+    slug = re.sub(r'[^0-9A-Za-z]+', '_', str(nama)).strip('_') or 'Karyawan'
+    return f"Absensi_{slug}_{year}-{month:02d}.xlsx"
+
+
+def nama_file_unik(nama, month, year, dipakai):
+    """
+    nama_file_laporan yang belum ada di dipakai (set nama file huruf kecil).
+    Nama ganda (mis. beda tanda baca saja) diberi akhiran _2, _3, ...;
+    nama yang dipilih dicatat ke dipakai.
+    """
+    fname = nama_file_laporan(nama, month, year)
+    base, ext = os.path.splitext(fname)
+    nomor = 2
+    while fname.lower() in dipakai:
+        fname = f"{base}_{nomor}{ext}"
+        nomor += 1
+    dipakai.add(fname.lower())
+    return fname
+
+
+def render_laporan(job):
+    """
+    Render satu laporan karyawan ke file (fungsi worker ProcessPoolExecutor).
+
+    job: dict dengan key nama, bulan, tahun, data, output_path dan opsional
+    template_path, logo_path, backend. Error tidak dilempar, tetapi dilaporkan di hasil.
+    """
+    hasil = {
+        'nama': job['nama'],
+        'bulan': job['bulan'],
+        'tahun': job['tahun'],
+        'output_path': job['output_path'],
+        'ok': False,
+        'error': None,
+    }
+    try:
+        if job.get('backend', 'openpyxl') == 'zip':
+            simpan_laporan_zip(
+                job['nama'], job['bulan'], job['tahun'], job['data'], job['output_path'],
+                template_path=job.get('template_path', TEMPLATE_PATH),
+            )
+        else:
+            wb = siapkan_workbook(
+                job['nama'], job['bulan'], job['tahun'], job['data'],
+                template_path=job.get('template_path', TEMPLATE_PATH),
+                logo_path=job.get('logo_path', LOGO_PATH),
+            )
+            tulis_atomik(job['output_path'], wb.save)
+        hasil['ok'] = True
+    except Exception as e:
+        hasil['error'] = f"{type(e).__name__}: {e}"
+    return hasil
+
+
+def _hasil_gagal(job, error):
+    return {
+        'nama': job['nama'],
+        'bulan': job['bulan'],
+        'tahun': job['tahun'],
+        'output_path': job['output_path'],
+        'ok': False,
+        'error': error,
+    }
+
+
+def render_banyak(laporan, output_dir, max_workers=None, template_path=TEMPLATE_PATH,
+                  logo_path=LOGO_PATH, progress=None, backend='openpyxl', batal=None):
+    """
+    Render banyak laporan secara paralel dengan ProcessPoolExecutor.
+
+    laporan    : dict {(nama, bulan, tahun): processed_data}
+    max_workers: jumlah proses (default: jumlah core; 1 = tanpa process pool)
+    progress   : callback opsional progress(selesai, total, hasil)
+    backend    : 'openpyxl' atau 'zip' (lihat xlsx_patcher)
+    batal      : threading.Event opsional; jika di-set, laporan yang belum
+                 mulai dirender dilewati dengan error DIBATALKAN
+
+    Return list hasil per laporan (urutan sama dengan input).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend tidak dikenal: {backend} (pilihan: {', '.join(BACKENDS)})")
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    jobs = []
+    dipakai = set()
+    for (nama, month, year), data in laporan.items():
+        fname = nama_file_unik(nama, month, year, dipakai)
+        jobs.append({
+            'nama': nama,
+            'bulan': month,
+            'tahun': year,
+            'data': data,
+            'output_path': os.path.join(output_dir, fname),
+            'template_path': template_path,
+            'logo_path': logo_path,
+            'backend': backend,
+        })
+
+    hasil = [None] * len(jobs)
+
+    if max_workers == 1 or len(jobs) <= 1:
+        for idx, job in enumerate(jobs):
+            if batal is not None and batal.is_set():
+                hasil[idx] = _hasil_gagal(job, DIBATALKAN)
+            else:
+                hasil[idx] = render_laporan(job)
+            if progress:
+                progress(idx + 1, len(jobs), hasil[idx])
+        return hasil
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(render_laporan, job): idx for idx, job in enumerate(jobs)}
+        for selesai, future in enumerate(as_completed(futures), 1):
+            if batal is not None and batal.is_set():
+                # Job yang belum berjalan dibatalkan; yang sedang berjalan tetap ditunggu
+                for f in futures:
+                    f.cancel()
+            idx = futures[future]
+            if future.cancelled():
+                hasil[idx] = _hasil_gagal(jobs[idx], DIBATALKAN)
+            else:
+                try:
+                    hasil[idx] = future.result()
+                except Exception as e:
+                    # Worker mati (mis. BrokenProcessPool) — tetap laporkan per job
+                    hasil[idx] = _hasil_gagal(jobs[idx], f"{type(e).__name__}: {e}")
+            if progress:
+                progress(selesai, len(jobs), hasil[idx])
+
+    return hasil
@@ -0,0 +1,217 @@
+"""
+Export Merge
+Penggabungan beberapa export absensi yang tumpang tindih (export parsial
+tengah bulan, export ulang, file multi-site) menjadi satu AttendanceStore
+berkunci (karyawan, tanggal).
+
+- Identitas karyawan antar file dicocokkan dengan hash join (pd.factorize):
+  NIK jika ada; baris tanpa NIK memakai NIK dari file lain dengan nama
+  (ternormalisasi) yang sama, atau namanya sendiri jika tidak ada.
+- Seluruh sel berisi dari semua file dijadikan bentuk panjang lalu diurutkan
+  sekali (np.lexsort) menurut kunci (karyawan, tanggal) + prioritas
+  kebijakan; versi terpilih adalah elemen pertama tiap grup (sort-merge),
+  tanpa loop Python per sel.
+- Sel kosong tidak pernah menimpa sel berisi. Konflik = satu (karyawan,
+  tanggal) punya lebih dari satu versi berisi dengan nilai berbeda.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from file_uji_coba.attendance_store import (
+    FLAG_TEKS, STATUS_KOSONG, STATUS_LENGKAP, tabel_jam, store_dari_sel
+)
+from file_uji_coba.employee_index import normalisasi_nama
+
+
+# Kebijakan penyelesaian konflik
+KEBIJAKAN_TERBARU = 'terbaru'                  # file terakhir dalam urutan input menang
+KEBIJAKAN_MASUK_TERAWAL = 'masuk_terawal'      # versi dengan jam masuk paling awal
+KEBIJAKAN_PULANG_TERAKHIR = 'pulang_terakhir'  # versi dengan jam pulang paling akhir
+DAFTAR_KEBIJAKAN = (KEBIJAKAN_TERBARU, KEBIJAKAN_MASUK_TERAWAL, KEBIJAKAN_PULANG_TERAKHIR)
+
+KOLOM_KONFLIK = ['nama', 'nik', 'tanggal', 'versi', 'file_dipakai', 'nilai_dipakai', 'versi_lain']
+
+# Prioritas sel tanpa jam valid pada kebijakan berbasis jam (kalah dari jam mana pun)
+_TANPA_JAM = np.int64(1 << 40)
+
+# Selisih date.toordinal() ke epoch 1970-01-01
+_ORDINAL_EPOCH = 719163
+
+# Geser ordinal tanggal di kunci gabungan (karyawan << _BIT_TANGGAL | tanggal)
+_BIT_TANGGAL = 22
+
+
+def _identitas(stores):
+    """
+    Kode karyawan gabungan per baris tiap store. Return (list array kode per
+    store — -1 untuk baris tanpa nama, nama & nik tampilan per kode dari file
+    terakhir yang memuatnya).
+    """
+    bagian = []
+    for i, store in enumerate(stores):
+        n = len(store)
+        nama = pd.Series(store.nama if store.nama is not None else [np.nan] * n, dtype=object)
+        nik = pd.Series(store.nik if store.nik is not None else [np.nan] * n, dtype=object)
+        bagian.append(pd.DataFrame({
+            'file': i, 'baris': np.arange(n), 'nama': nama,
+            'nik': nik.where(nik.notna(), '').astype(str).str.strip(),
+        }))
+    data = pd.concat(bagian, ignore_index=True)
+    data = data[data['nama'].notna()].copy()
+    data['kunci_nama'] = data['nama'].map(normalisasi_nama)
+
+    # Nama → NIK, hanya jika nama itu punya tepat satu NIK di seluruh file
+    ber_nik = data[data['nik'] != ''].drop_duplicates(['kunci_nama', 'nik'])
+    tunggal = ber_nik[~ber_nik['kunci_nama'].duplicated(keep=False)]
+    peta_nik = pd.Series(tunggal['nik'].to_numpy(), index=tunggal['kunci_nama'].to_numpy())
+    nik = data['nik'].where(data['nik'] != '', data['kunci_nama'].map(peta_nik)).fillna('')
+    kunci = np.where(nik != '', 'nik:' + nik, 'nama:' + data['kunci_nama'])
+    data['kode'], _ = pd.factorize(kunci)
+
+    # Nama/NIK tampilan: kemunculan pada file terakhir (NIK kosong diisi NIK terpetakan)
+    data['nik_tampil'] = nik.to_numpy()
+    akhir = data.sort_values(['file', 'baris'], ascending=[False, True], kind='stable')
+    akhir = akhir.drop_duplicates('kode').sort_values('kode')
+    nama_tampil = akhir['nama'].to_numpy(dtype=object)
+    nik_tampil = akhir['nik_tampil'].where(akhir['nik_tampil'] != '', np.nan).to_numpy(dtype=object)
+
+    kode = []
+    for i, store in enumerate(stores):
+        per_baris = np.full(len(store), -1, dtype=np.int64)
+        milik = data[data['file'] == i]
+        per_baris[milik['baris'].to_numpy()] = milik['kode'].to_numpy()
+        kode.append(per_baris)
+    return kode, nama_tampil, nik_tampil
+
+
+def _prioritas(kebijakan, masuk, pulang, file):
+    """Nilai urut (kecil = dipakai) per sel untuk kebijakan"""
+    if kebijakan == KEBIJAKAN_MASUK_TERAWAL:
+        return np.where(masuk >= 0, masuk, _TANPA_JAM)
+    if kebijakan == KEBIJAKAN_PULANG_TERAKHIR:
+        return np.where(pulang >= 0, -pulang, _TANPA_JAM)
+    return -file
+
+
+def _teks_nilai(status, masuk, pulang, teks):
+    """Teks sel seperti di laporan ('HH:MM:SS - HH:MM:SS', satu jam, atau teks asli)"""
+    tabel = tabel_jam()
+    hasil = tabel[np.maximum(masuk, 0)].astype(object)
+    lengkap = (status & ~FLAG_TEKS) == STATUS_LENGKAP
+    hasil[lengkap] = hasil[lengkap] + ' - ' + tabel[np.maximum(pulang[lengkap], 0)]
+    for i, (m, p) in teks.items():
+        hasil[i] = m if p is None else f"{m} - {p}"
+    return hasil
+
+
+def _teks_anggota(teks, anggota):
+    """{posisi di anggota: teks asli} untuk sel tidak baku di antara anggota"""
+    if not teks:
+        return {}
+    kunci = np.fromiter(teks, dtype=np.int64, count=len(teks))
+    posisi = np.flatnonzero(np.isin(anggota, kunci))
+    return {int(j): teks[int(anggota[j])] for j in posisi}
+
+
+def gabung_store(stores, sumber, kebijakan=KEBIJAKAN_TERBARU):
+    """
+    Gabungkan beberapa AttendanceStore (urutan = urutan export, terlama dulu).
+    sumber: nama/path file per store (untuk laporan konflik).
+
+    Return (store_gabungan, konflik) dengan konflik DataFrame KOLOM_KONFLIK,
+    satu baris per (karyawan, tanggal) yang versinya berbeda.
+    """
+    if kebijakan not in DAFTAR_KEBIJAKAN:
+        raise ValueError(f"Kebijakan tidak dikenal: '{kebijakan}' "
+                         f"(pilih: {', '.join(DAFTAR_KEBIJAKAN)})")
+    kode_baris, nama, nik = _identitas(stores)
+
+    # Bentuk panjang seluruh sel berisi dari baris bernama
+    kolom = {k: [] for k in ('kode', 'tanggal', 'status', 'masuk', 'pulang', 'file', 'baris', 'grid')}
+    semua_tanggal = []
+    for i, store in enumerate(stores):
+        semua_tanggal.append(store.tanggal)
+        baris, grid = np.nonzero((store.status != STATUS_KOSONG) & (kode_baris[i] >= 0)[:, None])
+        kolom['kode'].append(kode_baris[i][baris])
+        kolom['tanggal'].append(store.tanggal[grid].astype(np.int64))
+        kolom['status'].append(store.status[baris, grid])
+        kolom['masuk'].append(store.masuk[baris, grid].astype(np.int64))
+        kolom['pulang'].append(store.pulang[baris, grid].astype(np.int64))
+        kolom['file'].append(np.full(len(baris), i, dtype=np.int64))
+        kolom['baris'].append(baris)
+        kolom['grid'].append(grid)
+    sel = {k: np.concatenate(v) if v else np.zeros(0, dtype=np.int64) for k, v in kolom.items()}
+
+    # Teks asli sel tidak baku (dibutuhkan untuk versi terpilih & perbandingan konflik)
+    teks = {}
+    for i in np.flatnonzero((sel['status'] & FLAG_TEKS) != 0):
+        teks[int(i)] = stores[sel['file'][i]].teks_lain[(int(sel['baris'][i]), int(sel['grid'][i]))]
+
+    # Sort-merge: kunci, prioritas kebijakan, file terbaru, baris pertama dalam file
+    kunci = sel['kode'] << _BIT_TANGGAL | sel['tanggal']
+    prioritas = _prioritas(kebijakan, sel['masuk'], sel['pulang'], sel['file'])
+    urutan = np.lexsort((sel['baris'], -sel['file'], prioritas, kunci))
+    kunci = kunci[urutan]
+    awal_grup = np.r_[True, kunci[1:] != kunci[:-1]] if len(kunci) else np.zeros(0, dtype=bool)
+    indeks_awal = np.flatnonzero(awal_grup)
+    dipakai = urutan[awal_grup]
+
+    # Versi berbeda dari versi terpilih di grupnya = konflik
+    kode_teks = np.zeros(len(urutan), dtype=np.int64)
+    if teks:
+        posisi = np.fromiter(teks, dtype=np.int64, count=len(teks))
+        kode_teks[posisi] = pd.factorize(
+            np.array([f"{m}\x1f{p}" for m, p in (teks[int(i)] for i in posisi)], dtype=object))[0] + 1
+    nilai = np.stack([sel['status'].astype(np.int64), sel['masuk'], sel['pulang'], kode_teks])
+    nilai = nilai[:, urutan]
+    pertama = np.repeat(indeks_awal, np.diff(np.r_[indeks_awal, len(urutan)]))
+    beda = (nilai != nilai[:, pertama]).any(axis=0)
+    grup_konflik = np.unique(np.cumsum(awal_grup)[beda] - 1)
+
+    store = store_dari_sel(
+        nama, nik, sel['kode'][dipakai], sel['tanggal'][dipakai], sel['status'][dipakai],
+        sel['masuk'][dipakai], sel['pulang'][dipakai],
+        _teks_anggota(teks, dipakai),
+        semua_tanggal=np.concatenate(semua_tanggal) if semua_tanggal else None)
+    return store, _laporan_konflik(sel, teks, urutan, awal_grup, grup_konflik, nama, nik, sumber)
+
+
+def _laporan_konflik(sel, teks, urutan, awal_grup, grup_konflik, nama, nik, sumber):
+    """DataFrame konflik (satu baris per grup kunci yang versinya berbeda)"""
+    if len(grup_konflik) == 0:
+        return pd.DataFrame(columns=KOLOM_KONFLIK)
+
+    # Anggota grup konflik dalam urutan hasil sort (versi terpilih di awal grup)
+    grup = np.cumsum(awal_grup) - 1
+    pilih = np.isin(grup, grup_konflik)
+    anggota = urutan[pilih]
+    awal = awal_grup[pilih]
+
+    nilai = _teks_nilai(sel['status'][anggota], sel['masuk'][anggota], sel['pulang'][anggota],
+                        _teks_anggota(teks, anggota))
+    label = np.array([os.path.basename(str(s)) for s in sumber], dtype=object)[sel['file'][anggota]]
+
+    # Versi lain digabung per peringkat dalam grup (grup bersebelahan setelah sort)
+    posisi_awal = np.flatnonzero(awal)
+    versi = np.diff(np.r_[posisi_awal, len(anggota)])
+    versi_teks = label + ': ' + nilai
+    versi_lain = versi_teks[posisi_awal + 1]
+    for r in range(2, int(versi.max())):
+        ada = versi > r
+        versi_lain[ada] = versi_lain[ada] + '; ' + versi_teks[posisi_awal[ada] + r]
+
+    pertama = anggota[awal]
+    hari = (sel['tanggal'][pertama] - _ORDINAL_EPOCH).astype('datetime64[D]')
+    kode = sel['kode'][pertama]
+    return pd.DataFrame({
+        'nama': nama[kode],
+        'nik': nik[kode],
+        'tanggal': np.datetime_as_string(hari, unit='D'),
+        'versi': versi,
+        'file_dipakai': label[awal],
+        'nilai_dipakai': nilai[awal],
+        'versi_lain': versi_lain,
+    }, columns=KOLOM_KONFLIK)
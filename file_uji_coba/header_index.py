@@ -0,0 +1,115 @@
+"""
+Header Index
+Parse header kolom tanggal sekali saat file dimuat: peta header → tanggal
+(immutable), indeks periode (tahun, bulan) → posisi kolom, dan daftar header
+yang tidak terbaca. Daftar periode, proyeksi kolom dan metadata kalender
+cukup melakukan lookup tanpa strptime ulang.
+"""
+
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+
+def parse_header_tanggal(columns, formats, abaikan):
+    """Parse seluruh header kolom sekaligus menjadi Series datetime (NaT jika bukan tanggal)"""
+    headers = pd.Index(columns, dtype=object).astype(str)
+    tanggal = pd.Series(pd.NaT, index=range(len(headers)), dtype='datetime64[ns]')
+    lewati = headers.isin(abaikan)
+
+    for fmt in formats:
+        sisa = tanggal.isna().to_numpy() & ~lewati
+        if not sisa.any():
+            break
+        tanggal[sisa] = pd.to_datetime(headers[sisa], format=fmt, errors='coerce')
+
+    return tanggal
+
+
+def _hanya_baca(values):
+    values = np.asarray(values)
+    values.setflags(write=False)
+    return values
+
+
+class HeaderIndex:
+    """
+    Hasil parse header satu file (tidak berubah setelah dibuat).
+
+    - columns      : tuple header (lowercase) sesuai urutan file
+    - tanggal      : array datetime64 per kolom (NaT jika bukan tanggal), read-only
+    - peta         : {header: Timestamp} untuk header tanggal
+    - periode      : {(tahun, bulan): posisi kolom (urutan file)}, terurut
+    - tidak_terbaca: header selain kolom abaikan yang bukan tanggal
+    """
+
+    def __init__(self, columns, formats, abaikan):
+        self.formats = tuple(formats)
+        self.abaikan = tuple(abaikan)
+        self.columns = tuple(str(c).strip().lower() for c in columns)
+
+        tanggal = parse_header_tanggal(self.columns, self.formats, self.abaikan)
+        valid = tanggal.notna().to_numpy()
+        self.tanggal = _hanya_baca(tanggal.to_numpy())
+
+        self.peta = MappingProxyType({
+            kolom: tgl for kolom, tgl, ada in zip(self.columns, tanggal, valid) if ada
+        })
+
+        posisi = np.flatnonzero(valid)
+        kunci = pd.DataFrame({
+            'tahun': tanggal.dt.year.to_numpy()[posisi],
+            'bulan': tanggal.dt.month.to_numpy()[posisi],
+        })
+        self.periode = MappingProxyType({
+            (int(tahun), int(bulan)): _hanya_baca(posisi[idx])
+            for (tahun, bulan), idx in sorted(kunci.groupby(['tahun', 'bulan']).indices.items())
+        })
+        self._semua = _hanya_baca(posisi)
+
+        self.tidak_terbaca = tuple(
+            kolom for kolom, ada in zip(self.columns, valid)
+            if not ada and kolom not in self.abaikan
+        )
+
+    def __len__(self):
+        return len(self.columns)
+
+    @property
+    def daftar_periode(self):
+        """Tuple (tahun, bulan) yang tersedia, terurut"""
+        return tuple(self.periode)
+
+    def posisi(self, month=None, year=None):
+        """Posisi kolom tanggal yang masuk periode (bulan/tahun opsional), urutan file"""
+        if month and year:
+            return self.periode.get((year, month), self._semua[:0])
+        if not month and not year:
+            return self._semua
+
+        bagian = [
+            posisi for (tahun, bulan), posisi in self.periode.items()
+            if (not year or tahun == year) and (not month or bulan == month)
+        ]
+        return np.sort(np.concatenate(bagian)) if bagian else self._semua[:0]
+
+    def cocok(self, columns):
+        """True jika columns (setelah dirapikan) sama dengan header yang diindeks"""
+        return tuple(str(c).strip().lower() for c in columns) == self.columns
+
+    def tanggal_kolom(self, columns):
+        """
+        Series datetime untuk daftar header (bisa subset hasil proyeksi) lewat
+        lookup peta; header yang tidak dikenal indeks ini di-parse langsung.
+        """
+        columns = [str(c) for c in columns]
+        tanggal = pd.Series(
+            [self.peta.get(kolom, pd.NaT) for kolom in columns], dtype='datetime64[ns]')
+
+        dikenal = set(self.columns)
+        asing = [i for i, kolom in enumerate(columns) if kolom not in dikenal]
+        if asing:
+            tanggal.iloc[asing] = parse_header_tanggal(
+                [columns[i] for i in asing], self.formats, self.abaikan).to_numpy()
+        return tanggal
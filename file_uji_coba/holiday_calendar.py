@@ -0,0 +1,178 @@
+"""
+Holiday Calendar
+Kalender hari libur multi-tahun dari file data lokal (hari_libur.csv): libur
+nasional, cuti bersama dan libur daerah (mis. Bali, opt-in). Data dikompilasi
+menjadi array berkunci hari (hari sejak epoch) sehingga cek libur dan nama
+libur untuk seluruh array tanggal cukup satu operasi indexing NumPy.
+
+Tabel dimensi kalender per tahun (nama hari, akhir pekan, libur, indeks hari
+kerja) dibuat sekali per tahun dan dipakai bersama semua processor; metadata
+hari untuk banyak tanggal diambil dengan satu gather array, tanpa strftime
+yang bergantung locale.
+"""
+
+import hashlib
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+
+DATA_LIBUR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hari_libur.csv')
+
+JENIS_NASIONAL = 'nasional'
+JENIS_CUTI_BERSAMA = 'cuti_bersama'
+JENIS_DAERAH = 'daerah'
+
+# Nama hari berdasarkan dayofweek (0 = Senin)
+NAMA_HARI = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
+
+# 1970-01-01 (hari ke-0 epoch) adalah Kamis
+_HARI_EPOCH = 3
+
+
+def baca_data_libur(path=DATA_LIBUR):
+    """Baca file data libur (tanggal;nama;jenis;wilayah) menjadi DataFrame"""
+    data = pd.read_csv(path, sep=';', dtype=str, keep_default_na=False)
+    data['tanggal'] = pd.to_datetime(data['tanggal'], format='%Y-%m-%d')
+    data['wilayah'] = data['wilayah'].str.strip().str.lower()
+    return data
+
+
+def _hari(tanggal):
+    """Array hari sejak epoch (int64) + mask tanggal valid dari datetime apa pun"""
+    values = pd.to_datetime(pd.Series(tanggal)).to_numpy(dtype='datetime64[ns]')
+    valid = ~np.isnat(values)
+    return values.astype('datetime64[D]').astype(np.int64), valid
+
+
+class KalenderLibur:
+    """
+    Hari libur terkompilasi: kode[hari - awal] = indeks nama libur + 1 (0 = bukan libur).
+
+    wilayah     : libur daerah yang ikut dihitung (mis. ('bali',)); default nasional saja
+    cuti_bersama: ikutkan cuti bersama (default True)
+    Jika satu tanggal punya beberapa libur, libur nasional didahulukan.
+    """
+
+    def __init__(self, data=None, wilayah=(), cuti_bersama=True):
+        data = baca_data_libur() if data is None else data
+        self.wilayah = tuple(w.lower() for w in wilayah)
+
+        pakai = data['wilayah'].eq('') | data['wilayah'].isin(self.wilayah)
+        if not cuti_bersama:
+            pakai = pakai & (data['jenis'] != JENIS_CUTI_BERSAMA)
+        prioritas = data['jenis'].map({JENIS_NASIONAL: 0, JENIS_CUTI_BERSAMA: 1}).fillna(2)
+        data = data[pakai].assign(prioritas=prioritas[pakai])
+        data = data.sort_values(['tanggal', 'prioritas'], kind='stable')
+        data = data.drop_duplicates('tanggal')
+
+        hari, _ = _hari(data['tanggal'])
+        self.nama = np.array([np.nan] + data['nama'].tolist(), dtype=object)
+        self.tahun = tuple(sorted(data['tanggal'].dt.year.unique().tolist()))
+        if len(hari):
+            self._awal = int(hari.min())
+            self._kode = np.zeros(int(hari.max()) - self._awal + 1, dtype=np.int32)
+            self._kode[hari - self._awal] = np.arange(1, len(hari) + 1, dtype=np.int32)
+        else:
+            self._awal = 0
+            self._kode = np.zeros(0, dtype=np.int32)
+
+        self._tabel_tahun = {}
+
+    def _kode_tanggal(self, tanggal):
+        hari, valid = _hari(tanggal)
+        posisi = hari - self._awal
+        dalam = valid & (posisi >= 0) & (posisi < len(self._kode))
+        kode = np.zeros(len(hari), dtype=np.int32)
+        kode[dalam] = self._kode[posisi[dalam]]
+        return kode
+
+    def is_holiday(self, tanggal):
+        """Array bool: tanggal adalah hari libur (NaT = False)"""
+        return self._kode_tanggal(tanggal) > 0
+
+    def nama_libur(self, tanggal):
+        """Array object nama libur per tanggal (NaN jika bukan libur / NaT)"""
+        return self.nama[self._kode_tanggal(tanggal)]
+
+    def cek(self, date_obj):
+        """Versi satu tanggal: (True, nama) jika libur, (False, None) jika bukan"""
+        nama = self.nama_libur([date_obj])[0]
+        return (False, None) if pd.isna(nama) else (True, nama)
+
+    def tabel_tahun(self, tahun):
+        """
+        Tabel dimensi kalender satu tahun (dict array per hari, dibuat sekali):
+        Tanggal ('%Y-%m-%d'), Hari, akhir_pekan, is_libur, libur (nama / NaN),
+        hari_kerja (urutan hari kerja dalam tahun mulai 0, -1 jika bukan hari kerja).
+        """
+        tabel = self._tabel_tahun.get(tahun)
+        if tabel is None:
+            awal = np.datetime64(f'{tahun:04d}-01-01', 'D')
+            tanggal = np.arange(awal, np.datetime64(f'{tahun + 1:04d}-01-01', 'D'))
+            hari = tanggal.astype(np.int64)
+            kode = self._kode_tanggal(tanggal)
+            akhir_pekan = (hari + _HARI_EPOCH) % 7 >= 5
+            kerja = ~akhir_pekan & (kode == 0)
+            tabel = {
+                'Tanggal': np.array(np.datetime_as_string(tanggal, unit='D'), dtype=object),
+                'Hari': np.array(NAMA_HARI, dtype=object)[(hari + _HARI_EPOCH) % 7],
+                'akhir_pekan': akhir_pekan,
+                'is_libur': kode > 0,
+                'libur': self.nama[kode],
+                'hari_kerja': np.where(kerja, np.cumsum(kerja) - 1, -1).astype(np.int16),
+            }
+            self._tabel_tahun[tahun] = tabel
+        return tabel
+
+    def dimensi(self, tanggal):
+        """
+        Metadata hari untuk seluruh tanggal sekaligus (DataFrame sejajar input,
+        kolom sama dengan tabel_tahun; baris NaT berisi NaN/False/-1).
+        """
+        hari, valid = _hari(tanggal)
+        tahun = np.where(valid, hari, 0).astype('datetime64[D]').astype('datetime64[Y]')
+        tahun = tahun.astype(np.int64) + 1970
+        ada = np.unique(tahun[valid])
+
+        kolom = ['Tanggal', 'Hari', 'akhir_pekan', 'is_libur', 'libur', 'hari_kerja']
+        kosong = {'Tanggal': np.nan, 'Hari': np.nan, 'akhir_pekan': False,
+                  'is_libur': False, 'libur': np.nan, 'hari_kerja': -1}
+
+        # Gabungkan tabel tahun min..maks lalu gather dengan offset hari
+        tahun_awal, tahun_akhir = (int(ada.min()), int(ada.max())) if len(ada) else (1970, 1970)
+        tabel = [self.tabel_tahun(t) for t in range(tahun_awal, tahun_akhir + 1)]
+        awal = np.datetime64(f'{tahun_awal:04d}-01-01', 'D').astype(np.int64)
+        posisi = np.where(valid, hari - awal, 0)
+
+        hasil = {}
+        for k in kolom:
+            gabungan = np.concatenate([t[k] for t in tabel])
+            nilai = gabungan[posisi]
+            nilai[~valid] = kosong[k]
+            hasil[k] = nilai
+        return pd.DataFrame(hasil)
+
+    def sidik(self):
+        """Hash isi kalender terkompilasi (berubah jika data libur / wilayah berubah)"""
+        h = hashlib.blake2b(digest_size=8)
+        h.update(str(self._awal).encode())
+        h.update(self._kode.tobytes())
+        h.update('\x1f'.join(str(n) for n in self.nama).encode('utf-8'))
+        return h.hexdigest()
+
+    def ke_dict(self):
+        """Bentuk lama {'YYYY': {'MM-DD': nama}} (untuk kompatibilitas)"""
+        hasil = {}
+        for posisi in np.flatnonzero(self._kode):
+            tgl = np.datetime64(self._awal + int(posisi), 'D').astype(object)
+            hasil.setdefault(str(tgl.year), {})[tgl.strftime('%m-%d')] = self.nama[self._kode[posisi]]
+        return hasil
+
+
+@lru_cache(maxsize=None)
+def muat_kalender_libur(wilayah=(), cuti_bersama=True, path=DATA_LIBUR):
+    """KalenderLibur dari file data (dibaca & dikompilasi sekali per konfigurasi)"""
+    return KalenderLibur(baca_data_libur(path), tuple(wilayah), cuti_bersama)
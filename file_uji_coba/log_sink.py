@@ -0,0 +1,82 @@
+"""
+Log Sink
+Penampung log untuk panel ScrolledText GUI: pesan dimasukkan ke queue
+thread-safe (boleh dari thread worker) lalu ditulis ke widget per batch oleh
+timer root.after — satu insert Tk per batch, tanpa update_idletasks per
+pesan. Jumlah baris dibatasi (ring buffer) sehingga widget tidak membesar
+tanpa batas pada sesi batch panjang.
+"""
+
+import queue
+from collections import deque
+from datetime import datetime
+
+
+# Interval flush log ke widget (ms)
+INTERVAL_MS = 100
+
+# Jumlah baris log maksimum yang disimpan & ditampilkan
+MAKS_BARIS = 2000
+
+TAG_WAKTU = 'info'
+
+
+class LogSink:
+    """
+    Log batch untuk widget Text.
+
+    tulis() hanya memasukkan (waktu, pesan, tag) ke queue; flush() (thread
+    utama) menulis semua pesan tertunda sekaligus, membuang baris terlama di
+    atas maks_baris dan menggulir ke bawah sekali per batch. riwayat berisi
+    baris teks terakhir (deque maxlen=maks_baris).
+    """
+
+    def __init__(self, root, widget, maks_baris=MAKS_BARIS, interval=INTERVAL_MS):
+        self.root = root
+        self.widget = widget
+        self.maks_baris = maks_baris
+        self.interval = interval
+        self.riwayat = deque(maxlen=maks_baris)
+        self._antrian = queue.SimpleQueue()
+        self._after_id = None
+
+    def mulai(self):
+        """Mulai timer flush (panggil dari thread utama)"""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval, self._berkala)
+
+    def _berkala(self):
+        self.flush()
+        self._after_id = self.root.after(self.interval, self._berkala)
+
+    def tulis(self, message, tag='info'):
+        """Antrekan satu pesan (aman dipanggil dari thread mana pun)"""
+        self._antrian.put((datetime.now().strftime('%H:%M:%S'), str(message), tag))
+
+    def flush(self):
+        """Tulis seluruh pesan tertunda ke widget dalam satu batch (thread utama)"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._antrian.get_nowait())
+            except queue.Empty:
+                break
+        if not batch:
+            return 0
+
+        # Pesan yang toh akan langsung terbuang tidak perlu ditulis ke widget
+        tampil = batch[-self.maks_baris:]
+        potongan = []
+        for waktu, message, tag in tampil:
+            potongan.extend((f"[{waktu}] ", TAG_WAKTU, f"{message}\n", tag))
+        self.riwayat.extend(f"[{waktu}] {message}" for waktu, message, _ in batch)
+
+        self.widget.configure(state='normal')
+        self.widget.insert('end', *potongan)
+        # Baris terakhir widget selalu kosong (setelah '\n' pesan terakhir)
+        jumlah = int(self.widget.index('end-1c').split('.')[0]) - 1
+        if jumlah > self.maks_baris:
+            self.widget.delete('1.0', f"{jumlah - self.maks_baris + 1}.0")
+        self.widget.see('end')
+        self.widget.configure(state='disabled')
+        return len(batch)
@@ -0,0 +1,105 @@
+"""
+Report Manifest
+Catatan hash data sumber tiap laporan, disimpan di samping file output
+(<folder output>/.manifest_absensi.json). Proses ulang membandingkan hash
+baru dengan catatan ini sehingga hanya laporan yang datanya berubah yang
+ditulis ulang; sisanya dilewati.
+
+Isi per laporan (kunci = nama file laporan):
+    hash           hash sel (karyawan, bulan) — lihat AttendanceProcessor.hash_sumber
+    hash_karyawan  hash seluruh baris karyawan pada periode yang dimuat saat itu
+    konfigurasi    sidik konfigurasi processor (kalender libur, shift malam, ...)
+    input, waktu   file sumber & waktu laporan ditulis
+"""
+
+import json
+import os
+from datetime import datetime
+
+from file_uji_coba.data_cache import tulis_atomik
+
+
+NAMA_FILE = '.manifest_absensi.json'
+
+# Naikkan jika format laporan berubah: seluruh laporan lama ditulis ulang
+VERSI = 1
+
+
+class ManifestLaporan:
+    """Manifest satu folder output"""
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.path = os.path.join(folder, NAMA_FILE)
+        self.laporan = self._baca()
+        self._ubah = {}     # fname → entri baru (None = hapus)
+
+    def _baca(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('versi') != VERSI:
+            return {}
+        return data.get('laporan', {})
+
+    def alasan_tulis(self, job):
+        """
+        Alasan laporan `job` perlu ditulis ulang, atau None jika file output
+        masih sesuai data sumber (boleh dilewati).
+        """
+        fname = os.path.basename(job['output'])
+        lama = self.laporan.get(fname)
+        if lama is None:
+            return "belum tercatat di manifest"
+        if not os.path.exists(job['output']):
+            return "file output tidak ada"
+        if lama.get('konfigurasi') != job['konfigurasi']:
+            return "konfigurasi berubah"
+        if lama.get('input') != os.path.abspath(job['input']):
+            return "file input berbeda"
+        # Baris karyawan identik → semua bulannya identik; cek per bulan jika tidak
+        if lama.get('hash_karyawan') == job['hash_karyawan']:
+            return None
+        if lama.get('hash') != job['hash']:
+            return "data sumber berubah"
+        return None
+
+    def catat(self, hasil):
+        """Catat laporan yang baru ditulis (hasil simpan_laporan)"""
+        fname = os.path.basename(hasil['output'])
+        if not hasil['ok']:
+            # Gagal ditulis: file lama mungkin tidak sesuai lagi, paksa tulis ulang
+            self._ubah[fname] = None
+            return
+        self._ubah[fname] = {
+            'hash': hasil['hash'],
+            'hash_karyawan': hasil['hash_karyawan'],
+            'konfigurasi': hasil['konfigurasi'],
+            'input': os.path.abspath(hasil['input']),
+            'nama': hasil['nama'],
+            'waktu': datetime.now().isoformat(timespec='seconds'),
+        }
+
+    def simpan(self):
+        """
+        Tulis perubahan secara atomik. Manifest dibaca ulang tepat sebelum
+        ditulis lalu hanya entri yang diubah proses ini yang diganti, sehingga
+        catatan proses lain (mis. worker pantau folder) tidak tertimpa.
+        """
+        if not self._ubah:
+            return
+        laporan = self._baca()
+        for fname, entri in self._ubah.items():
+            if entri is None:
+                laporan.pop(fname, None)
+            else:
+                laporan[fname] = entri
+
+        os.makedirs(self.folder or '.', exist_ok=True)
+        data = json.dumps({'versi': VERSI, 'laporan': laporan},
+                          ensure_ascii=False, indent=1).encode('utf-8')
+        tulis_atomik(self.path, lambda f: f.write(data))
+        self.laporan = laporan
+        self._ubah = {}
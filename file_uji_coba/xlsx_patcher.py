@@ -0,0 +1,429 @@
+"""
+XLSX Patcher
+Backend render cepat untuk laporan massal: template .xlsx dibuka sebagai zip,
+hanya XML worksheet aktif yang ditulis ulang untuk sel yang diisi, bagian lain
+(drawing, logo, theme, sharedStrings) disalin apa adanya ke zip baru.
+
+Perubahan format (font, fill, format angka) disiapkan sekali per template
+lewat siapkan_gaya: styles.xml diberi xf turunan dari style sel asal, lalu
+setiap laporan cukup menunjuk indeks xf tersebut. Nilai teks (termasuk rich
+text) ditulis sebagai inline string sehingga sharedStrings.xml tidak diubah.
+"""
+
+import io
+import re
+import zipfile
+import posixpath
+from datetime import datetime, date
+from xml.sax.saxutils import escape, unescape
+
+from file_uji_coba.data_cache import tulis_atomik
+
+
+# Karakter kontrol yang tidak sah di XML 1.0
+_ILLEGAL_XML = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_RE_SHEET_DATA = re.compile(r'<sheetData\s*/>|<sheetData>(.*?)</sheetData>', re.S)
+_RE_ROW = re.compile(r'<row\b([^>]*?)(?:/>|>(.*?)</row>)', re.S)
+_RE_CELL = re.compile(r'<c(?=[\s/>])([^>]*?)(?:/>|>(.*?)</c>)', re.S)
+_RE_ATTR_R = re.compile(r'\br="([A-Z]*)(\d+)"')
+_RE_ATTR_S = re.compile(r'\bs="(\d+)"')
+_RE_SPANS = re.compile(r'\s+spans="[^"]*"')
+
+# Format angka bawaan Excel (tidak perlu entri numFmt di styles.xml)
+_NUMFMT_BAWAAN = {'General': 0, '0': 1, '0.00': 2, '#,##0': 3, '#,##0.00': 4,
+                  'mmm-yy': 17, 'h:mm': 20, 'h:mm:ss': 21, '@': 49}
+
+# Nilai sel khusus: pertahankan isi sel template, hanya style yang diganti
+TETAP = object()
+
+
+class TeksKaya(tuple):
+    """Nilai rich text: tuple (xml rPr, teks) per run, ditulis sebagai inline string"""
+
+
+def kolom_ke_angka(huruf):
+    """Konversi huruf kolom Excel ('A', 'AB') ke nomor kolom (1-based)"""
+    angka = 0
+    for ch in huruf:
+        angka = angka * 26 + (ord(ch) - 64)
+    return angka
+
+
+def pisah_koordinat(ref):
+    """'B11' → ('B', 11)"""
+    m = re.match(r'^([A-Z]+)(\d+)$', ref)
+    if not m:
+        raise ValueError(f"Koordinat sel tidak valid: {ref}")
+    return m.group(1), int(m.group(2))
+
+
+def baca_template_zip(raw):
+    """
+    Baca isi template .xlsx (bytes) sekali: daftar member zip beserta datanya
+    dan path worksheet aktif. Hasilnya bisa di-cache dan dipakai berulang.
+    """
+    with zipfile.ZipFile(io.BytesIO(raw)) as zf:
+        members = [(info, zf.read(info.filename)) for info in zf.infolist()]
+
+    isi = {info.filename: data for info, data in members}
+    workbook_xml = isi['xl/workbook.xml'].decode('utf-8')
+    rels_xml = isi['xl/_rels/workbook.xml.rels'].decode('utf-8')
+
+    # Worksheet aktif = sheet ke-activeTab (default 0), sama dengan wb.active di openpyxl
+    m = re.search(r'<workbookView\b[^>]*\bactiveTab="(\d+)"', workbook_xml)
+    active_tab = int(m.group(1)) if m else 0
+    sheet_rids = re.findall(r'<sheet\b[^>]*?\br:id="([^"]+)"', workbook_xml)
+    if not sheet_rids:
+        raise ValueError("Template tidak memiliki worksheet")
+    rid = sheet_rids[min(active_tab, len(sheet_rids) - 1)]
+
+    target = None
+    for rel in re.findall(r'<Relationship\b[^>]*/?>', rels_xml):
+        if re.search(rf'\bId="{re.escape(rid)}"', rel):
+            target = re.search(r'\bTarget="([^"]+)"', rel).group(1)
+            break
+    if target is None:
+        raise ValueError(f"Relasi worksheet {rid} tidak ditemukan")
+
+    if target.startswith('/'):
+        sheet_path = target.lstrip('/')
+    else:
+        sheet_path = posixpath.normpath(posixpath.join('xl', target))
+
+    return {
+        'members': members,
+        'sheet_path': sheet_path,
+        'date1904': bool(re.search(r'<workbookPr\b[^>]*\bdate1904="(1|true)"', workbook_xml)),
+    }
+
+
+def _serial_excel(nilai, date1904=False):
+    """Konversi datetime/date ke nomor seri tanggal Excel"""
+    if not isinstance(nilai, datetime):
+        nilai = datetime(nilai.year, nilai.month, nilai.day)
+    epoch = datetime(1904, 1, 1) if date1904 else datetime(1899, 12, 30)
+    delta = nilai.replace(tzinfo=None) - epoch
+    serial = delta.days + delta.seconds / 86400 + delta.microseconds / 86400e6
+    return int(serial) if serial == int(serial) else serial
+
+
+def _xml_sel(ref, style, nilai, date1904=False):
+    """Bangun elemen <c> untuk satu sel (style template dipertahankan)"""
+    attr = f' r="{ref}"' + (f' s="{style}"' if style is not None else '')
+
+    # Sama seperti openpyxl: None atau "" = sel kosong (hanya style)
+    if nilai is None or nilai == "":
+        return f'<c{attr}/>'
+
+    if isinstance(nilai, TeksKaya):
+        runs = ''.join(
+            f'<r>{rpr}<t xml:space="preserve">{escape(_ILLEGAL_XML.sub("", teks))}</t></r>'
+            for rpr, teks in nilai)
+        return f'<c{attr} t="inlineStr"><is>{runs}</is></c>'
+
+    if isinstance(nilai, bool):
+        return f'<c{attr} t="b"><v>{int(nilai)}</v></c>'
+
+    if isinstance(nilai, (datetime, date)):
+        return f'<c{attr}><v>{_serial_excel(nilai, date1904)}</v></c>'
+
+    if isinstance(nilai, (int, float)):
+        return f'<c{attr}><v>{nilai!r}</v></c>'
+
+    teks = escape(_ILLEGAL_XML.sub('', str(nilai)))
+    return f'<c{attr} t="inlineStr"><is><t xml:space="preserve">{teks}</t></is></c>'
+
+
+def _ganti_gaya(xml_sel, gaya):
+    """Ganti (atau tambah) atribut s pada elemen <c> yang sudah ada"""
+    awal = xml_sel.index('<c') + 2
+    akhir = xml_sel.index('>', awal)
+    attrs = xml_sel[awal:akhir].rstrip('/')
+    attrs = _RE_ATTR_S.sub(f's="{gaya}"', attrs) if _RE_ATTR_S.search(attrs) else f'{attrs} s="{gaya}"'
+    penutup = '/' if xml_sel[akhir - 1] == '/' else ''
+    return xml_sel[:awal] + attrs + penutup + xml_sel[akhir:]
+
+
+def _patch_row(row_body, sel_baris, date1904):
+    """Ganti/tambah sel di dalam satu <row>; return (isi_baru, ada_formula_diganti)"""
+    hasil = []
+    ada_formula = False
+    sisa = dict(sel_baris)  # kolom → (ref, nilai, gaya)
+
+    for m in _RE_CELL.finditer(row_body or ''):
+        attrs, body = m.group(1), m.group(2)
+        r = _RE_ATTR_R.search(attrs)
+        kolom = r.group(1) if r else None
+
+        if kolom in sisa:
+            ref, nilai, gaya = sisa.pop(kolom)
+            if nilai is TETAP:
+                hasil.append((kolom_ke_angka(kolom),
+                              m.group(0) if gaya is None else _ganti_gaya(m.group(0), gaya)))
+                continue
+            if gaya is None:
+                s = _RE_ATTR_S.search(attrs)
+                gaya = s.group(1) if s else None
+            if body and '<f' in body:
+                ada_formula = True
+            hasil.append((kolom_ke_angka(kolom), _xml_sel(ref, gaya, nilai, date1904)))
+        else:
+            urutan = kolom_ke_angka(kolom) if kolom else 0
+            hasil.append((urutan, m.group(0)))
+
+    for kolom, (ref, nilai, gaya) in sisa.items():
+        hasil.append((kolom_ke_angka(kolom),
+                      _xml_sel(ref, gaya, None if nilai is TETAP else nilai, date1904)))
+
+    # Urutan kolom dalam satu baris wajib naik (sort stabil untuk sel tanpa 'r')
+    hasil.sort(key=lambda x: x[0])
+    return ''.join(xml for _, xml in hasil), ada_formula
+
+
+def patch_sheet_xml(sheet_xml, cells, date1904=False, gaya=None):
+    """
+    Tulis nilai sel ke XML worksheet tanpa mem-parse dokumen lengkap.
+
+    cells: dict {'F7': nilai, 'B11': datetime, ...}
+    gaya : dict opsional {ref: indeks xf} pengganti style sel; ref yang tidak
+           ada di cells hanya diganti style-nya (nilai template tetap)
+    Return (xml_baru, ada_formula_diganti).
+    """
+    gaya = gaya or {}
+    per_baris = {}
+    for ref in list(cells) + [r for r in gaya if r not in cells]:
+        kolom, baris = pisah_koordinat(ref)
+        per_baris.setdefault(baris, {})[kolom] = (ref, cells.get(ref, TETAP), gaya.get(ref))
+
+    m = _RE_SHEET_DATA.search(sheet_xml)
+    if not m:
+        raise ValueError("Elemen sheetData tidak ditemukan di worksheet")
+    sheet_data = m.group(1) or ''
+
+    rows = []
+    ada_formula = False
+    for rm in _RE_ROW.finditer(sheet_data):
+        attrs, body = rm.group(1), rm.group(2)
+        r = re.search(r'\br="(\d+)"', attrs)
+        nomor = int(r.group(1)) if r else None
+
+        if nomor in per_baris:
+            isi, diganti = _patch_row(body, per_baris.pop(nomor), date1904)
+            ada_formula = ada_formula or diganti
+            # 'spans' hanya petunjuk optimasi; dibuang karena isi baris berubah
+            rows.append((nomor, f'<row{_RE_SPANS.sub("", attrs)}>{isi}</row>'))
+        else:
+            rows.append((nomor or 0, rm.group(0)))
+
+    for nomor, sel_baris in per_baris.items():
+        isi, _ = _patch_row('', sel_baris, date1904)
+        rows.append((nomor, f'<row r="{nomor}">{isi}</row>'))
+
+    rows.sort(key=lambda x: x[0])
+    sheet_data_baru = '<sheetData>' + ''.join(xml for _, xml in rows) + '</sheetData>'
+    return sheet_xml[:m.start()] + sheet_data_baru + sheet_xml[m.end():], ada_formula
+
+
+def _hapus_calc_chain(isi):
+    """Buang calcChain (Excel membangunnya ulang) jika ada sel formula yang ditimpa"""
+    isi.pop('xl/calcChain.xml', None)
+    for nama, pola in (
+        ('[Content_Types].xml', r'<Override\b[^>]*PartName="/xl/calcChain\.xml"[^>]*/>'),
+        ('xl/_rels/workbook.xml.rels', r'<Relationship\b[^>]*Target="[^"]*calcChain\.xml"[^>]*/>'),
+    ):
+        if nama in isi:
+            isi[nama] = re.sub(pola, '', isi[nama].decode('utf-8')).encode('utf-8')
+
+
+def font_xml(name, sz, b=False, i=False, color=None):
+    """Elemen <font> (urutan anak sesuai skema); color = atribut, mis. 'theme="4"'"""
+    return (f'<font><name val="{escape(str(name))}"/>'
+            + ('<b val="1"/>' if b else '') + ('<i val="1"/>' if i else '')
+            + (f'<color {color}/>' if color else '')
+            + f'<sz val="{sz:g}"/></font>')
+
+
+def baca_font(xml):
+    """Atribut utama elemen <font>: dict name, sz, b, i, color (None jika tidak ada)"""
+    def _val(tag):
+        m = re.search(rf'<{tag}\b[^>]*?\bval="([^"]*)"', xml)
+        return m.group(1) if m else None
+
+    def _aktif(tag):
+        m = re.search(rf'<{tag}\b([^>]*?)/?>', xml)
+        if not m:
+            return False
+        v = re.search(r'\bval="([^"]*)"', m.group(1))
+        return v is None or v.group(1).lower() not in ('0', 'false')
+
+    color = re.search(r'<color\b([^>]*?)/?>', xml)
+    sz = _val('sz')
+    return {
+        'name': _val('name'),
+        'sz': float(sz) if sz else None,
+        'b': _aktif('b'),
+        'i': _aktif('i'),
+        'color': color.group(1).strip() if color and color.group(1).strip() else None,
+    }
+
+
+class PenyuntingGaya:
+    """
+    Tambah font/fill/numFmt/xf ke styles.xml tanpa mem-parse dokumen lengkap.
+    Entri yang identik dipakai ulang; entri lama tidak pernah diubah sehingga
+    indeks style yang sudah dipakai worksheet tetap valid.
+    """
+
+    # wadah → tag elemen (urutan sesuai skema styleSheet)
+    _WADAH = {'numFmts': 'numFmt', 'fonts': 'font', 'fills': 'fill', 'cellXfs': 'xf'}
+
+    def __init__(self, styles_xml):
+        self.xml = styles_xml
+        self.daftar = {wadah: self._elemen(wadah, tag) for wadah, tag in self._WADAH.items()}
+        self._awal = {wadah: len(v) for wadah, v in self.daftar.items()}
+        self.numfmt = {kode: int(i) for i, kode in (
+            (re.search(r'numFmtId="(\d+)"', x).group(1),
+             unescape(re.search(r'formatCode="([^"]*)"', x).group(1)))
+            for x in self.daftar['numFmts'])}
+
+    def _wadah(self, wadah, xml=None):
+        return re.search(rf'<{wadah}\b([^>]*?)(?:/>|>(.*?)</{wadah}>)', xml or self.xml, re.S)
+
+    def _elemen(self, wadah, tag):
+        m = self._wadah(wadah)
+        if m is None:
+            if wadah == 'numFmts':
+                return []
+            raise ValueError(f"Elemen {wadah} tidak ditemukan di styles.xml")
+        return re.findall(rf'<{tag}\b[^>]*?/>|<{tag}\b[^>]*>.*?</{tag}>', m.group(2) or '', re.S)
+
+    def _tambah(self, wadah, xml):
+        daftar = self.daftar[wadah]
+        if xml in daftar:
+            return daftar.index(xml)
+        daftar.append(xml)
+        return len(daftar) - 1
+
+    def font(self, indeks):
+        """XML font ke-indeks"""
+        return self.daftar['fonts'][indeks]
+
+    def id_numfmt(self, kode):
+        """numFmtId untuk kode format (bawaan Excel, sudah ada, atau entri baru)"""
+        if kode in self.numfmt:
+            return self.numfmt[kode]
+        if kode in _NUMFMT_BAWAAN:
+            return _NUMFMT_BAWAAN[kode]
+        baru = max([163] + list(self.numfmt.values())) + 1
+        self.numfmt[kode] = baru
+        self._tambah('numFmts', f'<numFmt numFmtId="{baru}" '
+                                f'formatCode="{escape(kode, {chr(34): "&quot;"})}"/>')
+        return baru
+
+    def turunan_xf(self, asal, font=None, fill=None, numfmt=None):
+        """
+        Indeks xf baru = xf `asal` dengan font (xml, atau fungsi xml font asal →
+        xml), fill (xml) dan/atau format angka (kode) diganti.
+        """
+        xf = self.daftar['cellXfs'][asal]
+        ganti = {}
+        if font is not None:
+            if callable(font):
+                m = re.search(r'\bfontId="(\d+)"', xf)
+                font = font(self.font(int(m.group(1)) if m else 0))
+            ganti['fontId'] = self._tambah('fonts', font)
+            ganti['applyFont'] = 1
+        if fill is not None:
+            ganti['fillId'] = self._tambah('fills', fill)
+            ganti['applyFill'] = 1
+        if numfmt is not None:
+            ganti['numFmtId'] = self.id_numfmt(numfmt)
+            ganti['applyNumberFormat'] = 1
+
+        buka = re.match(r'<xf\b([^>]*?)(/?)>', xf)
+        attrs = buka.group(1)
+        for nama, nilai in ganti.items():
+            if re.search(rf'\b{nama}="[^"]*"', attrs):
+                attrs = re.sub(rf'\b{nama}="[^"]*"', f'{nama}="{nilai}"', attrs)
+            else:
+                attrs += f' {nama}="{nilai}"'
+        return self._tambah('cellXfs', f'<xf{attrs}{buka.group(2)}>' + xf[buka.end():])
+
+    def hasil(self):
+        """styles.xml dengan entri baru ditambahkan di akhir wadahnya (count diperbarui)"""
+        xml = self.xml
+        for wadah in self._WADAH:
+            daftar = self.daftar[wadah]
+            if len(daftar) == self._awal[wadah]:
+                continue
+            m = self._wadah(wadah, xml)
+            if m is None:
+                # numFmts wajib menjadi anak pertama styleSheet
+                awal = re.search(r'<styleSheet\b[^>]*>', xml).end()
+                xml = f'{xml[:awal]}<numFmts count="{len(daftar)}">{"".join(daftar)}</numFmts>{xml[awal:]}'
+                continue
+            attrs = re.sub(r'\s*\bcount="\d*"', '', m.group(1)).rstrip()
+            xml = (f'{xml[:m.start()]}<{wadah} count="{len(daftar)}"{attrs}>'
+                   f'{"".join(daftar)}</{wadah}>{xml[m.end():]}')
+        return xml
+
+
+def _gaya_sheet(sheet_xml):
+    """{ref: indeks xf} seluruh sel ber-style di worksheet"""
+    gaya = {}
+    for m in _RE_CELL.finditer(sheet_xml):
+        r, s = _RE_ATTR_R.search(m.group(1)), _RE_ATTR_S.search(m.group(1))
+        if r and s:
+            gaya[r.group(1) + r.group(2)] = int(s.group(1))
+    return gaya
+
+
+def siapkan_gaya(template, perubahan):
+    """
+    Siapkan style turunan sekali per template (hasil bisa di-cache).
+
+    perubahan: {kunci: (ref, {'font': xml/fungsi, 'fill': xml, 'numfmt': kode})}
+    — style baru diturunkan dari style sel `ref` di worksheet template.
+    Return salinan template dengan styles.xml baru dan 'gaya' {kunci: indeks xf}
+    untuk argumen gaya tulis_laporan_zip.
+    """
+    isi = dict((info.filename, data) for info, data in template['members'])
+    if 'xl/styles.xml' not in isi:
+        raise ValueError("Template tidak memiliki xl/styles.xml")
+    gaya_sel = _gaya_sheet(isi[template['sheet_path']].decode('utf-8'))
+
+    penyunting = PenyuntingGaya(isi['xl/styles.xml'].decode('utf-8'))
+    gaya = {kunci: penyunting.turunan_xf(gaya_sel.get(ref, 0), **ubah)
+            for kunci, (ref, ubah) in perubahan.items()}
+    styles = penyunting.hasil().encode('utf-8')
+
+    members = [(info, styles if info.filename == 'xl/styles.xml' else data)
+               for info, data in template['members']]
+    return dict(template, members=members, gaya=gaya)
+
+
+def tulis_laporan_zip(template, output_path, cells, gaya=None):
+    """
+    Tulis file .xlsx baru dari template hasil baca_template_zip() (atau
+    siapkan_gaya). gaya: {ref: indeks xf} opsional pengganti style sel.
+    Hanya worksheet aktif yang diubah; member lain disalin tanpa perubahan.
+    File ditulis atomik: jika gagal / dibatalkan, file lama tetap utuh.
+    """
+    sheet_path = template['sheet_path']
+    isi = {info.filename: data for info, data in template['members']}
+
+    sheet_xml, ada_formula = patch_sheet_xml(
+        isi[sheet_path].decode('utf-8'), cells, template['date1904'], gaya)
+    isi[sheet_path] = sheet_xml.encode('utf-8')
+
+    if ada_formula and 'xl/calcChain.xml' in isi:
+        _hapus_calc_chain(isi)
+
+    def _tulis(f):
+        with zipfile.ZipFile(f, 'w') as zout:
+            for info, _ in template['members']:
+                if info.filename in isi:
+                    zout.writestr(info, isi[info.filename])
+
+    tulis_atomik(output_path, _tulis)
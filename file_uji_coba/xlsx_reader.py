@@ -0,0 +1,191 @@
+"""
+XLSX Reader
+Pembaca streaming .xlsx untuk file input absensi: XML worksheet pertama dibaca
+dengan iterparse langsung dari zip, baris per baris, tanpa membangun DOM
+workbook maupun objek sel openpyxl.
+
+Nilai yang dihasilkan mengikuti openpyxl (read_only=True, data_only=True,
+values_only=True): shared/inline string, angka int/float, bool, dan angka
+berformat tanggal/jam dikonversi ke datetime/time/timedelta.
+"""
+
+import re
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+from openpyxl.utils.datetime import (
+    from_excel, from_ISO8601, CALENDAR_WINDOWS_1900, CALENDAR_MAC_1904
+)
+
+from file_uji_coba.xlsx_patcher import kolom_ke_angka
+
+
+NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+
+TAG_SHEET_DATA = f'{NS}sheetData'
+TAG_ROW = f'{NS}row'
+TAG_C = f'{NS}c'
+TAG_V = f'{NS}v'
+
+_RE_KOORDINAT = re.compile(r'^([A-Z]+)(\d+)$')
+
+
+def _path_sheet_pertama(zf):
+    """Path worksheet pertama (sama dengan sheet_name=0 di pandas)"""
+    workbook = ET.fromstring(zf.read('xl/workbook.xml'))
+    sheet = workbook.find(f'{NS}sheets/{NS}sheet')
+    if sheet is None:
+        raise ValueError("Workbook tidak memiliki worksheet")
+    rid = sheet.get(f'{NS_REL}id')
+
+    rels = ET.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+    for rel in rels:
+        if rel.get('Id') == rid:
+            target = rel.get('Target')
+            if target.startswith('/'):
+                return target.lstrip('/'), workbook
+            return posixpath.normpath(posixpath.join('xl', target)), workbook
+    raise ValueError(f"Relasi worksheet {rid} tidak ditemukan")
+
+
+def _teks_rich(elemen):
+    """Isi teks <si>/<is> tanpa format (run fonetik <rPh> diabaikan)"""
+    potongan = []
+    t = elemen.find(f'{NS}t')
+    if t is not None:
+        potongan.append(t.text or '')
+    for run in elemen.findall(f'{NS}r'):
+        t = run.find(f'{NS}t')
+        if t is not None:
+            potongan.append(t.text or '')
+    return ''.join(potongan)
+
+
+def baca_shared_strings(zf):
+    """Daftar shared string (dibaca streaming)"""
+    if 'xl/sharedStrings.xml' not in zf.namelist():
+        return []
+    hasil = []
+    induk = None   # <sst>: <si> yang sudah dibaca dilepas agar memori tidak tumbuh
+    with zf.open('xl/sharedStrings.xml') as f:
+        for event, elemen in ET.iterparse(f, events=('start', 'end')):
+            if induk is None:
+                induk = elemen
+            elif event == 'end' and elemen.tag == f'{NS}si':
+                hasil.append(_teks_rich(elemen))
+                induk.remove(elemen)
+    return hasil
+
+
+def baca_format_tanggal(zf):
+    """Indeks style sel (cellXfs) berformat tanggal dan berformat durasi"""
+    tanggal, durasi = set(), set()
+    if 'xl/styles.xml' not in zf.namelist():
+        return tanggal, durasi
+
+    styles = ET.fromstring(zf.read('xl/styles.xml'))
+    custom = {
+        int(fmt.get('numFmtId')): fmt.get('formatCode')
+        for fmt in styles.iterfind(f'{NS}numFmts/{NS}numFmt')
+    }
+    for idx, xf in enumerate(styles.iterfind(f'{NS}cellXfs/{NS}xf')):
+        fmt_id = int(xf.get('numFmtId', 0))
+        kode = custom.get(fmt_id, BUILTIN_FORMATS.get(fmt_id))
+        if kode and is_date_format(kode):
+            tanggal.add(idx)
+        if kode and is_timedelta_format(kode):
+            durasi.add(idx)
+    return tanggal, durasi
+
+
+def _angka(teks):
+    """Sama dengan openpyxl: '.'/'E' → float, selain itu int"""
+    if '.' in teks or 'E' in teks or 'e' in teks:
+        return float(teks)
+    return int(teks)
+
+
+def iter_baris_xlsx(file_path):
+    """
+    Generator tuple nilai per baris dari worksheet pertama.
+
+    Baris yang tidak ada di XML menghasilkan tuple kosong dan kolom yang
+    tidak ada diisi None, sama seperti iter_rows(values_only=True).
+    """
+    with zipfile.ZipFile(file_path) as zf:
+        sheet_path, workbook = _path_sheet_pertama(zf)
+        pr = workbook.find(f'{NS}workbookPr')
+        date1904 = pr is not None and pr.get('date1904') in ('1', 'true')
+        epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+
+        shared = baca_shared_strings(zf)
+        fmt_tanggal, fmt_durasi = baca_format_tanggal(zf)
+
+        def nilai_sel(c):
+            tipe = c.get('t', 'n')
+            if tipe == 'inlineStr':
+                isi = c.find(f'{NS}is')
+                return _teks_rich(isi) if isi is not None else None
+
+            v = c.findtext(TAG_V) or None
+            if v is None:
+                return None
+            if tipe == 'n':
+                angka = _angka(v)
+                style = int(c.get('s', 0))
+                if style in fmt_tanggal:
+                    try:
+                        return from_excel(angka, epoch, timedelta=style in fmt_durasi)
+                    except (OverflowError, ValueError):
+                        return None
+                return angka
+            if tipe == 's':
+                return shared[int(v)]
+            if tipe == 'b':
+                return bool(int(v))
+            if tipe == 'str':
+                return v
+            if tipe == 'd':
+                return from_ISO8601(v)
+            # 'e' (error) dianggap kosong, sama seperti pandas
+            return None
+
+        nomor_berikut = 1
+        indeks_kolom = {}   # 'AB' → 28 (huruf kolom berulang di setiap baris)
+        induk = None   # <sheetData>: baris yang sudah diproses dilepas darinya
+        with zf.open(sheet_path) as f:
+            for event, elemen in ET.iterparse(f, events=('start', 'end')):
+                if event == 'start':
+                    if elemen.tag == TAG_SHEET_DATA:
+                        induk = elemen
+                    continue
+                if elemen.tag != TAG_ROW:
+                    continue
+
+                r = elemen.get('r')
+                nomor = int(r) if r else nomor_berikut
+                for _ in range(nomor_berikut, nomor):
+                    yield ()
+                nomor_berikut = nomor + 1
+
+                baris = []
+                for c in elemen.iterfind(TAG_C):
+                    m = _RE_KOORDINAT.match(c.get('r', ''))
+                    if m:
+                        huruf = m.group(1)
+                        kolom = indeks_kolom.get(huruf) or indeks_kolom.setdefault(
+                            huruf, kolom_ke_angka(huruf))
+                    else:
+                        kolom = len(baris) + 1
+                    if kolom > len(baris) + 1:
+                        baris.extend([None] * (kolom - len(baris) - 1))
+                    baris.append(nilai_sel(c))
+                # Kosongkan lalu lepas dari <sheetData>: elemen yang hanya di-clear
+                # tetap tertaut ke induknya sehingga memori tumbuh per baris
+                elemen.clear()
+                if induk is not None:
+                    induk.remove(elemen)
+                yield tuple(baris)
@@ -98,6 +98,19 @@ def main():
 
 
 if __name__ == "__main__":
+    # Ada argumen → mode non-interaktif untuk cron/server (tanpa menu & input()):
+    # "run.py watch FOLDER ..." = pantau folder, "run.py ingest FILE ..." = simpan ke
+    # database SQLite, selain itu batch
+    if len(sys.argv) > 1 and sys.argv[1] == 'watch':
+        from file_uji_coba.absensi_watch import main as watch_main
+        sys.exit(watch_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == 'ingest':
+        from file_uji_coba.absensi_ingest import main as ingest_main
+        sys.exit(ingest_main(sys.argv[2:]))
+    if len(sys.argv) > 1:
+        from file_uji_coba.absensi_batch import main as batch_main
+        sys.exit(batch_main(sys.argv[1:]))
+    
     try:
         main()
     except KeyboardInterrupt:
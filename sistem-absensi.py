@@ -9,16 +9,30 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 from datetime import datetime
 import pandas as pd
+import numpy as np
 import os
-import sys
 import platform
-from openpyxl import load_workbook, Workbook
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill, Color
-from openpyxl.drawing.image import Image as XLImage
-from openpyxl.drawing.spreadsheet_drawing import TwoCellAnchor, AnchorMarker
-from openpyxl.cell.rich_text import CellRichText, TextBlock
-from openpyxl.cell.text import InlineFont
-import calendar
+
+from file_uji_coba.attendance_processor import (
+    KonfigurasiAbsensi, baris_karyawan_unik, pilih_kolom_periode, kolom_proyeksi,
+    parse_header_tanggal
+)
+from file_uji_coba.attendance_store import (
+    FORMAT_OTOMATIS, KOLOM_IDENTITAS, AttendanceStore, parse_jam, durasi_detik,
+    bangun_store_csv, bangun_store_xlsx, melt_store, tabel_jam_menit
+)
+from file_uji_coba.data_cache import DataCache
+from file_uji_coba.attendance_db import AttendanceDB, adalah_db
+from file_uji_coba.attendance_summary import ringkas_sel, simpan_ringkasan
+from file_uji_coba.csv_sniffer import deteksi_dialek
+from file_uji_coba.employee_index import EmployeeIndex, normalisasi_nama, pesan_ambigu
+from file_uji_coba.header_index import HeaderIndex
+from file_uji_coba.holiday_calendar import NAMA_HARI, muat_kalender_libur
+from file_uji_coba.excel_renderer import (
+    siapkan_workbook, buat_template_sederhana, render_banyak, START_ROW, DIBATALKAN
+)
+from file_uji_coba.background_task import TugasLatar, STATUS_SELESAI, STATUS_GAGAL, STATUS_DIBATALKAN
+from file_uji_coba.log_sink import LogSink
 
 # Directori dasar script (bukan CWD) agar path template/logo selalu benar
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -33,31 +47,18 @@ else:  # Linux & lainnya
     FONT_FAMILY = 'DejaVu Sans'
 
 
-class SistemAbsensiPro:
-    """Aplikasi GUI untuk pengolahan data absensi dengan output ke hasil-akhir.xlsx"""
+class SistemAbsensiPro(KonfigurasiAbsensi):
+    """
+    Aplikasi GUI untuk pengolahan data absensi dengan output ke hasil-akhir.xlsx.
+    Konfigurasi pembacaan data (shift malam, libur daerah, format header) sama
+    dengan AttendanceProcessor, lihat KonfigurasiAbsensi.
+    """
     
-    # Hari libur nasional Indonesia 2026
-    INDONESIAN_HOLIDAYS = {
-        '2026': {
-            '01-01': 'Tahun Baru 2026',
-            '03-23': 'Isra Miraj',
-            '03-31': 'Hari Suci Nyepi',
-            '04-03': 'Wafat Yesus Kristus',
-            '04-05': 'Paskah',
-            '05-01': 'Hari Buruh',
-            '05-04': 'Kenaikan Yesus Kristus',
-            '05-14': 'Hari Raya Waisak',
-            '06-01': 'Hari Lahir Pancasila',
-            '06-17': 'Idul Fitri',
-            '06-18': 'Idul Fitri',
-            '08-17': 'Hari Kemerdekaan RI',
-            '08-24': 'Idul Adha',
-            '09-14': 'Tahun Baru Islam',
-            '11-23': 'Maulid Nabi Muhammad SAW',
-            '12-25': 'Hari Raya Natal',
-            '12-26': 'Cuti Bersama Natal',
-        }
-    }
+    # Jam absen boleh berformat H:MM:SS maupun H:MM
+    FORMAT_JAM = FORMAT_OTOMATIS
+    
+    # Jumlah baris maksimum panel log (baris terlama dibuang)
+    MAKS_BARIS_LOG = 2000
     
     def __init__(self, root):
         self.root = root
@@ -65,7 +66,7 @@ class SistemAbsensiPro:
         self.root.geometry("1060x820")
         self.root.minsize(900, 700)
         self.root.configure(bg='#ecf0f1')
-        self.root.protocol("WM_DELETE_WINDOW", self.root.destroy)
+        self.root.protocol("WM_DELETE_WINDOW", self.tutup_aplikasi)
 
         # Konfigurasi TTK style agar Combobox sesuai tema aplikasi
         style = ttk.Style()
@@ -82,10 +83,22 @@ class SistemAbsensiPro:
                   selectforeground=[('readonly', '#2c3e50')])
 
         # Data variables
-        self.df_source = None
+        self.store = None            # AttendanceStore (detik int32 + kode status per sel)
+        self.indeks_pegawai = None   # EmployeeIndex nama/NIK → baris (dibangun sekali per file)
+        self._saring_id = None       # after() tertunda untuk pencarian combobox
+        self.tugas = None            # TugasLatar yang sedang berjalan (muat/proses di thread worker)
+        self.indeks_header = None    # HeaderIndex header file → tanggal & periode (parse sekali)
+        self.kalender_libur = muat_kalender_libur(tuple(self.WILAYAH_LIBUR))
         self.employee_list = []
         self.processed_data = None
         self.available_periods = []  # List of (month, year) tuples
+        self._header_kalender = None
+        self._header_sumber = None
+
+        # Proyeksi kolom: data hanya berisi nama/nik + kolom tanggal periode_dimuat
+        self.file_sumber = None
+        self.kolom_file = []         # seluruh header file (lowercase)
+        self.periode_dimuat = None   # (bulan, tahun); (None, None) = semua periode
 
         # UI Variables
         self.input_file_path = tk.StringVar()
@@ -94,6 +107,12 @@ class SistemAbsensiPro:
         self.selected_year = tk.IntVar(value=datetime.now().year)
         self.output_file = tk.StringVar(value="hasil-akhir.xlsx")
 
+        # Jumlah proses render paralel (None = jumlah core CPU)
+        self.max_workers = None
+
+        # Cache hasil parsing file input di disk
+        self.cache = DataCache()
+
         # Setup UI
         self.setup_ui()
         
@@ -165,7 +184,7 @@ class SistemAbsensiPro:
         )
         file_entry.pack(side='left', fill='x', expand=True, ipady=7)
 
-        browse_btn = tk.Button(
+        self.browse_btn = tk.Button(
             file_entry_frame,
             text="📁 Browse",
             command=self.browse_input_file,
@@ -179,8 +198,8 @@ class SistemAbsensiPro:
             activebackground='#2980b9',
             activeforeground='white'
         )
-        browse_btn.pack(side='right', padx=(10, 0))
-        self.bind_hover(browse_btn, '#2980b9', '#3498db')
+        self.browse_btn.pack(side='right', padx=(10, 0))
+        self.bind_hover(self.browse_btn, '#2980b9', '#3498db')
 
         file_card.columnconfigure(0, weight=1)
         
@@ -203,10 +222,11 @@ class SistemAbsensiPro:
         self.employee_combo = ttk.Combobox(
             selection_card,
             textvariable=self.selected_employee,
-            font=(FONT_FAMILY, 10),
-            state='readonly'
+            font=(FONT_FAMILY, 10)
         )
         self.employee_combo.grid(row=1, column=0, padx=20, pady=(0, 10), sticky='ew')
+        # Ketik untuk mencari: daftar diisi nama paling mirip
+        self.employee_combo.bind('<KeyRelease>', self.saring_karyawan)
 
         # Periode Frame
         periode_frame = tk.Frame(selection_card, bg='white')
@@ -296,7 +316,7 @@ class SistemAbsensiPro:
         action_frame = tk.Frame(left_panel, bg='#ecf0f1')
         action_frame.grid(row=6, column=0, sticky='ew', pady=15)
         
-        process_btn = tk.Button(
+        self.process_btn = tk.Button(
             action_frame,
             text="⚡ PROSES & UPDATE EXCEL",
             command=self.process_and_update,
@@ -310,10 +330,27 @@ class SistemAbsensiPro:
             activebackground='#229954',
             activeforeground='white'
         )
-        process_btn.pack(fill='x', pady=(0, 8))
-        self.bind_hover(process_btn, '#229954', '#27ae60')
+        self.process_btn.pack(fill='x', pady=(0, 8))
+        self.bind_hover(self.process_btn, '#229954', '#27ae60')
 
-        reset_btn = tk.Button(
+        self.batch_btn = tk.Button(
+            action_frame,
+            text="👥 PROSES SEMUA KARYAWAN",
+            command=self.process_all_and_update,
+            font=(FONT_FAMILY, 10, 'bold'),
+            bg='#2980b9',
+            fg='white',
+            cursor='hand2',
+            relief='flat',
+            padx=20,
+            pady=9,
+            activebackground='#21618c',
+            activeforeground='white'
+        )
+        self.batch_btn.pack(fill='x', pady=(0, 8))
+        self.bind_hover(self.batch_btn, '#21618c', '#2980b9')
+
+        self.reset_btn = tk.Button(
             action_frame,
             text="🔄 Reset",
             command=self.reset_form,
@@ -327,8 +364,43 @@ class SistemAbsensiPro:
             activebackground='#7f8c8d',
             activeforeground='white'
         )
-        reset_btn.pack(fill='x')
-        self.bind_hover(reset_btn, '#7f8c8d', '#95a5a6')
+        self.reset_btn.pack(fill='x')
+        self.bind_hover(self.reset_btn, '#7f8c8d', '#95a5a6')
+
+        # Progress proses latar + tombol batal
+        progress_frame = tk.Frame(action_frame, bg='#ecf0f1')
+        progress_frame.pack(fill='x', pady=(12, 0))
+
+        self.status_proses = tk.StringVar(value="Siap")
+        tk.Label(
+            progress_frame,
+            textvariable=self.status_proses,
+            font=(FONT_FAMILY, 9),
+            bg='#ecf0f1',
+            fg='#7f8c8d',
+            anchor='w'
+        ).pack(fill='x')
+
+        self.progress_bar = ttk.Progressbar(progress_frame, mode='determinate', maximum=100)
+        self.progress_bar.pack(fill='x', pady=(4, 8))
+
+        self.cancel_btn = tk.Button(
+            progress_frame,
+            text="⛔ Batalkan Proses",
+            command=self.batalkan_proses,
+            font=(FONT_FAMILY, 10),
+            bg='#e74c3c',
+            fg='white',
+            cursor='hand2',
+            relief='flat',
+            padx=20,
+            pady=7,
+            activebackground='#c0392b',
+            activeforeground='white',
+            state='disabled'
+        )
+        self.cancel_btn.pack(fill='x')
+        self.bind_hover(self.cancel_btn, '#c0392b', '#e74c3c')
         
         left_panel.columnconfigure(0, weight=1)
         
@@ -366,6 +438,10 @@ class SistemAbsensiPro:
         self.log_text.tag_config('error', foreground='#e74c3c')
         self.log_text.tag_config('warning', foreground='#f39c12')
         self.log_text.tag_config('info', foreground='#3498db')
+
+        # Log ditulis ke widget per batch oleh timer (lihat LogSink)
+        self.log_sink = LogSink(self.root, self.log_text, maks_baris=self.MAKS_BARIS_LOG)
+        self.log_sink.mulai()
         
         # Initial log
         self.log("Sistem Absensi Pro v2.0 Siap!", 'info')
@@ -392,24 +468,130 @@ class SistemAbsensiPro:
         button.bind("<Enter>", lambda e: button.config(bg=hover_color))
         button.bind("<Leave>", lambda e: button.config(bg=normal_color))
         
+    def saring_karyawan(self, event=None):
+        """Search-as-you-type combobox karyawan (ditunda sampai ketikan berhenti sejenak)"""
+        if event is not None and event.keysym in ('Up', 'Down', 'Return', 'Escape', 'Tab'):
+            return
+        if self._saring_id is not None:
+            self.root.after_cancel(self._saring_id)
+        self._saring_id = self.root.after(150, self._terapkan_saringan)
+    
+    def _terapkan_saringan(self):
+        self._saring_id = None
+        if self.indeks_pegawai is None:
+            return
+        query = self.selected_employee.get().strip()
+        if query:
+            self.employee_combo['values'] = self.indeks_pegawai.mirip(query)
+        else:
+            self.employee_combo['values'] = sorted(self.employee_list, key=normalisasi_nama)
+        
     def log(self, message, tag='info'):
-        """Tambahkan pesan ke log area"""
-        self.log_text.configure(state='normal')
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        self.log_text.insert('end', f"[{timestamp}] ", 'info')
-        self.log_text.insert('end', f"{message}\n", tag)
-        self.log_text.see('end')
-        self.log_text.configure(state='disabled')
-        self.root.update_idletasks()
+        """Tambahkan pesan ke log area (di-batch oleh LogSink, aman dari thread worker)"""
+        self.log_sink.tulis(message, tag)
+    
+    def pesan(self, jenis, judul, teks):
+        """messagebox.show<jenis> ('info', 'warning', 'error') yang aman dipanggil dari worker"""
+        if self.tugas is not None and self.tugas.di_worker():
+            self.tugas.kirim('pesan', jenis, judul, teks)
+            return
+        getattr(messagebox, f"show{jenis}")(judul, teks)
+    
+    def progress(self, nilai, teks=''):
+        """Laporkan progress dari thread worker (diabaikan di luar tugas latar)"""
+        if self.tugas is not None and self.tugas.di_worker():
+            self.tugas.progress(nilai, teks)
+    
+    def cek_batal(self):
+        """Hentikan tugas latar (Dibatalkan) jika pengguna menekan Batalkan"""
+        if self.tugas is not None and self.tugas.di_worker():
+            self.tugas.cek_batal()
+    
+    def _progres_baca(self, jumlah_baris):
+        self.cek_batal()
+        self.progress(None, f"Membaca data... {jumlah_baris:,} baris".replace(',', '.'))
+    
+    def jalankan_tugas(self, fungsi, args, selesai):
+        """
+        Jalankan fungsi(tugas, *args) di thread worker; selesai(status, hasil)
+        dipanggil di thread utama. Tombol aksi nonaktif selama tugas berjalan.
+        """
+        if self.tugas is not None:
+            messagebox.showwarning("Peringatan", "Masih ada proses yang berjalan!")
+            return False
+        
+        def _selesai(status, hasil):
+            self.tugas = None
+            self._set_sibuk(False)
+            teks = {STATUS_SELESAI: "Selesai", STATUS_DIBATALKAN: "Dibatalkan"}.get(status, "Gagal")
+            self._tampilkan_progress(100 if status == STATUS_SELESAI else 0, teks)
+            selesai(status, hasil)
+        
+        self.tugas = TugasLatar(self.root, fungsi, self._terima_pesan, _selesai)
+        self._set_sibuk(True)
+        self._tampilkan_progress(0, "Memulai...")
+        self.tugas.mulai(*args)
+        return True
+    
+    def _terima_pesan(self, jenis, *isi):
+        """Teruskan pesan worker ke widget (thread utama)"""
+        if jenis == 'log':
+            self.log(*isi)
+        elif jenis == 'progress':
+            self._tampilkan_progress(*isi)
+        elif jenis == 'pesan':
+            # Log sebelum pesan sudah harus terlihat saat dialog muncul
+            self.log_sink.flush()
+            self.pesan(*isi)
+    
+    def _tampilkan_progress(self, nilai, teks=''):
+        """nilai 0-100; None = total belum diketahui (progress bar berjalan bolak-balik)"""
+        if nilai is None:
+            if str(self.progress_bar['mode']) != 'indeterminate':
+                self.progress_bar.configure(mode='indeterminate')
+                self.progress_bar.start(15)
+        else:
+            if str(self.progress_bar['mode']) != 'determinate':
+                self.progress_bar.stop()
+                self.progress_bar.configure(mode='determinate')
+            self.progress_bar['value'] = nilai
+        if teks:
+            self.status_proses.set(teks)
+    
+    def _set_sibuk(self, sibuk):
+        """Nonaktifkan tombol aksi selama tugas latar berjalan, aktifkan tombol batal"""
+        state = 'disabled' if sibuk else 'normal'
+        for tombol in (self.browse_btn, self.process_btn, self.batch_btn, self.reset_btn):
+            tombol.configure(state=state)
+        self.cancel_btn.configure(state='normal' if sibuk else 'disabled')
+    
+    def batalkan_proses(self):
+        """Minta tugas latar berhenti di titik aman berikutnya (antar tahap / chunk)"""
+        if self.tugas is None:
+            return
+        self.tugas.batalkan()
+        self.cancel_btn.configure(state='disabled')
+        self.status_proses.set("Membatalkan...")
+        self.log("Pembatalan diminta, menunggu tahap yang berjalan selesai...", 'warning')
+    
+    def tutup_aplikasi(self):
+        """Tutup jendela; konfirmasi dulu jika masih ada proses berjalan"""
+        if self.tugas is not None:
+            if not messagebox.askyesno("Proses Berjalan",
+                                       "Proses masih berjalan.\nBatalkan proses dan keluar?"):
+                return
+            self.tugas.batalkan()
+        self.root.destroy()
         
     def browse_input_file(self):
         """Browse file input (CSV atau XLSX)"""
         file_path = filedialog.askopenfilename(
             title="Pilih File Data Absensi",
             filetypes=[
-                ("All Supported", "*.csv *.xlsx"),
+                ("All Supported", "*.csv *.xlsx *.sqlite *.db"),
                 ("CSV files", "*.csv"),
                 ("Excel files", "*.xlsx"),
+                ("Database absensi", "*.sqlite *.db"),
                 ("All files", "*.*")
             ]
         )
@@ -420,33 +602,60 @@ class SistemAbsensiPro:
             self.load_data_file(file_path)
             
     def load_data_file(self, file_path):
-        """Load data dari file CSV atau XLSX"""
+        """Load data dari file CSV atau XLSX (dibaca di thread worker)"""
+        # Deteksi ekstensi file
+        ext = os.path.splitext(file_path)[1].lower()
+        
+        if ext not in ('.csv', '.xlsx') and not adalah_db(file_path):
+            self.log("Format file tidak didukung!", 'error')
+            return
+        
+        self.log("Memuat data dari file...", 'info')
+        self.jalankan_tugas(self._kerja_muat, (file_path,), self._muat_selesai)
+    
+    def _kerja_muat(self, tugas, file_path):
+        """Worker: baca header + kolom nama/nik lalu bangun indeks (tanpa menyentuh widget)"""
+        tugas.progress(None, "Membaca file...")
+        
+        # Baca header + kolom nama/nik saja; kolom tanggal dimuat per periode
+        data, header, keterangan = self.baca_file_data(file_path, dengan_tanggal=False)
+        self.log(keterangan, 'success')
+        tugas.cek_batal()
+        
+        tugas.progress(None, "Membangun indeks karyawan & header...")
+        indeks_pegawai = EmployeeIndex(data.nama, data.nik)
+        indeks_header = HeaderIndex(header, self.FORMAT_TANGGAL, self.KOLOM_ABAIKAN)
+        return file_path, data, header, indeks_pegawai, indeks_header
+    
+    def _muat_selesai(self, status, hasil):
+        """Pasang hasil _kerja_muat ke data aktif & widget (thread utama)"""
+        if status != STATUS_SELESAI:
+            # File aktif tetap file sebelumnya
+            self.input_file_path.set(self.file_sumber or "")
+            if status == STATUS_DIBATALKAN:
+                self.log("Pemuatan file dibatalkan", 'warning')
+            else:
+                self.log(f"Error memuat file: {str(hasil)}", 'error')
+                messagebox.showerror("Error", f"Gagal memuat file:\n{str(hasil)}")
+            return
+        
         try:
-            self.log("Memuat data dari file...", 'info')
+            file_path, data, header, indeks_pegawai, indeks_header = hasil
             
-            # Deteksi ekstensi file
+            self.store = data
+            self.indeks_pegawai = indeks_pegawai
+            self.file_sumber = file_path
+            self.kolom_file = header
+            self.indeks_header = indeks_header
+            # Store XLSX sudah berisi semua periode
             ext = os.path.splitext(file_path)[1].lower()
-            
-            if ext == '.csv':
-                # Auto-detect separator
-                separator = self.detect_csv_separator(file_path)
-                self.df_source = pd.read_csv(file_path, sep=separator, dtype=str)
-                self.log(f"File CSV berhasil dimuat (separator: '{separator}')", 'success')
-                
-            elif ext == '.xlsx':
-                self.df_source = pd.read_excel(file_path, dtype=str)
-                self.log("File XLSX berhasil dimuat", 'success')
-            else:
-                self.log("Format file tidak didukung!", 'error')
-                return
-            
-            # Bersihkan nama kolom
-            self.df_source.columns = self.df_source.columns.astype(str).str.strip().str.lower()
+            self.periode_dimuat = (None, None) if ext == '.xlsx' else None
             
             # Ekstrak daftar karyawan
-            if 'nama' in self.df_source.columns:
-                self.employee_list = self.df_source['nama'].dropna().unique().tolist()
-                self.employee_combo['values'] = self.employee_list
+            nama = self.kolom_nama()
+            if nama is not None:
+                self.employee_list = nama.dropna().unique().tolist()
+                self.employee_combo['values'] = sorted(self.employee_list, key=normalisasi_nama)
                 
                 if self.employee_list:
                     self.employee_combo.current(0)
@@ -464,230 +673,185 @@ class SistemAbsensiPro:
                 self.log(f"✓ Periode tersedia: {periods_str}", 'success')
             else:
                 self.log("Tidak dapat mendeteksi periode", 'warning')
+            
+            tidak_terbaca = self.indeks_header.tidak_terbaca
+            if tidak_terbaca:
+                contoh = ', '.join(tidak_terbaca[:5]) + (', ...' if len(tidak_terbaca) > 5 else '')
+                self.log(f"ℹ️  {len(tidak_terbaca)} kolom bukan tanggal diabaikan: {contoh}", 'info')
                 
         except Exception as e:
             self.log(f"Error memuat file: {str(e)}", 'error')
             messagebox.showerror("Error", f"Gagal memuat file:\n{str(e)}")
             
+    def baca_file_data(self, file_path, month=None, year=None, dengan_tanggal=True):
+        """
+        Baca file CSV/XLSX dengan proyeksi kolom: hanya nama/nik + kolom tanggal
+        periode (month/year None = semua periode) yang di-parse.
+        
+        CSV dan XLSX dibaca langsung ke AttendanceStore; database SQLite hasil
+        ingest di-query per periode tanpa parsing (dan tanpa cache).
+        Return (store, header_lengkap, keterangan_untuk_log).
+        """
+        if adalah_db(file_path):
+            db = AttendanceDB(file_path, baca_saja=True)
+            data = db.ambil_store(month=month, year=year, dengan_tanggal=dengan_tanggal)
+            header = KOLOM_IDENTITAS + db.daftar_tanggal()
+            return data, header, f"Database absensi dimuat ({len(data)} karyawan)"
+        
+        ext = os.path.splitext(file_path)[1].lower()
+        mode = f"periode:{month or ''}-{year or ''}" if dengan_tanggal else 'identitas'
+        varian = mode + '|' + '|'.join(self.FORMAT_TANGGAL + self.KOLOM_ABAIKAN)
+        
+        header = self.cache.load_arrays(file_path, 'header')
+        arrays = self.cache.load_arrays(file_path, 'store|' + varian)
+        if arrays is not None and header is not None:
+            return (AttendanceStore.dari_arrays(arrays), header['header'].tolist(),
+                    "File dimuat dari cache (tanpa parsing ulang)")
+        
+        def proyeksi(header):
+            return kolom_proyeksi(header, self.FORMAT_TANGGAL, self.KOLOM_ABAIKAN,
+                                  month, year, dengan_tanggal, self.indeks_header)
+        
+        if ext == '.csv':
+            # Auto-detect separator/encoding/header, file hanya dibuka sekali
+            data, dialek = bangun_store_csv(file_path, self.parse_header_kolom, proyeksi=proyeksi,
+                                            progress=self._progres_baca)
+            header = dialek.header if dialek.header is not None else data.columns
+            keterangan = (f"File CSV berhasil dimuat (separator: '{dialek.separator}', "
+                          f"encoding: {dialek.encoding})")
+            if dialek.header_row:
+                keterangan += f", header tabel di baris {dialek.header_row + 1}"
+        else:
+            # XML sheet tetap harus dibaca utuh, jadi semua periode langsung dimasukkan ke store
+            data, header = bangun_store_xlsx(file_path, self.parse_header_kolom,
+                                             proyeksi=proyeksi if dengan_tanggal else None,
+                                             progress=self._progres_baca)
+            keterangan = "File XLSX berhasil dimuat"
+        
+        # Simpan ke cache untuk pemuatan berikutnya
+        header = [str(c).strip().lower() for c in header]
+        self.cache.save_arrays(file_path, data.ke_arrays(), 'store|' + varian)
+        self.cache.save_arrays(file_path, {'header': np.array(header, dtype=str)}, 'header')
+        return data, header, keterangan
+    
+    def parse_header_kolom(self, columns):
+        """Tanggal seluruh header sekaligus (Series datetime, NaT jika bukan tanggal)"""
+        if self.indeks_header is not None:
+            return self.indeks_header.tanggal_kolom(columns)
+        return parse_header_tanggal(columns, self.FORMAT_TANGGAL, self.KOLOM_ABAIKAN)
+    
+    def kolom_nama(self):
+        """Series nama per baris data sumber (None jika kolom 'nama' tidak ada)"""
+        return None if self.store.nama is None else pd.Series(self.store.nama, dtype=object)
+    
+    def muat_periode(self, month=None, year=None):
+        """Pastikan data aktif berisi kolom tanggal periode (dibaca ulang dengan usecols)"""
+        if self.periode_dimuat in ((month, year), (None, None)):
+            return
+        
+        data, _, _ = self.baca_file_data(self.file_sumber, month, year)
+        self.store = data
+        self.periode_dimuat = (month, year)
+        
+        columns = data.columns
+        jumlah = len(columns) - len([c for c in columns if c in self.KOLOM_ABAIKAN])
+        periode = f"{self.get_month_name(month)} {year}" if month and year else "semua periode"
+        self.log(f"Kolom tanggal {periode} dimuat ({jumlah} dari {len(self.kolom_file)} kolom)", 'info')
+    
     def detect_csv_separator(self, file_path):
-        """Deteksi separator CSV (semicolon atau comma)"""
+        """Deteksi separator CSV (semicolon atau comma) dari sample awal file"""
         try:
-            # Coba semicolon
-            df = pd.read_csv(file_path, sep=';', dtype=str, nrows=5)
-            if len(df.columns) > 3:
-                return ';'
-            
-            # Coba comma
-            df = pd.read_csv(file_path, sep=',', dtype=str, nrows=5)
-            if len(df.columns) > 3:
-                return ','
-            
-            return ';'  # default
-        except:
+            return deteksi_dialek(file_path).separator
+        except Exception:
             return ';'
     
     def detect_available_periods(self):
-        """Deteksi bulan dan tahun yang tersedia dalam file"""
-        if self.df_source is None:
+        """Deteksi bulan dan tahun yang tersedia dalam file (dari indeks header)"""
+        if self.store is None or self.indeks_header is None:
             return
         
-        periods = set()
-        abaikan = ['nama', 'nik', 'no', 'nomor']
-        date_columns = [col for col in self.df_source.columns if col not in abaikan]
-        
-        for col in date_columns:
-            try:
-                date_obj = self.parse_date_column(col)
-                
-                if date_obj:
-                    periods.add((date_obj.month, date_obj.year))
-            except:
-                continue
-        
-        self.available_periods = sorted(list(periods))
+        self.available_periods = sorted(
+            (bulan, tahun) for tahun, bulan in self.indeks_header.daftar_periode)
     
-    def parse_date_column(self, col):
-        """Parse kolom tanggal, support datetime object (dari XLSX) atau string (dari CSV)"""
-        # Jika sudah datetime object (dari XLSX), langsung return
-        if isinstance(col, datetime):
-            return col
-        
-        # Jika pandas Timestamp, convert ke datetime
-        if hasattr(col, 'to_pydatetime'):
-            return col.to_pydatetime()
-        
-        # Jika string, coba parsing dengan berbagai format
-        if isinstance(col, str):
-            for fmt in ['%d-%m-%Y', '%Y-%m-%d', '%d/%m/%Y', '%Y-%m-%d %H:%M:%S']:
-                try:
-                    return datetime.strptime(col, fmt)
-                except ValueError:
-                    continue
-        
-        return None
-            
     def get_hari_indonesia(self, date_obj):
-        """Dapatkan nama hari dalam Bahasa Indonesia"""
-        days = {
-            'Monday': 'Senin', 'Tuesday': 'Selasa', 'Wednesday': 'Rabu',
-            'Thursday': 'Kamis', 'Friday': 'Jumat', 'Saturday': 'Sabtu',
-            'Sunday': 'Minggu'
-        }
-        return days[date_obj.strftime('%A')]
+        """Dapatkan nama hari dalam Bahasa Indonesia (tidak bergantung locale)"""
+        return NAMA_HARI[date_obj.weekday()]
         
     def is_holiday(self, date_obj):
-        """Cek apakah tanggal adalah hari libur nasional"""
-        year = str(date_obj.year)
-        date_str = date_obj.strftime('%m-%d')
-        
-        if year in self.INDONESIAN_HOLIDAYS:
-            if date_str in self.INDONESIAN_HOLIDAYS[year]:
-                return True, self.INDONESIAN_HOLIDAYS[year][date_str]
-        
-        return False, None
+        """Cek apakah tanggal adalah hari libur (nasional, cuti bersama, daerah terpilih)"""
+        return self.kalender_libur.cek(date_obj)
         
     def hitung_durasi(self, masuk_str, pulang_str):
         """Hitung durasi kerja - return integer jam saja (minimal 0)"""
-        try:
-            s1 = str(masuk_str).strip()
-            s2 = str(pulang_str).strip()
-            if not s1 or not s2 or s1 == '-' or s2 == '-':
-                return '-'
-            fmt1 = '%H:%M:%S' if s1.count(':') >= 2 else '%H:%M'
-            fmt2 = '%H:%M:%S' if s2.count(':') >= 2 else '%H:%M'
-            t_masuk = datetime.strptime(s1, fmt1)
-            t_pulang = datetime.strptime(s2, fmt2)
-            selisih = t_pulang - t_masuk
-            total_detik = int(selisih.total_seconds())
-            # Jika negatif (data jam terbalik), kembalikan 0
-            return max(0, total_detik // 3600)
-        except Exception:
+        detik, rusak = parse_jam([str(masuk_str).strip(), str(pulang_str).strip()], self.FORMAT_JAM)
+        if rusak.any():
             return '-'
+        total_detik = int(durasi_detik(detik[0], detik[1], self.lintas_hari()))
+        # Jika tetap negatif (data jam terbalik, bukan shift malam), kembalikan 0
+        return max(0, total_detik // 3600)
             
-    def process_attendance_data(self):
-        """Proses data absensi untuk karyawan yang dipilih"""
-        if self.df_source is None:
+    def process_attendance_data(self, employee_name=None, month=None, year=None):
+        """
+        Proses data absensi untuk karyawan yang dipilih (parameter None = ambil
+        dari form; dari thread worker parameter harus diisi)
+        """
+        if self.store is None:
             self.log("Data belum dimuat!", 'error')
             return False
             
-        employee_name = self.selected_employee.get()
+        if employee_name is None:
+            employee_name = self.selected_employee.get()
         if not employee_name:
             self.log("Pilih karyawan terlebih dahulu!", 'error')
             return False
             
-        month = self.selected_month.get()
-        year = self.selected_year.get()
+        month = month or self.selected_month.get()
+        year = year or self.selected_year.get()
         
         self.log(f"Memproses data untuk: {employee_name}", 'info')
         self.log(f"Periode: {self.get_month_name(month)} {year}", 'info')
         
         try:
+            self.muat_periode(month, year)
+            
             # Cari data karyawan
-            pegawai = self.df_source[self.df_source['nama'].str.contains(
-                employee_name, case=False, na=False)]
+            hasil = self.indeks_pegawai.cari(employee_name)
+            pegawai = hasil.baris
             
-            if pegawai.empty:
+            if len(pegawai) == 0:
                 self.log(f"Karyawan '{employee_name}' tidak ditemukan!", 'error')
                 return False
+            if len(pegawai) > 1:
+                self.log(pesan_ambigu(employee_name, hasil), 'error')
+                return False
             
-            # Kolom tanggal (selain nama, nik, no, nomor)
-            abaikan = ['nama', 'nik', 'no', 'nomor']
-            date_columns = [col for col in self.df_source.columns if col not in abaikan]
-            
-            output_data = []
+            kalender = self.get_header_kalender()
+            posisi = pilih_kolom_periode(kalender['tanggal'], month, year)
             
-            for col in date_columns:
-                # Parse header tanggal (support datetime object dari XLSX dan string dari CSV)
-                try:
-                    date_obj = self.parse_date_column(col)
-                    
-                    if date_obj is None:
-                        continue
-                        
-                except:
-                    continue
-                
-                # Filter bulan dan tahun
-                if date_obj.month != month or date_obj.year != year:
-                    continue
-                
-                hari = self.get_hari_indonesia(date_obj)
-                is_libur, nama_libur = self.is_holiday(date_obj)
-                
-                # Ambil nilai absensi
-                raw_value = pegawai.iloc[0][col]
-                
-                jam_masuk = "-"
-                jam_pulang = "-"
-                durasi = "-"
-                keterangan = "-"
-                
-                val_str = str(raw_value).strip()
-                
-                # Logika pengisian data
-                if pd.isna(raw_value) or val_str == "" or val_str.lower() == "nan":
-                    if is_libur:
-                        keterangan = f"Libur - {nama_libur}"
-                    elif hari in ['Sabtu', 'Minggu']:
-                        keterangan = hari  # Tampilkan nama hari (Sabtu/Minggu)
-                    else:
-                        keterangan = "Tidak Hadir / Tanpa Keterangan"
-                else:
-                    # Format: "HH:MM:SS - HH:MM:SS"
-                    parts = val_str.split('-')
-                    
-                    if len(parts) >= 2:
-                        raw_masuk = parts[0].strip()
-                        raw_pulang = parts[1].strip()
-                        
-                        if ':' in raw_masuk and ':' in raw_pulang:
-                            durasi = self.hitung_durasi(raw_masuk, raw_pulang)
-                        
-                        # Format HH:MM (tanpa detik)
-                        jam_masuk = ':'.join(raw_masuk.split(':')[:2]) if ':' in raw_masuk else raw_masuk
-                        jam_pulang = ':'.join(raw_pulang.split(':')[:2]) if ':' in raw_pulang else raw_pulang
-                        
-                        if is_libur:
-                            keterangan = f"Hadir di Hari Libur ({nama_libur})"
-                        else:
-                            keterangan = ""  # Kosongkan untuk status hadir normal
-                            
-                    elif len(parts) == 1 and parts[0] != "":
-                        raw_masuk = parts[0].strip()
-                        jam_masuk = ':'.join(raw_masuk.split(':')[:2]) if ':' in raw_masuk else raw_masuk
-                        keterangan = "Absen Tidak Lengkap"
-                
-                output_data.append({
-                    'tanggal': date_obj,
-                    'tanggal_str': date_obj.strftime('%d/%m/%Y'),
-                    'jam_masuk': jam_masuk,
-                    'jam_pulang': jam_pulang,
-                    'durasi': durasi,
-                    'keterangan': keterangan
-                })
-            
-            if not output_data:
+            if len(posisi) == 0:
                 self.log("❌ Tidak ada data untuk periode yang dipilih!", 'error')
                 
                 # Tampilkan periode yang tersedia
                 if self.available_periods:
                     periods_str = ', '.join([f"{self.get_month_name(m)} {y}" for m, y in self.available_periods])
                     self.log(f"ℹ️  Periode tersedia: {periods_str}", 'info')
-                    messagebox.showwarning(
+                    self.pesan(
+                        'warning',
                         "Data Tidak Ditemukan",
                         f"Tidak ada data untuk {self.get_month_name(month)} {year}!\n\n"
                         f"Periode yang tersedia dalam file:\n{periods_str}\n\n"
                         f"Silakan pilih periode yang sesuai."
                     )
                 else:
-                    messagebox.showwarning(
+                    self.pesan(
+                        'warning',
                         "Data Tidak Ditemukan",
                         f"Tidak ada data untuk {self.get_month_name(month)} {year}!"
                     )
                 return False
             
-            # Sort by tanggal
-            output_data.sort(key=lambda x: x['tanggal'])
+            sel = melt_store(self.store, posisi, baris=[pegawai[0]], tabel=tabel_jam_menit())
+            output_data = self.susun_data_absensi(kalender.iloc[posisi], sel)
             
             self.processed_data = output_data
             self.log(f"✓ {len(output_data)} hari berhasil diproses", 'success')
@@ -696,10 +860,138 @@ class SistemAbsensiPro:
         except Exception as e:
             self.log(f"Error memproses data: {str(e)}", 'error')
             return False
+    
+    def process_all_attendance_data(self, month=None, year=None):
+        """
+        Proses seluruh karyawan (dan seluruh periode jika month/year None)
+        dengan satu kali melt data sumber.
+        
+        Return dict {(nama, bulan, tahun): list data} berformat sama dengan processed_data.
+        """
+        if self.store is None:
+            self.log("Data belum dimuat!", 'error')
+            return {}
+        
+        try:
+            self.muat_periode(month, year)
+            
+            nama = self.kolom_nama()
+            baris = baris_karyawan_unik(nama)
+            
+            kalender = self.get_header_kalender()
+            posisi = pilih_kolom_periode(kalender['tanggal'], month, year)
+            
+            if len(baris) == 0 or len(posisi) == 0:
+                self.log("❌ Tidak ada data untuk periode yang dipilih!", 'error')
+                return {}
+            
+            sel = melt_store(self.store, posisi, baris=baris, tabel=tabel_jam_menit())
+            semua = self.susun_data_absensi(kalender.iloc[posisi], sel, urutkan=False)
+            
+            hasil = {}
+            nama_baris = nama.to_numpy()[sel['baris'].to_numpy()]
+            for nm, data in zip(nama_baris, semua):
+                key = (nm, data['tanggal'].month, data['tanggal'].year)
+                hasil.setdefault(key, []).append(data)
+            
+            for data_list in hasil.values():
+                data_list.sort(key=lambda x: x['tanggal'])
+            
+            self.log(f"✓ {len(hasil)} laporan karyawan berhasil diproses", 'success')
+            return hasil
+            
+        except Exception as e:
+            self.log(f"Error memproses data: {str(e)}", 'error')
+            return {}
+    
+    def susun_data_absensi(self, kalender, sel, urutkan=True):
+        """Bentuk list data laporan dari metadata kolom tanggal + sel absensi bentuk panjang"""
+        kalender = kalender.iloc[sel['urutan'].to_numpy()].reset_index(drop=True)
+        kosong = sel['kosong'].to_numpy()
+        lengkap = sel['lengkap'].to_numpy()
+        tidak_lengkap = ~kosong & ~lengkap
+        
+        # Durasi (integer jam, minimal 0)
+        total = self.durasi_sel(sel)
+        valid = lengkap & ~np.isnan(total)
+        jam_kerja = np.maximum(0, np.nan_to_num(total) // 3600).astype(np.int64)
+        durasi = np.where(valid, jam_kerja.astype(object), '-')
+        
+        # Format HH:MM (tanpa detik) — sel baku sudah dari tabel_jam_menit()
+        tidak_baku = sel['tidak_baku'].to_numpy()
+        jam_masuk = sel['masuk'].copy()
+        jam_pulang = sel['pulang'].copy()
+        if tidak_baku.any():
+            jam_masuk[tidak_baku] = jam_masuk[tidak_baku].str.split(':').str[:2].str.join(':')
+            jam_pulang[tidak_baku] = jam_pulang[tidak_baku].str.split(':').str[:2].str.join(':')
+        
+        # Logika pengisian data
+        nama_libur = kalender['libur']
+        is_libur = nama_libur.notna().to_numpy()
+        hari = kalender['Hari']
+        weekend = kalender['akhir_pekan'].to_numpy()
+        keterangan = np.select(
+            [kosong & is_libur, kosong & weekend, kosong,
+             lengkap & is_libur, lengkap, tidak_lengkap],
+            [("Libur - " + nama_libur).to_numpy(dtype=object),
+             hari.to_numpy(dtype=object),  # Tampilkan nama hari (Sabtu/Minggu)
+             "Tidak Hadir / Tanpa Keterangan",
+             ("Hadir di Hari Libur (" + nama_libur + ")").to_numpy(dtype=object),
+             "",  # Kosongkan untuk status hadir normal
+             "Absen Tidak Lengkap"],
+            default="-"
+        )
+        
+        tanggal = pd.DatetimeIndex(kalender['tanggal'])
+        output_data = [
+            {
+                'tanggal': tgl,
+                'tanggal_str': tgl_str,
+                'jam_masuk': masuk,
+                'jam_pulang': pulang,
+                'durasi': dur,
+                'keterangan': ket
+            }
+            for tgl, tgl_str, masuk, pulang, dur, ket in zip(
+                tanggal.to_pydatetime(), tanggal.strftime('%d/%m/%Y'),
+                jam_masuk.tolist(), jam_pulang.tolist(), durasi.tolist(), keterangan.tolist())
+        ]
+        
+        if urutkan:
+            output_data.sort(key=lambda x: x['tanggal'])
+        return output_data
+    
+    def ringkasan_absensi(self, month=None, year=None):
+        """
+        Ringkasan bulanan per karyawan (lihat attendance_summary) untuk seluruh
+        karyawan periode terpilih, satu kali melt data sumber. None jika gagal.
+        """
+        if self.store is None:
+            return None
+        
+        self.muat_periode(month, year)
+        nama = self.kolom_nama()
+        baris = baris_karyawan_unik(nama)
+        kalender = self.get_header_kalender()
+        posisi = pilih_kolom_periode(kalender['tanggal'], month, year)
+        if len(baris) == 0 or len(posisi) == 0:
+            return None
+        
+        sel = melt_store(self.store, posisi, baris=baris, tabel=tabel_jam_menit())
+        kalender = kalender.iloc[posisi].iloc[sel['urutan'].to_numpy()]
+        return ringkas_sel(
+            sel['baris'].to_numpy(), kalender['tanggal'].to_numpy(),
+            sel['kosong'].to_numpy(), sel['lengkap'].to_numpy(),
+            kalender['libur'].notna().to_numpy(), kalender['akhir_pekan'].to_numpy(),
+            self.durasi_sel(sel), nama.to_numpy(), self.store.nik)
             
-    def update_excel_file(self):
-        """Update file Excel hasil-akhir.xlsx dengan data yang diproses"""
-        output_file = self.output_file.get()
+    def update_excel_file(self, employee_name=None, month=None, year=None, output_file=None):
+        """
+        Update file Excel hasil-akhir.xlsx dengan data yang diproses (parameter
+        None = ambil dari form)
+        """
+        if output_file is None:
+            output_file = self.output_file.get()
         
         if not output_file:
             output_file = "hasil-akhir.xlsx"
@@ -713,198 +1005,37 @@ class SistemAbsensiPro:
             # Path template & logo selalu relatif terhadap lokasi script
             template_path = os.path.join(BASE_DIR, 'contoh', 'hasil-akhir.xlsx')
             logo_path     = os.path.join(BASE_DIR, 'contoh', 'logo-badung.png')
+            start_row = START_ROW
 
-            # Cek apakah template ada
-            if os.path.exists(template_path):
-                self.log(f"Menggunakan template: {template_path}", 'info')
-                # Load dengan rich_text=True agar CellRichText (bold sebagian) bisa ditulis
-                wb = load_workbook(template_path, rich_text=True)
-                ws = wb.active
-                # Hapus gambar lama dari template secara aman
-                try:
-                    ws._images.clear()
-                except AttributeError:
-                    pass
-            elif os.path.exists(output_file):
-                self.log("Template tidak ada, menggunakan file existing...", 'warning')
-                wb = load_workbook(output_file)
-                ws = wb.active
-            else:
-                self.log("Template & file tidak ada, membuat file baru...", 'warning')
-                wb = Workbook()
-                ws = wb.active
-                ws.title = "Rekap Absensi"
-
-                # Create header template jika file baru
-                self.create_excel_template(ws)
-            
-            # Update informasi karyawan dan periode di header
-            try:
-                month_name = self.get_month_name(self.selected_month.get())
-                month = self.selected_month.get()  # diperlukan untuk datetime()
-                year = self.selected_year.get()
-                periode_text = f"{month_name} {year}"
-
-                # Update nama karyawan (F7) - rekonstruksi font secara aman
-                orig_f7 = ws['F7'].font
-                ws['F7'].value = self.selected_employee.get()
-                # Bangun Font baru — hindari meneruskan objek Color bertipe 'theme'
-                # langsung karena dapat menyebabkan error serialisasi di beberapa versi
-                try:
-                    ws['F7'].font = Font(
-                        name=orig_f7.name or 'Calibri',
-                        size=orig_f7.size or 12,
-                        bold=orig_f7.bold,
-                        italic=orig_f7.italic,
-                        color=orig_f7.color
-                    )
-                except Exception:
-                    ws['F7'].font = Font(name='Calibri', size=12)
-                self.log("✓ Nama karyawan diupdate di F7", 'success')
-
-                # Update G5 dengan datetime agar number_format mmm-yy bekerja
-                ws['G5'].value = datetime(year, month, 1)
-                ws['G5'].number_format = 'mmm-yy'
-                ws['G5'].font = Font(name='Calibri', size=18, color=Color(theme=4))
-                self.log(f"✓ Periode diupdate di G5: {periode_text}", 'success')
-
-                # Pastikan D5 tetap bold '-' (separator) dengan warna biru (theme=4)
-                ws['D5'].value = '-'
-                ws['D5'].font = Font(name='Calibri', size=18, bold=True, color=Color(theme=4))
-
-                # Pastikan B44 & E44 tetap bold
-                ws['B44'].font = Font(name='Calibri', size=11, bold=True)
-                ws['E44'].font = Font(name='Calibri', size=11, bold=True)
-
-                # Update nama karyawan di C45 (kolom tanda tangan tenaga ahli)
-                ws['C45'].value = self.selected_employee.get()
-                self.log(f"✓ Nama karyawan diupdate di C45", 'success')
-
-                # Bold sebagian teks header organisasi di C1:
-                # 3 baris pertama bold, 3 baris bawah normal
-                bold_part = (
-                    'PEMERINTAH KABUPATEN BADUNG\n'
-                    'DINAS KOMUNIKASI DAN INFORMATIKA\n'
-                    'PUSAT PEMERINTAHAN MANGUPRAJA MANDALA\n'
-                )
-                normal_part = (
-                    'Jln Raya Sempidi, Mengwi \u2013 Kabupaten Badung (80351)\n'
-                    'Telp. (0361) 419888 Fax (0361) 419888\n'
-                    'Website : www.diskominfo.badungkab.go.id'
-                )
-                ws['C1'].value = CellRichText(
-                    TextBlock(InlineFont(rFont='Calibri', sz=12, b=True), bold_part),
-                    TextBlock(InlineFont(rFont='Calibri', sz=12, b=False), normal_part)
-                )
-                self.log('✓ Header organisasi C1 diformat (bold sebagian)', 'success')
-
-                # Header tabel row 10 — hapus background (gunakan PatternFill kosong)
-                no_fill = PatternFill()  # fill_type default None = hapus fill
-                for col in ['B', 'C', 'D', 'E', 'F']:
-                    ws[f'{col}10'].fill = no_fill
-
-                # C49 & F49: tanggal hari ini dengan format 3-Jan-2026
-                today = datetime.now()
-                ws['C49'].value = today
-                ws['C49'].number_format = r'[$-409]d\-mmm\-yyyy;@'
-                ws['F49'].value = today
-                ws['F49'].number_format = r'[$-409]d\-mmm\-yyyy;@'
-                self.log(f"✓ Tanggal hari ini diisi di C49 & F49", 'success')
-
-            except Exception as e:
-                self.log(f"Info header mungkin perlu disesuaikan manual: {str(e)}", 'warning')
-            
-            # Update data ke range B11:F41
-            start_row = 11
-            max_rows = 31  # B11 sampai B41
-            
-            self.log("Menulis data ke Excel (B11:F41)...", 'info')
-            
-            for idx, data in enumerate(self.processed_data):
-                if idx >= max_rows:
-                    self.log(f"Maksimal {max_rows} baris tercapai, data selanjutnya dilewati", 'warning')
-                    break
-                
-                row = start_row + idx
-                
-                # B: Tanggal - format d-Mmm-yy sesuai template
-                ws[f'B{row}'] = data['tanggal']
-                ws[f'B{row}'].number_format = r'[$-409]d\-mmm\-yy;@'
-                
-                # C: Jam Masuk - format HH:MM
-                ws[f'C{row}'] = data['jam_masuk']
-                ws[f'C{row}'].number_format = 'h:mm;@'
-                
-                # D: Jam Keluar/Pulang - format HH:MM
-                ws[f'D{row}'] = data['jam_pulang']
-                ws[f'D{row}'].number_format = 'h:mm;@'
-                
-                # E: Durasi (integer jam)
-                ws[f'E{row}'] = data['durasi']
-                if isinstance(data['durasi'], int):
-                    ws[f'E{row}'].number_format = '#,##0'
-                
-                # F: Keterangan
-                ws[f'F{row}'] = data['keterangan']
-            
-            # Clear sisa baris jika data kurang dari 31
-            for idx in range(len(self.processed_data), max_rows):
-                row = start_row + idx
-                ws[f'B{row}'] = ""
-                ws[f'C{row}'] = ""
-                ws[f'D{row}'] = ""
-                ws[f'E{row}'] = ""
-                ws[f'F{row}'] = ""
-            
-            # Sisipkan logo sebelum simpan
-            if os.path.exists(logo_path):
-                try:
-                    logo_img = XLImage(logo_path)
-                    logo_img.width = 121
-                    logo_img.height = 116
-                    # Gunakan TwoCellAnchor dengan koordinat EMU persis dari template asli
-                    # agar posisi logo identik (rata tengah di area B1:B4)
-                    anchor = TwoCellAnchor(editAs='oneCell')
-                    anchor._from = AnchorMarker(col=1, colOff=249464, row=0, rowOff=68036)
-                    anchor.to   = AnchorMarker(col=1, colOff=1401989, row=3, rowOff=86270)
-                    logo_img.anchor = anchor
-                    ws.add_image(logo_img)
-                    self.log("✓ Logo berhasil ditambahkan (posisi rata tengah)", 'success')
-                except Exception as e:
-                    self.log(f"Gagal menambahkan logo: {str(e)}", 'warning')
-            else:
-                self.log(f"ℹ️  Logo tidak ditemukan ({logo_path})", 'warning')
+            # Template → header → data B11:F41 → logo (lihat excel_renderer)
+            wb = siapkan_workbook(
+                employee_name or self.selected_employee.get(),
+                month or self.selected_month.get(),
+                year or self.selected_year.get(),
+                self.processed_data,
+                template_path=template_path,
+                logo_path=logo_path,
+                output_file=output_file,
+                log=self.log
+            )
 
-            # Tentukan path simpan dengan urutan prioritas dan fallback otomatis:
-            # 1. Windows Downloads (jika berjalan di WSL dan folder dapat ditulis)
-            # 2. folder file-excel/ di direktori script
-            # 3. direktori script itu sendiri
+            # Tentukan path simpan dengan urutan prioritas dan fallback otomatis
             fname = os.path.basename(output_file)
             local_dir = os.path.join(BASE_DIR, 'file-excel')
-
-            def _can_write(directory):
-                """Cek apakah direktori bisa ditulis tanpa membuat file sungguhan."""
-                return os.path.isdir(directory) and os.access(directory, os.W_OK)
-
-            win_dl = self.get_windows_downloads_path()
-            if win_dl and _can_write(win_dl):
-                save_path = os.path.join(win_dl, fname)
-                self.log("✓ Target simpan: Windows Downloads", 'info')
-            elif _can_write(local_dir):
-                save_path = os.path.join(local_dir, fname)
-                self.log(f"✓ Target simpan: {local_dir}", 'info')
-            else:
-                save_path = os.path.join(BASE_DIR, fname)
-                self.log(f"✓ Target simpan: {BASE_DIR}", 'info')
+            save_path = os.path.join(self.get_save_dir(), fname)
 
             # Simpan file — jika tetap gagal (mis. Windows file terbuka),
             # coba fallback ke local_dir atau BASE_DIR
             fallbacks = []
             if save_path.startswith('/mnt/'):
-                if _can_write(local_dir):
+                if self._can_write(local_dir):
                     fallbacks.append(os.path.join(local_dir, fname))
                 fallbacks.append(os.path.join(BASE_DIR, fname))
 
+            # Titik batal terakhir: setelah file mulai ditulis proses tidak dihentikan
+            self.cek_batal()
+            self.progress(80, "Menyimpan file Excel...")
+
             saved = False
             last_err = None
             for attempt in [save_path] + fallbacks:
@@ -925,7 +1056,8 @@ class SistemAbsensiPro:
 
             self.log(f"✓ File berhasil disimpan: {save_path}", 'success')
             
-            messagebox.showinfo(
+            self.pesan(
+                'info',
                 "Berhasil!",
                 f"File disimpan ke:\n{save_path}\n\n"
                 f"Range: B11:F{start_row + len(self.processed_data) - 1}\n"
@@ -936,32 +1068,41 @@ class SistemAbsensiPro:
             
         except Exception as e:
             self.log(f"Error menyimpan Excel: {str(e)}", 'error')
-            messagebox.showerror("Error", f"Gagal menyimpan file Excel:\n{str(e)}")
+            self.pesan('error', "Error", f"Gagal menyimpan file Excel:\n{str(e)}")
             return False
             
     def create_excel_template(self, ws):
         """Buat template Excel sederhana jika file baru"""
-        # Header utama
-        ws['A1'] = 'REKAP ABSENSI KARYAWAN'
-        ws['A1'].font = Font(size=16, bold=True)
-        
-        ws['A3'] = 'Nama'
-        ws['B3'] = self.selected_employee.get()
-        
-        ws['A4'] = 'Periode'
-        ws['B4'] = f"{self.get_month_name(self.selected_month.get())} {self.selected_year.get()}"
-        
-        # Header tabel (row 10)
-        headers = ['No', 'Tanggal', 'Jam Masuk', 'Jam Keluar', 'Durasi', 'Keterangan']
-        for idx, header in enumerate(headers, start=1):
-            cell = ws.cell(row=10, column=idx)
-            cell.value = header
-            cell.font = Font(bold=True)
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-        
-        # Nomor urut (A11:A41)
-        for i in range(1, 32):
-            ws[f'A{10+i}'] = i
+        buat_template_sederhana(
+            ws,
+            self.selected_employee.get(),
+            f"{self.get_month_name(self.selected_month.get())} {self.selected_year.get()}"
+        )
+
+    @staticmethod
+    def _can_write(directory):
+        """Cek apakah direktori bisa ditulis tanpa membuat file sungguhan."""
+        return os.path.isdir(directory) and os.access(directory, os.W_OK)
+
+    def get_save_dir(self):
+        """
+        Folder simpan dengan urutan prioritas:
+        1. Windows Downloads (jika berjalan di WSL dan folder dapat ditulis)
+        2. folder file-excel/ di direktori script
+        3. direktori script itu sendiri
+        """
+        local_dir = os.path.join(BASE_DIR, 'file-excel')
+
+        win_dl = self.get_windows_downloads_path()
+        if win_dl and self._can_write(win_dl):
+            self.log("✓ Target simpan: Windows Downloads", 'info')
+            return win_dl
+        elif self._can_write(local_dir):
+            self.log(f"✓ Target simpan: {local_dir}", 'info')
+            return local_dir
+        else:
+            self.log(f"✓ Target simpan: {BASE_DIR}", 'info')
+            return BASE_DIR
 
     def get_windows_downloads_path(self):
         """Deteksi folder Windows Downloads via WSL mount /mnt/c/Users/"""
@@ -983,7 +1124,7 @@ class SistemAbsensiPro:
         return None
             
     def process_and_update(self):
-        """Proses data dan update file Excel"""
+        """Proses data dan update file Excel (di thread worker, GUI tetap responsif)"""
         # Validasi
         if not self.input_file_path.get():
             messagebox.showwarning("Peringatan", "Pilih file data absensi terlebih dahulu!")
@@ -996,21 +1137,137 @@ class SistemAbsensiPro:
         self.log("="*50, 'info')
         self.log("MEMULAI PROSES...", 'info')
         
-        # Proses data
-        if self.process_attendance_data():
-            # Update Excel
-            self.update_excel_file()
+        # Nilai form dibaca di thread utama; worker tidak menyentuh variabel Tk
+        args = (self.selected_employee.get(), self.selected_month.get(),
+                self.selected_year.get(), self.output_file.get())
+        self.jalankan_tugas(self._kerja_proses, args, self._proses_selesai)
+    
+    def _kerja_proses(self, tugas, employee_name, month, year, output_file):
+        """Worker: muat periode → susun data → tulis & simpan Excel"""
+        tugas.progress(0, "Memproses data absensi...")
+        if not self.process_attendance_data(employee_name, month, year):
+            return False
+        tugas.cek_batal()
+        
+        tugas.progress(50, "Menyusun workbook...")
+        return self.update_excel_file(employee_name, month, year, output_file)
+    
+    def _proses_selesai(self, status, hasil):
+        if status == STATUS_SELESAI and hasil:
             self.log("PROSES SELESAI!", 'success')
-            self.log("="*50, 'info')
+        elif status == STATUS_DIBATALKAN:
+            self.log("PROSES DIBATALKAN!", 'warning')
         else:
+            if status == STATUS_GAGAL:
+                self.log(f"Error: {str(hasil)}", 'error')
+            self.status_proses.set("Gagal")
             self.log("PROSES GAGAL!", 'error')
-            self.log("="*50, 'info')
+        self.log("="*50, 'info')
             
+    def process_all_and_update(self):
+        """Proses seluruh karyawan untuk periode terpilih dan render laporan paralel"""
+        if not self.input_file_path.get():
+            messagebox.showwarning("Peringatan", "Pilih file data absensi terlebih dahulu!")
+            return
+
+        month = self.selected_month.get()
+        year = self.selected_year.get()
+
+        self.log("="*50, 'info')
+        self.log(f"MEMULAI PROSES SEMUA KARYAWAN ({self.get_month_name(month)} {year})...", 'info')
+
+        self.jalankan_tugas(self._kerja_semua, (month, year), self._semua_selesai)
+
+    def _kerja_semua(self, tugas, month, year):
+        """Worker: proses seluruh karyawan lalu render laporan (dibatalkan per laporan)"""
+        tugas.progress(0, "Memproses data semua karyawan...")
+        laporan = self.process_all_attendance_data(month, year)
+        if not laporan:
+            return None
+        tugas.cek_batal()
+
+        output_dir = os.path.join(
+            self.get_save_dir(), f"Absensi_{self.get_month_name(month)}_{year}")
+        self.log(f"Merender {len(laporan)} laporan ke: {output_dir}", 'info')
+        tugas.progress(30, f"Merender 0/{len(laporan)} laporan...")
+
+        def _progress(selesai, total, _hasil):
+            tugas.progress(30 + 70 * selesai / total, f"Merender {selesai}/{total} laporan...")
+
+        # Template tersedia: patch zip langsung (hasil sama, jauh lebih cepat);
+        # tanpa template hanya backend openpyxl yang bisa membuat layout sederhana
+        template_path = os.path.join(BASE_DIR, 'contoh', 'hasil-akhir.xlsx')
+        hasil = render_banyak(
+            laporan,
+            output_dir,
+            max_workers=self.max_workers,
+            template_path=template_path,
+            logo_path=os.path.join(BASE_DIR, 'contoh', 'logo-badung.png'),
+            progress=_progress,
+            backend='zip' if os.path.exists(template_path) else 'openpyxl',
+            batal=tugas.batal
+        )
+        if not tugas.batal.is_set():
+            self.tulis_ringkasan(month, year, output_dir)
+        return output_dir, hasil
+
+    def tulis_ringkasan(self, month, year, output_dir):
+        """Tulis ringkasan bulanan per karyawan & unit ke folder output (gagal hanya dicatat di log)"""
+        try:
+            ringkasan = self.ringkasan_absensi(month, year)
+            if ringkasan is None or len(ringkasan) == 0:
+                return
+            paths = simpan_ringkasan(ringkasan, output_dir)
+            self.log(f"✓ Ringkasan {len(ringkasan)} karyawan: {paths['xlsx']}", 'success')
+        except Exception as e:
+            self.log(f"Gagal menulis ringkasan: {str(e)}", 'warning')
+
+    def _semua_selesai(self, status, hasil):
+        if status != STATUS_SELESAI or hasil is None:
+            if status == STATUS_DIBATALKAN:
+                self.log("PROSES DIBATALKAN!", 'warning')
+            else:
+                if status == STATUS_GAGAL:
+                    self.log(f"Error: {str(hasil)}", 'error')
+                self.status_proses.set("Gagal")
+                self.log("PROSES GAGAL!", 'error')
+            self.log("="*50, 'info')
+            return
+
+        output_dir, hasil = hasil
+        dibatalkan = [h for h in hasil if h['error'] == DIBATALKAN]
+        gagal = [h for h in hasil if not h['ok'] and h['error'] != DIBATALKAN]
+        for h in gagal:
+            self.log(f"✗ {h['nama']}: {h['error']}", 'error')
+
+        berhasil = len(hasil) - len(gagal) - len(dibatalkan)
+        self.log(f"✓ {berhasil} dari {len(hasil)} laporan tersimpan", 'success')
+        if dibatalkan:
+            self.log(f"⚠ {len(dibatalkan)} laporan dibatalkan", 'warning')
+            self.status_proses.set("Dibatalkan")
+            self.log("PROSES DIBATALKAN!", 'warning')
+        else:
+            self.log("PROSES SELESAI!", 'success' if not gagal else 'warning')
+        self.log("="*50, 'info')
+
+        messagebox.showinfo(
+            "Selesai",
+            f"Folder output:\n{output_dir}\n\n"
+            f"Berhasil: {berhasil}\n"
+            f"Gagal: {len(gagal)}"
+            + (f"\nDibatalkan: {len(dibatalkan)}" if dibatalkan else "")
+        )
+
     def reset_form(self):
         """Reset form ke kondisi awal"""
         self.input_file_path.set("")
         self.selected_employee.set("")
-        self.df_source = None
+        self.store = None
+        self.indeks_pegawai = None
+        self.indeks_header = None
+        self.file_sumber = None
+        self.kolom_file = []
+        self.periode_dimuat = None
         self.employee_list = []
         self.processed_data = None
         self.available_periods = []